@@ -0,0 +1,40 @@
+"""Thông lượng của `evaluate_many` theo executor và cỡ khối, trên một tập biểu thức có lặp lại một phần.
+
+Chạy: python -m benchmarks.bench_batch [--count 20000] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from benchmarks.generator import generate_expression
+from src.batch import evaluate_many
+from src.expression_tree import PARSE_CACHE
+
+
+def main() -> None:
+    """In số biểu thức/giây cho từng executor, cỡ khối và cỡ biểu thức."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--distinct", type=float, default=0.5, help="Share of distinct expressions.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'leaves':>7} {'executor':>9} {'chunksize':>10} {'expr/s':>10}")
+    for leaves in (4, 32, 256):
+        pool = [generate_expression(leaves, shape="random", seed=seed) for seed in range(max(1, int(args.count * args.distinct)))]
+        expressions = [rng.choice(pool) for _ in range(args.count)]
+        for executor, chunksizes in (("serial", (args.count,)), ("thread", (64, 1024)), ("process", (16, 256, 4096))):
+            for chunksize in chunksizes:
+                PARSE_CACHE.clear()  # every configuration starts cold
+                start = time.perf_counter()
+                evaluate_many(expressions, executor=executor, chunksize=chunksize, workers=args.workers)
+                rate = len(expressions) / (time.perf_counter() - start)
+                print(f"{leaves:>7} {executor:>9} {chunksize:>10} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Số công thức phân biệt theo chuỗi và theo `canonical_key` trên tập lặp lại dưới dạng hoán vị toán hạng `+`/`*`.
+
+Chạy: python -m benchmarks.bench_canonical [--count 20000] [--distinct 0.1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from benchmarks.generator import generate_expression
+from src.batch import evaluate_many
+from src.cache import normalize_expression
+from src.canonical import deduplicate
+from src.expression_tree import PARSE_CACHE, Node, build_expression_tree
+
+
+def _permuted(node: Node, rng: random.Random) -> str:
+    """Viết lại cây dưới dạng infix, đổi chỗ ngẫu nhiên toán hạng của `+` và `*`."""
+    if node.is_leaf():
+        return node.value
+    left, right = _permuted(node.left, rng), _permuted(node.right, rng)
+    if node.value in "+*" and rng.random() < 0.5:
+        left, right = right, left
+    return f"({left} {node.value} {right})"
+
+
+def main() -> None:
+    """In số biểu thức phân biệt theo chuỗi và theo dạng chuẩn, cùng thời gian (µs/biểu thức) phân tích và lấy khóa so với phân tích và tính."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--distinct", type=float, default=0.1, help="Share of distinct formulas.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'leaves':>7} {'by text':>8} {'by key':>8} {'key us':>8} {'eval us':>8}")
+    for leaves in (4, 32, 256):
+        formulas = [
+            build_expression_tree(generate_expression(leaves, shape="random", seed=seed)).root
+            for seed in range(max(1, int(args.count * args.distinct)))
+        ]
+        expressions = [_permuted(rng.choice(formulas), rng) for _ in range(args.count)]
+        by_text = len({normalize_expression(expression) for expression in expressions})
+
+        PARSE_CACHE.clear()
+        start = time.perf_counter()
+        by_key = len(deduplicate(expressions)[0])
+        key_cost = (time.perf_counter() - start) / len(expressions)
+
+        PARSE_CACHE.clear()
+        start = time.perf_counter()
+        evaluate_many(expressions)
+        eval_cost = (time.perf_counter() - start) / len(expressions)
+        print(f"{leaves:>7} {by_text:>8} {by_key:>8} {key_cost * 1e6:>8.1f} {eval_cost * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""So sánh thời gian mỗi lần tính giữa `evaluate_postfix`, bytecode `run_program` và hàm sinh bởi `to_callable`.
+
+Chạy: python -m benchmarks.bench_codegen
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import timeit
+
+from benchmarks.generator import generate_expression
+from src.compiler import run_program
+from src.evaluator import evaluate_postfix
+from src.expression_tree import ExpressionTree
+
+
+def main() -> None:
+    """In thời gian trung bình mỗi lần tính (và chi phí sinh mã một lần) theo kích thước biểu thức."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'leaves':>7} {'postfix us':>11} {'bytecode us':>12} {'callable us':>12} {'speedup':>8} {'codegen ms':>11}")
+    for leaves in (5, 50, 500, 5000):
+        expression = generate_expression(leaves, shape="random", operators="+-*:", seed=leaves)
+        tree = ExpressionTree.from_infix(expression)
+        tokens = tree.postorder()
+        program = tree.compile()
+        start = time.perf_counter()
+        function = tree.to_callable()
+        codegen = time.perf_counter() - start
+        number = max(1, 50000 // leaves)
+        postfix = min(timeit.repeat(lambda: evaluate_postfix(tokens), number=number, repeat=args.repeat)) / number
+        bytecode = min(timeit.repeat(lambda: run_program(program), number=number, repeat=args.repeat)) / number
+        native = min(timeit.repeat(function, number=number, repeat=args.repeat)) / number
+        print(
+            f"{leaves:>7} {postfix * 1e6:>11.2f} {bytecode * 1e6:>12.2f} {native * 1e6:>12.2f}"
+            f" {postfix / native:>7.1f}x {codegen * 1e3:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
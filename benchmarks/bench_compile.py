@@ -0,0 +1,48 @@
+"""So sánh thời gian mỗi lần tính giữa `evaluate_postfix` và bytecode đã biên dịch.
+
+Chạy: python -m benchmarks.bench_compile
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+from src.compiler import run_program
+from src.evaluator import evaluate_postfix
+from src.expression_tree import build_expression_tree
+
+
+def _random_expression(terms: int, seed: int) -> str:
+    """Sinh biểu thức ngẫu nhiên (không có phép chia) với số hạng cho trước."""
+    rng = random.Random(seed)
+    parts = [str(rng.randint(1, 99))]
+    for _ in range(terms - 1):
+        parts.append(rng.choice("+-*"))
+        parts.append(str(rng.randint(1, 99)))
+    return " ".join(parts)
+
+
+def main() -> None:
+    """Đo thời gian trung bình mỗi lần tính cho một vài kích thước biểu thức."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'terms':>8} {'postfix (us)':>14} {'bytecode (us)':>14} {'speedup':>8}")
+    for terms in (5, 50, 500, 5000):
+        tree = build_expression_tree(_random_expression(terms, args.seed))
+        tokens = tree.postorder()
+        program = tree.compile()
+        number = max(1, 20000 // terms)
+        postfix = min(timeit.repeat(lambda: evaluate_postfix(tokens), number=number, repeat=args.repeat))
+        compiled = min(timeit.repeat(lambda: run_program(program), number=number, repeat=args.repeat))
+        postfix_us = postfix / number * 1e6
+        compiled_us = compiled / number * 1e6
+        print(f"{terms:>8} {postfix_us:>14.2f} {compiled_us:>14.2f} {postfix_us / compiled_us:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
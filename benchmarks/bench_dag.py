@@ -0,0 +1,42 @@
+"""Đo mức giảm số nút và thời gian tính khi gộp biểu thức con trùng lặp (DAG).
+
+Chạy: python -m benchmarks.bench_dag
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from src.dag import dag_stats, evaluate_dag
+from src.evaluator import evaluate_postfix
+from src.expression_tree import ExpressionTree
+
+
+def _repeated_expression(levels: int) -> str:
+    """Biểu thức mà mỗi cấp nhân đôi biểu thức con của cấp trước: `(e) * (e)`."""
+    expression = "(1 + 2) * (3 + 4)"
+    for level in range(levels):
+        operator = "+" if level % 2 else "-"
+        expression = f"({expression}) {operator} ({expression})"
+    return expression
+
+
+def main() -> None:
+    """In số nút cây/DAG và thời gian tính của từng cách."""
+    print(f"{'levels':>6} {'tree nodes':>11} {'dag nodes':>10} {'reduction':>10} {'postfix ms':>11} {'dag ms':>8}")
+    for levels in (2, 6, 10, 14):
+        expression = _repeated_expression(levels)
+        tree = ExpressionTree.from_infix(expression)
+        dag = ExpressionTree.from_infix(expression, share_subtrees=True)
+        stats = dag_stats(dag.root)
+        tokens = tree.postorder()
+        postfix_ms = min(timeit.repeat(lambda: evaluate_postfix(tokens), number=1, repeat=3)) * 1000
+        dag_ms = min(timeit.repeat(lambda: evaluate_dag(dag.root), number=1, repeat=3)) * 1000
+        print(
+            f"{levels:>6} {stats.tree_nodes:>11} {stats.unique_nodes:>10} "
+            f"{stats.reduction:>9.1%} {postfix_ms:>11.3f} {dag_ms:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
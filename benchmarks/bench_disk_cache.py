@@ -0,0 +1,54 @@
+"""Lần chạy CLI lạnh so với lần chạy lại với `--cache-file` đã có dữ liệu, theo cỡ biểu thức.
+
+Chạy: python -m benchmarks.bench_disk_cache [--count 5000] [--jobs 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from benchmarks.generator import generate_expression
+from src.expression_tree import PARSE_CACHE
+from src.main import main as cli_main
+
+
+def _timed_run(argv: list) -> float:
+    """Thời gian chạy CLI một lượt với bộ nhớ đệm phân tích trong RAM để trống."""
+    PARSE_CACHE.clear()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        cli_main(argv)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """In số biểu thức/giây khi không có cache, khi cache lạnh (ghi) và khi cache ấm (đọc)."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'leaves':>7} {'no cache':>10} {'cold':>10} {'warm':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for leaves in (4, 64, 1024):
+            source = os.path.join(directory, f"input-{leaves}.txt")
+            with open(source, "w", encoding="utf-8") as handle:
+                for seed in range(args.count):
+                    handle.write(generate_expression(leaves, shape="random", seed=seed) + "\n")
+            database = os.path.join(directory, f"cache-{leaves}.db")
+            common = ["--input", source, "--format", "jsonl", "--fields", "postfix,value", "--jobs", str(args.jobs)]
+            rates = [
+                args.count / _timed_run(common),
+                args.count / _timed_run(common + ["--cache-file", database]),
+                args.count / _timed_run(common + ["--cache-file", database]),
+            ]
+            print(f"{leaves:>7} " + " ".join(f"{rate:>10.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""So sánh tính lại gia tăng (`set_leaf` + `value`) với dựng lại và tính lại toàn bộ.
+
+Chạy: python -m benchmarks.bench_incremental
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from benchmarks.generator import generate_expression
+from src.evaluator import evaluate_postfix
+from src.expression_tree import ExpressionTree
+
+LEAVES = 50_000  # 2 * LEAVES - 1 ~ 10^5 nodes
+UPDATES = 200
+
+
+def main() -> None:
+    """In thời gian trung bình của một lần cập nhật lá theo từng cách, với các hình dạng cây."""
+    print(f"{'shape':>9} {'nodes':>7} {'full rebuild ms':>16} {'incremental us':>15} {'speedup':>8}")
+    for shape in ("balanced", "random", "left"):
+        expression = generate_expression(LEAVES, shape=shape, operators="+-*", seed=1)
+        tree = ExpressionTree.from_infix(expression)
+        nodes = len(tree.postorder())
+        tree.value()
+        rng = random.Random(0)
+        handles = tree.leaf_handles()
+        targets = [(rng.choice(handles), rng.randint(1, 9)) for _ in range(UPDATES)]
+
+        start = time.perf_counter()
+        for handle, value in targets:
+            tree.set_leaf(handle, value)
+            tree.value()
+        incremental = (time.perf_counter() - start) / UPDATES
+
+        # Baseline: re-run the whole pipeline from the infix string, a few times.
+        start = time.perf_counter()
+        for _ in range(3):
+            evaluate_postfix(ExpressionTree.from_infix(expression).postorder())
+        full = (time.perf_counter() - start) / 3
+
+        print(f"{shape:>9} {nodes:>7} {full * 1e3:>16.1f} {incremental * 1e6:>15.1f} {full / incremental:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""So sánh `evaluate_infix` (một lượt, hai ngăn xếp) với dựng cây rồi tính hậu tự: thời gian và bộ nhớ cấp phát.
+
+Chạy: python -m benchmarks.bench_infix
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import tracemalloc
+from typing import Callable
+
+from benchmarks.generator import generate_expression
+from src.evaluator import evaluate_infix, evaluate_postfix
+from src.expression_tree import ExpressionTree
+
+
+def _through_tree(expression: str) -> float:
+    """Đường cũ: `from_infix` → `postorder()` → `evaluate_postfix`."""
+    return evaluate_postfix(ExpressionTree.from_infix(expression).postorder())
+
+
+def _peak_kib(function: Callable[[str], float], expression: str) -> float:
+    """Đỉnh bộ nhớ cấp phát (KiB) trong một lần gọi."""
+    tracemalloc.start()
+    function(expression)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    """In thời gian mỗi lần tính và đỉnh bộ nhớ theo kích thước biểu thức."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'leaves':>7} {'tree us':>10} {'infix us':>10} {'speedup':>8} {'tree KiB':>10} {'infix KiB':>10}")
+    for leaves in (5, 50, 500, 5000):
+        expression = generate_expression(leaves, shape="random", operators="+-*", seed=leaves)
+        number = max(1, 20000 // leaves)
+        tree = min(timeit.repeat(lambda: _through_tree(expression), number=number, repeat=args.repeat)) / number
+        direct = min(timeit.repeat(lambda: evaluate_infix(expression), number=number, repeat=args.repeat)) / number
+        print(
+            f"{leaves:>7} {tree * 1e6:>10.1f} {direct * 1e6:>10.1f} {tree / direct:>7.2f}x"
+            f" {_peak_kib(_through_tree, expression):>10.1f} {_peak_kib(evaluate_infix, expression):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""So sánh số byte mỗi nút: `Node` có `__dict__`, `Node` dùng `__slots__` và cây dạng mảng.
+
+Chạy: python -m benchmarks.bench_memory [--nodes 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from src.expression_tree import ExpressionTree, build_tree_from_postfix
+from src.flat_tree import FlatTree
+
+
+@dataclass
+class DictNode:
+    """Bản sao của `Node` trước khi có `__slots__`, làm mốc so sánh."""
+
+    value: str
+    left: Optional["DictNode"] = None
+    right: Optional["DictNode"] = None
+
+
+def _build_dict_nodes(postfix: List[str]) -> DictNode:
+    stack: List[DictNode] = []
+    for token in postfix:
+        if token == "+":
+            right = stack.pop()
+            stack.append(DictNode(token, stack.pop(), right))
+        else:
+            stack.append(DictNode(token))
+    return stack[0]
+
+
+def _measure(build: Callable[[], object]) -> Tuple[object, int, float]:
+    """Trả về (kết quả, byte còn giữ, giây) khi dựng cấu trúc bằng `build`."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained, elapsed
+
+
+def main() -> None:
+    """In byte mỗi nút và thời gian dựng/duyệt của từng cách lưu trữ."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    leaves = (args.nodes + 1) // 2
+    postfix = ["1", "2"] + ["3", "+"] * (leaves - 2) + ["+"]
+    nodes = len(postfix)
+    print(f"nodes: {nodes}")
+    print(f"{'storage':>16} {'bytes/node':>11} {'build s':>8} {'preorder s':>11}")
+    cases = [
+        ("dict Node", lambda: _build_dict_nodes(postfix), None),
+        ("slots Node", lambda: build_tree_from_postfix(postfix), lambda root: ExpressionTree(root, "")),
+        ("FlatTree", lambda: FlatTree.from_postfix(postfix), lambda flat: ExpressionTree(None, "", flat=flat)),
+    ]
+    for name, build, wrap in cases:
+        result, retained, build_seconds = _measure(build)
+        traverse = ""
+        if wrap is not None:
+            tree = wrap(result)
+            start = time.perf_counter()
+            tree.preorder()
+            traverse = f"{time.perf_counter() - start:.3f}"
+        print(f"{name:>16} {retained / nodes:>11.1f} {build_seconds:>8.3f} {traverse:>11}")
+        del result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Đo khả năng mở rộng của `evaluate_parallel` với 1/2/4/8 tiến trình trên cây ~10^6 nút.
+
+Chạy: python -m benchmarks.bench_parallel [--leaves 500000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import timeit
+from multiprocessing import Pool
+
+from benchmarks.generator import generate_expression
+from src.compiler import run_program
+from src.expression_tree import ExpressionTree
+from src.parallel import evaluate_parallel
+
+WORKERS = (1, 2, 4, 8)
+
+
+def main() -> None:
+    """In thời gian tính tuần tự và song song (pool tạo sẵn, không tính thời gian khởi động)."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leaves", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"cpu_count={os.cpu_count()}")
+    print(f"{'shape':>9} {'nodes':>8} {'workers':>7} {'ms':>9} {'speedup':>8}")
+    for shape in ("balanced", "random"):
+        expression = generate_expression(args.leaves, shape=shape, operators="+-*", seed=7)
+        tree = ExpressionTree.from_infix(expression, compact=True)
+        program = tree.compile()
+        serial = min(timeit.repeat(lambda: run_program(program), number=1, repeat=args.repeat))
+        print(f"{shape:>9} {len(program):>8} {'serial':>7} {serial * 1e3:>9.1f} {1:>7.2f}x")
+        for workers in WORKERS:
+            with Pool(workers) as pool:
+                elapsed = min(
+                    timeit.repeat(
+                        lambda: evaluate_parallel(tree, workers=workers, min_nodes=0, pool=pool),
+                        number=1,
+                        repeat=args.repeat,
+                    )
+                )
+            print(f"{shape:>9} {len(program):>8} {workers:>7} {elapsed * 1e3:>9.1f} {serial / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Độ sâu và thời gian duyệt/tính của chuỗi `+`/`*` dài trước và sau `rebalance()`.
+
+Chạy: python -m benchmarks.bench_rebalance [--leaves 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List, Tuple
+
+from benchmarks.generator import generate_expression
+from src.evaluator import evaluate_postfix
+from src.expression_tree import ExpressionTree
+from src.rebalance import tree_depth
+
+
+def _seconds(func: Callable[[], object], repeat: int) -> float:
+    """Thời gian tốt nhất của `repeat` lần chạy."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """In độ sâu và thời gian từng thao tác cho cây gốc và cây đã cân bằng."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leaves", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # ASCII rendering is left out: a left-deep chain renders in O(n^2) characters.
+    print(f"{'operators':>9} {'tree':>9} {'depth':>7} {'postorder ms':>13} {'postfix eval ms':>16} {'compiled ms':>12}")
+    for operators in ("+", "+-", "*"):
+        expression = generate_expression(args.leaves, shape="left", operators=operators, seed=1)
+        original = ExpressionTree.from_infix(expression)
+        start = time.perf_counter()
+        balanced = original.rebalance(exact=False).tree
+        rebalance_ms = (time.perf_counter() - start) * 1e3
+        rows: List[Tuple[str, ExpressionTree]] = [("original", original), ("balanced", balanced)]
+        for name, tree in rows:
+            tokens = tree.postorder()
+            program = tree.compile()
+            print(
+                f"{operators:>9} {name:>9} {tree_depth(tree.root):>7}"
+                f" {_seconds(tree.postorder, args.repeat) * 1e3:>13.1f}"
+                f" {_seconds(lambda: evaluate_postfix(tokens), args.repeat) * 1e3:>16.1f}"
+                f" {_seconds(program.evaluate, args.repeat) * 1e3:>12.1f}"
+            )
+        print(f"{'':>9} rebalance() took {rebalance_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Khởi động nguội của một catalog biểu thức: phân tích lại mọi biểu thức so với mở file catalog mmap.
+
+Chạy: python -m benchmarks.bench_serialization --count 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.generator import generate_expression
+from src.expression_tree import ExpressionTree
+from src.serialization import Catalog, write_catalog
+
+
+def main() -> None:
+    """In thời gian để tính được cây thứ N theo từng cách."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="Expressions in the catalog.")
+    parser.add_argument("--max-leaves", type=int, default=32)
+    parser.add_argument("--lookups", type=int, default=1000, help="Random trees evaluated after start-up.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = [generate_expression(rng.randint(2, args.max_leaves), shape="random", seed=seed) for seed in range(1024)]
+    expressions = [pool[index % len(pool)] for index in range(args.count)]
+    targets = [rng.randrange(args.count) for _ in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.mad")
+        start = time.perf_counter()
+        write_catalog(path, expressions)
+        written = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        programs = [ExpressionTree.from_infix(expression).compile() for expression in expressions]
+        reparse_start = time.perf_counter() - start
+        start = time.perf_counter()
+        for number in targets:
+            programs[number].evaluate()
+        reparse_lookup = (time.perf_counter() - start) / args.lookups
+
+        start = time.perf_counter()
+        with Catalog(path) as catalog:
+            catalog_start = time.perf_counter() - start
+            start = time.perf_counter()
+            for number in targets:
+                catalog.evaluate(number)
+            catalog_lookup = (time.perf_counter() - start) / args.lookups
+
+    print(f"catalog: {args.count} trees, {size / 2**20:.1f} MiB, written in {written:.2f} s")
+    print(f"{'method':>10} {'start-up s':>11} {'per lookup us':>14}")
+    print(f"{'re-parse':>10} {reparse_start:>11.3f} {reparse_lookup * 1e6:>14.1f}")
+    print(f"{'catalog':>10} {catalog_start:>11.6f} {catalog_lookup * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Bộ sinh tải cho `src.serve`: gửi yêu cầu song song qua nhiều kết nối, đo thông lượng và độ trễ p50/p99.
+
+Chạy:
+    python -m benchmarks.bench_serve --spawn --workers 2
+    python -m benchmarks.bench_serve --port 8765 --connections 16 --requests 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.generator import generate_expression
+from src.serve import EvaluationServer
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Phân vị nearest-rank trên danh sách đã sắp xếp."""
+    return ordered[min(len(ordered) - 1, max(0, int(len(ordered) * percent / 100 + 0.5) - 1))]
+
+
+async def _connection(
+    args: argparse.Namespace,
+    expressions: List[str],
+    latencies: List[float],
+    errors: List[int],
+) -> None:
+    """Một kết nối gửi liên tục tối đa `window` yêu cầu chưa có trả lời."""
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    window = asyncio.Semaphore(args.window)
+    sent: List[float] = []
+
+    async def receive() -> None:
+        for index in range(len(expressions)):
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent[index])
+            window.release()
+            if "error" in response:
+                errors[0] += 1
+
+    receiver = asyncio.ensure_future(receive())
+    for index, expression in enumerate(expressions):
+        await window.acquire()
+        sent.append(time.perf_counter())
+        writer.write(json.dumps({"id": index, "expression": expression}).encode() + b"\n")
+        await writer.drain()
+    await receiver
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_load(args: argparse.Namespace) -> Dict[str, float]:
+    """Chạy tải và trả về thông lượng (yêu cầu/giây) cùng độ trễ (ms)."""
+    server: Optional[EvaluationServer] = None
+    listener = None
+    if args.spawn:
+        server = EvaluationServer(workers=args.workers, batch_size=args.batch_size, batch_delay=args.batch_delay)
+        listener = await server.start(host=args.host, port=0, path=args.unix)
+        if not args.unix:
+            args.port = listener.sockets[0].getsockname()[1]
+    rng = random.Random(args.seed)
+    pool = [generate_expression(rng.randint(4, args.max_leaves), shape="random", seed=seed) for seed in range(256)]
+    per_connection = args.requests // args.connections
+    latencies: List[float] = []
+    errors = [0]
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(
+                _connection(args, [rng.choice(pool) for _ in range(per_connection)], latencies, errors)
+                for _ in range(args.connections)
+            )
+        )
+    finally:
+        elapsed = time.perf_counter() - start
+        if listener is not None:
+            listener.close()
+        if server is not None:
+            server.close()
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors[0],
+        "seconds": elapsed,
+        "throughput": len(ordered) / elapsed,
+        "p50_ms": _percentile(ordered, 50) * 1e3,
+        "p99_ms": _percentile(ordered, 99) * 1e3,
+    }
+
+
+def main() -> None:
+    """In kết quả tải dạng JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=10_000, help="Total requests across connections.")
+    parser.add_argument("--window", type=int, default=64, help="Unanswered requests allowed per connection.")
+    parser.add_argument("--max-leaves", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="Start a server in this process first.")
+    parser.add_argument("--workers", type=int, help="Worker processes for --spawn.")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--batch-delay", type=float, default=0.002)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run_load(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
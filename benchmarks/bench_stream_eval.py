@@ -0,0 +1,94 @@
+"""Tính file prefix/postfix rất lớn: `evaluate_*_expression` (split toàn bộ) so với quét theo luồng/mmap.
+
+Chạy: python -m benchmarks.bench_stream_eval [--megabytes 64]
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from src.evaluator import evaluate_postfix_expression, evaluate_prefix_expression
+from src.streaming import evaluate_postfix_stream, evaluate_prefix_stream
+
+
+def _write(path: str, megabytes: float, prefix: bool, seed: int) -> int:
+    """Ghi một chuỗi cộng/trừ dài (postfix lệch trái hoặc prefix lệch phải) để ngăn xếp luôn nông."""
+    rng = random.Random(seed)
+    target = int(megabytes * 1_000_000)
+    size = 0
+    with open(path, "w", encoding="ascii") as handle:
+        if not prefix:
+            handle.write("1 ")
+        while size < target:
+            terms = ((rng.choice("+-"), rng.randint(1, 999)) for _ in range(1000))
+            part = " ".join(f"{op} {n}" if prefix else f"{n} {op}" for op, n in terms) + " "
+            handle.write(part)
+            size += len(part)
+        if prefix:
+            handle.write("1")
+    return os.path.getsize(path)
+
+
+def _measure(func: Callable[[], float]) -> Tuple[float, float, float]:
+    """Trả về (kết quả, giây, MB đỉnh do tracemalloc đo ở một lần chạy riêng)."""
+    start = time.perf_counter()
+    value = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, elapsed, peak / 1e6
+
+
+def main() -> None:
+    """In thời gian và bộ nhớ đỉnh theo từng cách đọc."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=16.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'case':>28} {'seconds':>9} {'peak MB':>9}")
+        for prefix in (False, True):
+            kind = "prefix" if prefix else "postfix"
+            path = os.path.join(directory, f"{kind}.txt")
+            size = _write(path, args.megabytes, prefix, args.seed)
+            print(f"{kind}: {size / 1e6:.1f} MB")
+            reference = evaluate_prefix_expression if prefix else evaluate_postfix_expression
+            streamed = evaluate_prefix_stream if prefix else evaluate_postfix_stream
+
+            def read_and_split() -> float:
+                with open(path, encoding="ascii") as handle:
+                    return reference(handle.read())
+
+            def stream_file() -> float:
+                with open(path, "rb") as handle:
+                    return streamed(handle)
+
+            def stream_mmap() -> float:
+                with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return streamed(mapped)
+
+            cases: List[Tuple[str, Callable[[], float]]] = [
+                (f"{kind}_expression(read())", read_and_split),
+                (f"{kind}_stream(file)", stream_file),
+                (f"{kind}_stream(mmap)", stream_mmap),
+            ]
+            values = set()
+            for name, func in cases:
+                value, elapsed, peak = _measure(func)
+                values.add(value)
+                print(f"{name:>28} {elapsed:>9.3f} {peak:>9.1f}")
+            assert len(values) == 1, values
+
+
+if __name__ == "__main__":
+    main()
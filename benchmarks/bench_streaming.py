@@ -0,0 +1,113 @@
+"""So sánh tokenizer/đường ống cũ với bản quét regex và dựng cây theo luồng trên đầu vào nhiều MB.
+
+Chạy: python -m benchmarks.bench_streaming [--megabytes 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import timeit
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from src.expression_tree import ExpressionTree, OPERATORS, infix_to_postfix, tokenize
+from src.streaming import iter_tokens
+
+
+def _char_loop_tokenize(expression: str) -> List[str]:
+    """Tokenizer duyệt từng ký tự như trước đây, giữ lại làm mốc so sánh."""
+    tokens: List[str] = []
+    buffer: List[str] = []
+    for char in expression:
+        if char.isdigit():
+            buffer.append(char)
+            continue
+        if char.isalpha() or char == "_":
+            if buffer and buffer[0].isdigit():
+                tokens.append("".join(buffer))
+                buffer.clear()
+            buffer.append(char)
+            continue
+        if char.isspace() or char in OPERATORS or char in {"(", ")"}:
+            if buffer:
+                tokens.append("".join(buffer))
+                buffer.clear()
+            if not char.isspace():
+                tokens.append(char)
+            continue
+        raise ValueError(f"Unsupported character '{char}'")
+    if buffer:
+        tokens.append("".join(buffer))
+    return tokens
+
+
+def _generate(megabytes: float, seed: int) -> str:
+    """Sinh biểu thức phẳng kích thước khoảng `megabytes` MB, có ngoặc nông."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    size = 0
+    target = int(megabytes * 1_000_000)
+    while size < target:
+        term = f"({rng.randint(1, 9999)} * {rng.randint(1, 99)} - {rng.randint(1, 999)})"
+        parts.append(term)
+        size += len(term) + 3
+    return " + ".join(parts)
+
+
+def _measure(func: Callable[[], object], repeat: int) -> Tuple[float, float, float]:
+    """Trả về (giây tốt nhất, MB đỉnh, MB còn giữ bởi kết quả) của `func`.
+
+    Thời gian đo riêng, không bật tracemalloc vì nó làm chậm mọi cấp phát.
+    Hiệu `đỉnh - còn giữ` là bộ nhớ tạm (danh sách token/postfix, ngăn xếp).
+    """
+    elapsed = min(timeit.repeat(func, number=1, repeat=repeat))
+    tracemalloc.start()
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak / 1e6, retained / 1e6
+
+
+def main() -> None:
+    """In thời gian và bộ nhớ đỉnh của từng cách tách token và dựng cây."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=4.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    expression = _generate(args.megabytes, args.seed)
+    print(f"input: {len(expression) / 1e6:.1f} MB")
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as handle:
+        handle.write(expression)
+    path = handle.name
+
+    def read_tokens() -> int:
+        with open(path, encoding="utf-8") as source:
+            return sum(1 for _ in iter_tokens(source))
+
+    def stream_tree() -> ExpressionTree:
+        with open(path, encoding="utf-8") as source:
+            return ExpressionTree.from_stream(source)
+
+    cases = [
+        ("char-loop tokenize", lambda: _char_loop_tokenize(expression)),
+        ("regex tokenize", lambda: tokenize(expression)),
+        ("iter_tokens (file)", read_tokens),
+        ("infix_to_postfix", lambda: infix_to_postfix(tokenize(expression))),
+        ("from_infix", lambda: ExpressionTree.from_infix(expression)),
+        ("from_stream (file)", stream_tree),
+    ]
+    print(f"{'stage':>20} {'seconds':>9} {'peak MB':>9} {'transient MB':>13}")
+    for name, func in cases:
+        elapsed, peak, retained = _measure(func, args.repeat)
+        print(f"{name:>20} {elapsed:>9.3f} {peak:>9.1f} {peak - retained:>13.1f}")
+    os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Đo thời gian các phép duyệt lặp trên cây 10^3–10^6 nút (cân bằng và lệch trái).
+
+Chạy: python -m benchmarks.bench_traversals [--max-nodes 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Callable, List, Optional
+
+from src.expression_tree import ExpressionTree, Node, build_tree_from_postfix
+
+
+def _balanced_postfix(leaves: int) -> List[str]:
+    """Postfix của cây cân bằng gồm `leaves` lá nối bằng phép cộng."""
+    if leaves == 1:
+        return ["1"]
+    half = leaves // 2
+    return _balanced_postfix(half) + _balanced_postfix(leaves - half) + ["+"]
+
+
+def _left_deep_postfix(leaves: int) -> List[str]:
+    """Postfix của chuỗi `1 + 1 + ... + 1` (cây lệch trái, độ sâu bằng số lá)."""
+    return ["1"] + ["1", "+"] * (leaves - 1)
+
+
+def _recursive_pre_order(node: Optional[Node], acc: List[str]) -> None:
+    """Bản đệ quy cũ, chỉ dùng làm mốc so sánh trên cây nông."""
+    if node is None:
+        return
+    acc.append(node.value)
+    _recursive_pre_order(node.left, acc)
+    _recursive_pre_order(node.right, acc)
+
+
+def _timed(func: Callable[[], object]) -> float:
+    """Trả về thời gian (ms) của một lần gọi `func`."""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def _recursive_preorder(tree: ExpressionTree) -> List[str]:
+    result: List[str] = []
+    _recursive_pre_order(tree.root, result)
+    return result
+
+
+def main() -> None:
+    """In bảng thời gian (ms) cho từng phép duyệt, kích thước và hình dạng cây."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-nodes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    columns = ["preorder", "inorder", "postorder", "iter_post", "recursive_pre"]
+    print(f"{'shape':>10} {'nodes':>9} " + " ".join(f"{name:>13}" for name in columns))
+    nodes = 1_000
+    while nodes <= args.max_nodes:
+        leaves = (nodes + 1) // 2
+        for shape, generate in (("balanced", _balanced_postfix), ("left-deep", _left_deep_postfix)):
+            tree = ExpressionTree(build_tree_from_postfix(generate(leaves)), expression="")
+            timings = [
+                _timed(tree.preorder),
+                _timed(tree.inorder),
+                _timed(tree.postorder),
+                _timed(lambda: sum(1 for _ in tree.iter_postorder())),
+            ]
+            if shape == "balanced" or leaves < sys.getrecursionlimit() - 50:
+                timings.append(_timed(lambda: _recursive_preorder(tree)))
+            else:
+                timings.append(float("nan"))  # RecursionError territory
+            print(f"{shape:>10} {2 * leaves - 1:>9} " + " ".join(f"{value:>13.2f}" for value in timings))
+        nodes *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Sinh biểu thức infix ngẫu nhiên có seed, điều khiển được kích thước, hình dạng và toán tử."""
+
+from __future__ import annotations
+
+import random
+from typing import List, Union
+
+SHAPES = ("balanced", "left", "right", "random")
+DEFAULT_OPERATORS = "+-*:^"
+
+
+def generate_expression(
+    leaves: int,
+    shape: str = "balanced",
+    operators: str = DEFAULT_OPERATORS,
+    seed: int = 0,
+) -> str:
+    """Sinh biểu thức có đúng `leaves` toán hạng (tức `2 * leaves - 1` nút).
+
+    - `shape`: `balanced` (độ sâu ~log2 n), `left`/`right` (lệch trái/phải, độ
+      sâu ~n) hoặc `random` (tách ngẫu nhiên).
+    - `operators`: tập toán tử được chọn ngẫu nhiên; lặp ký tự để tăng trọng số,
+      ví dụ `"++*"`.
+
+    Mọi biểu thức con đều có ngoặc nên hình dạng cây không phụ thuộc độ ưu tiên.
+    Để phép tính không ném lỗi, vế phải của `:` luôn là lá 1-9 (kéo cây lệch
+    trái) và `^` chỉ xuất hiện giữa hai lá (cơ số 1-9, số mũ 1-3).
+    """
+    if leaves < 1:
+        raise ValueError("leaves must be at least 1.")
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape '{shape}'; expected one of {', '.join(SHAPES)}.")
+    non_power = operators.replace("^", "")
+    if not non_power:
+        raise ValueError("operators must include at least one of '+', '-', '*', ':'.")
+    rng = random.Random(seed)
+    parts: List[str] = []
+    # Explicit work stack: an int is a subtree with that many leaves, a str is literal text.
+    stack: List[Union[int, str]] = [leaves]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        if item == 1:
+            parts.append(str(rng.randint(1, 99)))
+            continue
+        op = rng.choice(operators if item == 2 else non_power)
+        if op == "^":
+            stack.append(f"({rng.randint(1, 9)} ^ {rng.randint(1, 3)})")
+            continue
+        if op == ":":
+            right_leaves = 1
+        elif shape == "balanced":
+            right_leaves = item // 2
+        elif shape == "left":
+            right_leaves = 1
+        elif shape == "right":
+            right_leaves = item - 1
+        else:
+            right_leaves = rng.randint(1, item - 1)
+        right: Union[int, str] = str(rng.randint(1, 9)) if op == ":" else right_leaves
+        stack.extend([")", right, f" {op} ", item - right_leaves, "("])
+    return "".join(parts)
@@ -0,0 +1,201 @@
+"""Bộ benchmark đo riêng từng giai đoạn của đường ống biểu thức, xuất JSON và so với baseline.
+
+Chạy:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.generator import DEFAULT_OPERATORS, SHAPES, generate_expression
+from src.compiler import run_program
+from src.evaluator import evaluate_postfix, evaluate_prefix
+from src.expression_tree import (
+    ExpressionTree,
+    Node,
+    build_tree_from_postfix,
+    infix_to_postfix,
+    tokenize,
+)
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_THRESHOLD = 0.10
+RESULT_KEY = ("shape", "leaves", "stage")
+
+
+def tree_depth(root: Node) -> int:
+    """Độ sâu (số nút trên đường dài nhất từ gốc tới lá), tính bằng ngăn xếp."""
+    depth = 0
+    stack: List[Tuple[Node, int]] = [(root, 1)]
+    while stack:
+        node, level = stack.pop()
+        depth = max(depth, level)
+        for child in (node.left, node.right):
+            if child is not None:
+                stack.append((child, level + 1))
+    return depth
+
+
+def time_call(func: Callable[[], object], repeat: int, min_time: float = 0.02) -> float:
+    """Thời gian tốt nhất (giây) cho một lần gọi `func`; mỗi vòng đo kéo dài ít nhất `min_time`."""
+    timer = timeit.Timer(func)
+    single = timer.timeit(number=1)
+    number = max(1, math.ceil(min_time / single)) if single > 0 else 1000
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _stages(expression: str, render_max_depth: int) -> Tuple[Dict[str, Callable[[], object]], int, int]:
+    """Chuẩn bị đầu vào của từng giai đoạn; trả về (giai đoạn, số nút, độ sâu)."""
+    tokens = tokenize(expression)
+    postfix = infix_to_postfix(tokens)
+    root = build_tree_from_postfix(postfix)
+    tree = ExpressionTree(root=root, expression=expression)
+    prefix = tree.preorder()
+    program = tree.compile()
+    depth = tree_depth(root)
+    stages: Dict[str, Callable[[], object]] = {
+        "tokenize": lambda: tokenize(expression),
+        "infix_to_postfix": lambda: infix_to_postfix(tokens),
+        "build_tree_from_postfix": lambda: build_tree_from_postfix(postfix),
+        "preorder": tree.preorder,
+        "inorder": tree.inorder,
+        "postorder": tree.postorder,
+        "evaluate_prefix": lambda: evaluate_prefix(prefix),
+        "evaluate_postfix": lambda: evaluate_postfix(postfix),
+        "run_program": lambda: run_program(program),
+    }
+    # ASCII output grows with nodes * depth; skip it on degenerate deep trees.
+    if depth <= render_max_depth:
+        stages["render_ascii"] = tree.render_ascii
+    return stages, len(postfix), depth
+
+
+def run_suite(
+    sizes: List[int],
+    shapes: List[str],
+    operators: str = DEFAULT_OPERATORS,
+    seed: int = 0,
+    repeat: int = 3,
+    stages: Optional[List[str]] = None,
+    render_max_depth: int = 200,
+    min_time: float = 0.02,
+) -> Dict[str, Any]:
+    """Chạy toàn bộ ma trận (hình dạng × kích thước × giai đoạn) và trả về kết quả dạng dict."""
+    results: List[Dict[str, Any]] = []
+    for shape in shapes:
+        for leaves in sizes:
+            expression = generate_expression(leaves, shape=shape, operators=operators, seed=seed)
+            available, nodes, depth = _stages(expression, render_max_depth)
+            for stage, func in available.items():
+                if stages and stage not in stages:
+                    continue
+                results.append(
+                    {
+                        "shape": shape,
+                        "leaves": leaves,
+                        "nodes": nodes,
+                        "depth": depth,
+                        "stage": stage,
+                        "seconds": time_call(func, repeat, min_time),
+                    }
+                )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "seed": seed,
+            "operators": operators,
+            "repeat": repeat,
+            "min_time": min_time,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Ghép kết quả với baseline theo (shape, leaves, stage) và tính tỉ lệ thời gian.
+
+    Mỗi phần tử trả về có thêm `baseline_seconds`, `ratio` và cờ `regression`
+    (chậm hơn baseline quá `threshold`, ví dụ 0.10 = 10%).
+    """
+    previous = {tuple(row[key] for key in RESULT_KEY): row for row in baseline.get("results", [])}
+    rows: List[Dict[str, Any]] = []
+    for row in current["results"]:
+        match = previous.get(tuple(row[key] for key in RESULT_KEY))
+        if match is None:
+            continue
+        ratio = row["seconds"] / match["seconds"] if match["seconds"] else float("inf")
+        rows.append({**row, "baseline_seconds": match["seconds"], "ratio": ratio, "regression": ratio > 1 + threshold})
+    return rows
+
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    """In bảng kết quả dễ đọc ra stderr (stdout dành cho JSON)."""
+    for row in results:
+        line = f"{row['shape']:>9} {row['leaves']:>7} {row['stage']:>24} {row['seconds'] * 1e6:>12.1f} us"
+        if "ratio" in row:
+            flag = "  REGRESSION" if row["regression"] else ""
+            line += f"  x{row['ratio']:.2f}{flag}"
+        print(line, file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Điểm vào CLI; trả về 1 nếu có giai đoạn chậm hơn baseline quá ngưỡng."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Leaf counts.")
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    parser.add_argument("--operators", default=DEFAULT_OPERATORS, help="Operator mix, e.g. '++*'.")
+    parser.add_argument("--stages", nargs="+", help="Only run these stages.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.02, help="Seconds per timing round.")
+    parser.add_argument("--render-max-depth", type=int, default=200)
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout).")
+    parser.add_argument("--baseline", help="Compare against a JSON file saved by a previous run.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown ratio.")
+    args = parser.parse_args(argv)
+
+    report = run_suite(
+        sizes=args.sizes,
+        shapes=args.shapes,
+        operators=args.operators,
+        seed=args.seed,
+        repeat=args.repeat,
+        stages=args.stages,
+        render_max_depth=args.render_max_depth,
+        min_time=args.min_time,
+    )
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            rows = compare(report, json.load(handle), args.threshold)
+        report["comparison"] = {"baseline": args.baseline, "threshold": args.threshold, "results": rows}
+        regressions = sum(row["regression"] for row in rows)
+        _print_table(rows)
+    else:
+        _print_table(report["results"])
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(payload + "\n")
+    else:
+        print(payload)
+    if regressions:
+        print(f"{regressions} stage(s) slower than baseline by more than {args.threshold:.0%}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
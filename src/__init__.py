@@ -1,7 +1,18 @@
 """Bộ công cụ xây cây biểu thức và đánh giá công thức cho bài tập MAD."""
 
-from .expression_tree import ExpressionTree, Node, build_expression_tree
+from .batch import EvaluationFailure, evaluate_many
+from .budget import BudgetExceededError, EvaluationBudget
+from .cache import CacheStats
+from .disk_cache import DiskCache
+from .expression_tree import (
+    ExpressionTree,
+    Node,
+    build_expression_tree,
+    configure_parse_cache,
+    parse_cache_stats,
+)
 from .evaluator import (
+    evaluate_infix,
     evaluate_postfix,
     evaluate_postfix_expression,
     evaluate_prefix,
@@ -12,6 +23,15 @@ __all__ = [
     "ExpressionTree",
     "Node",
     "build_expression_tree",
+    "configure_parse_cache",
+    "parse_cache_stats",
+    "CacheStats",
+    "DiskCache",
+    "EvaluationBudget",
+    "BudgetExceededError",
+    "evaluate_infix",
+    "evaluate_many",
+    "EvaluationFailure",
     "evaluate_prefix",
     "evaluate_prefix_expression",
     "evaluate_postfix",
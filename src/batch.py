@@ -0,0 +1,96 @@
+"""Tính nhiều biểu thức infix một lúc, tuần tự hoặc trên pool luồng/tiến trình, trả lỗi theo từng phần tử."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterable, List, Mapping, Optional, Sequence, Union
+
+from .budget import EvaluationBudget
+from .expression_tree import build_expression_tree
+
+EXECUTORS = ("serial", "thread", "process")
+DEFAULT_CHUNKSIZE = 256
+
+
+@dataclass(frozen=True)
+class EvaluationFailure:
+    """Lỗi của một biểu thức trong lô; được trả về thay vì ném ra."""
+
+    index: int
+    expression: str
+    error: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.error}: {self.message}"
+
+
+Result = Union[float, complex, EvaluationFailure]
+
+
+def _evaluate_chunk(
+    chunk: Sequence[str],
+    start: int,
+    variables: Optional[Mapping[str, float]] = None,
+    budget: Optional[EvaluationBudget] = None,
+) -> List[Result]:
+    """Tính một khối biểu thức; cây phân tích và chương trình biên dịch được lưu trong cache của tiến trình."""
+    results: List[Result] = []
+    for offset, expression in enumerate(chunk):
+        try:
+            results.append(build_expression_tree(expression).compile().evaluate(variables, budget=budget))
+        except (ValueError, TypeError, ArithmeticError) as exc:
+            # TypeError: a non-numeric variable value or a non-str expression.
+            results.append(EvaluationFailure(start + offset, expression, type(exc).__name__, str(exc)))
+    return results
+
+
+def evaluate_many(
+    expressions: Iterable[str],
+    executor: Union[str, Executor] = "serial",
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    workers: Optional[int] = None,
+    variables: Optional[Mapping[str, float]] = None,
+    budget: Optional[EvaluationBudget] = None,
+) -> List[Result]:
+    """Tính danh sách biểu thức infix và trả về kết quả theo đúng thứ tự đầu vào.
+
+    - `executor`: "serial", "thread", "process" hoặc một `Executor` có sẵn
+      (tái sử dụng pool giữ cache phân tích của worker giữa các lần gọi).
+    - `chunksize`: số biểu thức mỗi lần gửi cho worker, để chia nhỏ chi phí IPC.
+    - `workers`: kích thước pool tự tạo (mặc định số CPU).
+
+    Biểu thức lỗi (cú pháp, chia cho 0, vượt `budget`...) cho ra
+    `EvaluationFailure` ở đúng vị trí thay vì ném ngoại lệ.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1.")
+    items = list(expressions)
+    task = partial(_evaluate_chunk, variables=variables, budget=budget)
+    if executor == "serial":
+        return task(items, 0)
+
+    starts = range(0, len(items), chunksize)
+    chunks = [items[start:start + chunksize] for start in starts]
+    if isinstance(executor, Executor):
+        pool = executor
+        owned = False
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(workers or os.cpu_count() or 1)
+        owned = True
+    elif executor == "process":
+        pool = ProcessPoolExecutor(workers)
+        owned = True
+    else:
+        raise ValueError(f"Unknown executor '{executor}'; expected one of {', '.join(EXECUTORS)}.")
+    try:
+        results: List[Result] = []
+        for chunk_results in pool.map(task, chunks, starts):
+            results.extend(chunk_results)
+        return results
+    finally:
+        if owned:
+            pool.shutdown()
@@ -0,0 +1,114 @@
+"""Ngân sách tài nguyên khi tính biểu thức: giới hạn số nút, độ sâu, độ lớn toán hạng, lũy thừa và thời gian."""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# Deadline is checked once per this many tokens to keep the hot loop cheap.
+DEADLINE_CHECK_INTERVAL = 1024
+
+
+class BudgetExceededError(ValueError):
+    """Biểu thức vượt quá một giới hạn của `EvaluationBudget`."""
+
+    def __init__(self, limit: str, value: float, maximum: float) -> None:
+        super().__init__(f"Evaluation budget exceeded: {limit} {value:g} > {maximum:g}.")
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+
+
+@dataclass(frozen=True)
+class EvaluationBudget:
+    """Các giới hạn cho một lần tính; trường None nghĩa là không giới hạn.
+
+    - `max_nodes`: số token/nút tối đa.
+    - `max_depth`: độ sâu cây tối đa (tính từ ngăn xếp khi duyệt postfix).
+    - `max_magnitude`: trị tuyệt đối lớn nhất của toán hạng và kết quả trung gian.
+    - `max_power_digits`: ước lượng số chữ số của `a ^ b` (`b * log10|a|`),
+      kiểm tra trước khi lũy thừa.
+    - `timeout`: số giây tối đa cho một lần tính.
+    """
+
+    max_nodes: Optional[int] = None
+    max_depth: Optional[int] = None
+    max_magnitude: Optional[float] = None
+    max_power_digits: Optional[float] = None
+    timeout: Optional[float] = None
+
+    def allows_unchecked(self, nodes: int, has_power: bool) -> bool:
+        """True nếu biểu thức `nodes` nút chắc chắn không vượt ngân sách, có thể tính không cần kiểm tra.
+
+        Độ sâu không vượt quá số nút, và biểu thức ngắn hơn một chu kỳ kiểm tra
+        đồng hồ thì không cần theo dõi thời gian.
+        """
+        if self.max_magnitude is not None or (has_power and self.max_power_digits is not None):
+            return False
+        if self.timeout is not None and nodes >= DEADLINE_CHECK_INTERVAL:
+            return False
+        return all(limit is None or nodes <= limit for limit in (self.max_nodes, self.max_depth))
+
+
+# Generous limits for batch processing: valid inputs pass, hostile lines fail fast.
+# max_magnitude is deliberately unbounded: any magnitude limit forces the checked
+# per-token loop on every expression. Overflow to inf/nan is instead reported
+# by the callers (CLI jsonl records, serve responses) as a non-finite result.
+DEFAULT_BUDGET = EvaluationBudget(max_nodes=1_000_000, max_depth=100_000, max_power_digits=308.0, timeout=5.0)
+
+
+class BudgetGuard:
+    """Theo dõi một lần tính theo `EvaluationBudget` (thời điểm hết hạn tính từ lúc tạo)."""
+
+    __slots__ = ("budget", "deadline", "_ticks")
+
+    def __init__(self, budget: EvaluationBudget) -> None:
+        self.budget = budget
+        self.deadline = time.monotonic() + budget.timeout if budget.timeout is not None else None
+        self._ticks = 0
+
+    def check_nodes(self, nodes: int) -> None:
+        """Kiểm tra tổng số nút trước khi bắt đầu tính."""
+        maximum = self.budget.max_nodes
+        if maximum is not None and nodes > maximum:
+            raise BudgetExceededError("node count", nodes, maximum)
+
+    def check_depth(self, depth: int) -> None:
+        """Kiểm tra độ sâu của cây con vừa tính xong."""
+        maximum = self.budget.max_depth
+        if maximum is not None and depth > maximum:
+            raise BudgetExceededError("depth", depth, maximum)
+
+    def check_value(self, value: float) -> None:
+        """Kiểm tra độ lớn của một toán hạng hoặc kết quả trung gian."""
+        maximum = self.budget.max_magnitude
+        if maximum is not None and not abs(value) <= maximum:  # also rejects nan
+            raise BudgetExceededError("magnitude", abs(value), maximum)
+
+    def check_power(self, base: float, exponent: float) -> None:
+        """Ước lượng số chữ số của `base ^ exponent` và từ chối trước khi tính nếu quá lớn."""
+        maximum = self.budget.max_power_digits
+        if maximum is None or base == 0:
+            return
+        try:
+            digits = float(exponent) * math.log10(abs(base))
+        except TypeError:  # complex operands: bound by magnitudes instead
+            digits = abs(exponent) * abs(math.log10(abs(base)))
+        if digits > maximum:
+            raise BudgetExceededError("power digits", digits, maximum)
+
+    def tick(self) -> None:
+        """Gọi sau mỗi token; cứ `DEADLINE_CHECK_INTERVAL` lần mới đọc đồng hồ."""
+        if self.deadline is None:
+            return
+        self._ticks += 1
+        if self._ticks % DEADLINE_CHECK_INTERVAL == 0:
+            self.check_deadline()
+
+    def check_deadline(self) -> None:
+        """Báo lỗi nếu đã quá thời gian cho phép."""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            timeout = self.budget.timeout or 0.0
+            raise BudgetExceededError("seconds", timeout + time.monotonic() - self.deadline, timeout)
@@ -0,0 +1,127 @@
+"""Bộ nhớ đệm LRU an toàn luồng cho kết quả phân tích biểu thức."""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+DEFAULT_MAXSIZE = 1024
+
+_SPACE_AROUND_SYMBOL = re.compile(r"\s*([-+*:^()])\s*")
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def normalize_expression(expression: str) -> str:
+    """Chuẩn hóa khoảng trắng để các cách viết tương đương dùng chung một khóa.
+
+    Khoảng trắng quanh toán tử và ngoặc bị bỏ; khoảng trắng giữa hai toán hạng
+    được giữ lại (thu về một dấu cách) vì `1 2` và `12` là hai biểu thức khác nhau.
+    """
+    compact = _SPACE_AROUND_SYMBOL.sub(r"\1", expression)
+    return _WHITESPACE_RUN.sub(" ", compact).strip()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Ảnh chụp số liệu của bộ nhớ đệm tại một thời điểm."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    enabled: bool
+
+    @property
+    def hit_rate(self) -> float:
+        """Tỉ lệ trúng đệm trên tổng số lần tra cứu (0 nếu chưa tra cứu)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ParseCache(Generic[V]):
+    """Bộ nhớ đệm có giới hạn, loại bỏ mục ít được dùng gần đây nhất (LRU).
+
+    Mọi thao tác trên bảng được bảo vệ bằng khóa; hàm dựng giá trị chạy ngoài
+    khóa nên hai luồng có thể cùng dựng một khóa, mục dựng trước được giữ lại.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, enabled: bool = True) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be non-negative.")
+        self._entries: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._enabled = enabled
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """True nếu bộ nhớ đệm đang bật và có sức chứa lớn hơn 0."""
+        return self._enabled and self._maxsize > 0
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], V]) -> V:
+        """Trả về giá trị đã lưu cho `key`, hoặc gọi `factory` rồi lưu lại."""
+        if not self.enabled:
+            return factory()
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            self._misses += 1
+        value = factory()
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            self._entries[key] = value
+            self._evict_locked()
+        return value
+
+    def _evict_locked(self) -> None:
+        """Loại các mục cũ nhất cho tới khi kích thước không vượt `maxsize`."""
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def configure(self, maxsize: Optional[int] = None, enabled: Optional[bool] = None) -> None:
+        """Đổi kích thước tối đa và/hoặc bật tắt bộ nhớ đệm."""
+        with self._lock:
+            if maxsize is not None:
+                if maxsize < 0:
+                    raise ValueError("maxsize must be non-negative.")
+                self._maxsize = maxsize
+                self._evict_locked()
+            if enabled is not None:
+                self._enabled = enabled
+
+    def clear(self) -> None:
+        """Xóa toàn bộ mục và đặt lại các bộ đếm."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Trả về số lần trúng/trượt/loại bỏ và kích thước hiện tại."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self._maxsize,
+                enabled=self._enabled,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,241 @@
+"""Dạng chuẩn của cây biểu thức: sắp xếp toán hạng của `+`/`*` để các công thức tương đương có cùng khóa."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .cache import normalize_expression
+from .compiler import EXACT_INTEGER_LIMIT
+from .expression_tree import OPERATORS, ExpressionTree, Node, build_expression_tree, is_identifier
+from .simplify import format_number
+
+_COMMUTATIVE = frozenset("+*")
+
+# Kind tags in the digest, so that a variable named "inf" never matches the number.
+_KIND_NUMBER = b"n"
+_KIND_NAME = b"v"
+_KIND_OPERATOR = b"o"
+
+
+class CanonicalNode:
+    """Nút của dạng chuẩn; băm và so sánh chỉ tốn O(1) nhờ mã băm cấu trúc tính một lần khi tạo.
+
+    - `value`: toán tử, tên biến, hoặc số viết lại theo giá trị (`007` thành `7`).
+    - `operands`: hai toán hạng với `-`, `:`, `^`; với `+`/`*` là các toán hạng
+      của cả chuỗi đã làm phẳng, sắp theo `digest`.
+    - `number`: giá trị của lá hằng số, None với nút khác.
+    - `digest`: băm 128 bit của cả cây con, giống nhau giữa các tiến trình và lần chạy.
+    """
+
+    __slots__ = ("value", "operands", "number", "digest", "_hash")
+
+    def __init__(self, value: str, operands: Tuple["CanonicalNode", ...], number: Optional[float], digest: bytes) -> None:
+        self.value = value
+        self.operands = operands
+        self.number = number
+        self.digest = digest
+        self._hash = hash(digest)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CanonicalNode):
+            return NotImplemented
+        return self.digest == other.digest
+
+    def __repr__(self) -> str:
+        return f"CanonicalNode({canonical_expression(self)!r})"
+
+    def is_leaf(self) -> bool:
+        """Kiểm tra nút có phải lá (số hoặc tên biến) hay không."""
+        return not self.operands
+
+
+class _Chain:
+    """Chuỗi `+`/`*` đang gom dở: toán hạng chưa sắp xếp, chỉ dựng `CanonicalNode` khi chuỗi kết thúc.
+
+    `total` là tổng/tích trị tuyệt đối khi mọi toán hạng là số nguyên (dùng cho
+    `exact=True`), None nếu không.
+    """
+
+    __slots__ = ("op", "operands", "total")
+
+    def __init__(self, op: str, operands: List[CanonicalNode], total: Optional[int]) -> None:
+        self.op = op
+        self.operands = operands
+        self.total = total
+
+
+Item = Union[CanonicalNode, _Chain]
+
+
+def _digest(node: CanonicalNode) -> bytes:
+    """Khóa sắp xếp toán hạng: không phụ thuộc thứ tự viết trong biểu thức gốc."""
+    return node.digest
+
+
+def _leaf(token: str) -> CanonicalNode:
+    """Lá dạng chuẩn của một token toán hạng."""
+    if is_identifier(token):
+        return CanonicalNode(token, (), None, hashlib.blake2b(_KIND_NAME + token.encode("utf-8"), digest_size=16).digest())
+    number = float(token)
+    digest = hashlib.blake2b(_KIND_NUMBER + repr(number).encode("ascii"), digest_size=16).digest()
+    return CanonicalNode(format_number(number) if math.isfinite(number) else token, (), number, digest)
+
+
+def _operator(op: str, operands: Tuple[CanonicalNode, ...]) -> CanonicalNode:
+    """Nút toán tử; mã băm lấy từ mã băm của các toán hạng nên tốn O(số toán hạng)."""
+    data = _KIND_OPERATOR + op.encode("ascii") + b"".join([operand.digest for operand in operands])
+    return CanonicalNode(op, operands, None, hashlib.blake2b(data, digest_size=16).digest())
+
+
+def _finish(item: Item) -> CanonicalNode:
+    """Kết thúc một chuỗi đang gom: sắp xếp toán hạng và dựng nút."""
+    if isinstance(item, CanonicalNode):
+        return item
+    item.operands.sort(key=_digest)
+    return _operator(item.op, tuple(item.operands))
+
+
+def _exact_total(op: str, item: Item) -> Optional[int]:
+    """Tổng/tích trị tuyệt đối của lá số nguyên hoặc chuỗi số nguyên, None nếu không áp dụng."""
+    if isinstance(item, _Chain):
+        return item.total if item.op == op else None
+    number = item.number
+    if number is None or not number.is_integer():
+        return None
+    return abs(int(number))
+
+
+def _combine(op: str, left: Item, right: Item, exact: bool) -> Item:
+    """Nút `+`/`*`: nối hai vế vào cùng một chuỗi nếu được phép, ngược lại dựng nút hai toán hạng đã sắp xếp."""
+    total: Optional[int] = None
+    if exact:
+        left_total = _exact_total(op, left)
+        right_total = _exact_total(op, right)
+        if left_total is None or right_total is None:
+            operands = sorted((_finish(left), _finish(right)), key=_digest)
+            return _operator(op, tuple(operands))
+        total = left_total + right_total if op == "+" else left_total * right_total
+        if total > EXACT_INTEGER_LIMIT:
+            # Regrouping could change rounding; only the two operands of this node are swapped.
+            operands = sorted((_finish(left), _finish(right)), key=_digest)
+            return _operator(op, tuple(operands))
+    sides = []
+    for side in (left, right):
+        if isinstance(side, _Chain) and side.op == op:
+            sides.append(side.operands)
+        else:
+            sides.append([_finish(side)])
+    # Both lists are owned by this node; growing the longer one keeps long chains linear.
+    longer, shorter = sorted(sides, key=len, reverse=True)
+    longer.extend(shorter)
+    return _Chain(op, longer, total)
+
+
+def canonical_form(tree: ExpressionTree, exact: bool = True) -> CanonicalNode:
+    """Dạng chuẩn của cây, dựng trong một lượt trên dãy hậu tự.
+
+    Toán hạng của `+` và `*` luôn được sắp xếp (đổi chỗ hai toán hạng không đổi
+    kết quả số thực). Chuỗi `+`/`*` lồng nhau được làm phẳng để `(a + b) + c` và
+    `a + (b + c)` trùng nhau:
+
+    - `exact=True`: chỉ khi chứng minh được kết quả giống hệt từng bit (mọi
+      toán hạng là số nguyên và tổng/tích không vượt 2^53), như `rebalance`.
+    - `exact=False`: mọi chuỗi; hai công thức cùng khóa có thể lệch nhau ở bit
+      cuối do làm tròn, hoặc một bên tràn số còn bên kia thì không.
+
+    `-`, `:` và `^` giữ nguyên thứ tự toán hạng.
+    """
+    leaves: Dict[str, CanonicalNode] = {}
+    stack: List[Item] = []
+    for token in tree.postorder():
+        if token not in OPERATORS:
+            leaf = leaves.get(token)
+            if leaf is None:
+                leaf = leaves[token] = _leaf(token)
+            stack.append(leaf)
+            continue
+        right = stack.pop()
+        left = stack.pop()
+        if token in _COMMUTATIVE:
+            stack.append(_combine(token, left, right, exact))
+        else:
+            stack.append(_operator(token, (_finish(left), _finish(right))))
+    return _finish(stack[0])
+
+
+def canonical_key(tree: ExpressionTree, exact: bool = True) -> str:
+    """Khóa dạng chuẩn (hex 32 ký tự) để gộp các công thức tương đương."""
+    return canonical_form(tree, exact).digest.hex()
+
+
+def canonical_expression(node: CanonicalNode) -> str:
+    """Biểu thức infix của dạng chuẩn; mọi toán hạng không phải lá được đặt trong ngoặc."""
+    parts: List[str] = []
+    stack: List[object] = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        if not item.operands:
+            parts.append(item.value)
+            continue
+        sequence: List[object] = []
+        for index, operand in enumerate(item.operands):
+            if index:
+                sequence.append(f" {item.value} ")
+            sequence.extend(("(", operand, ")") if operand.operands else (operand,))
+        stack.extend(reversed(sequence))
+    return "".join(parts)
+
+
+def canonical_tree(tree: ExpressionTree, exact: bool = True) -> ExpressionTree:
+    """Cây mới dựng từ dạng chuẩn; chuỗi đã làm phẳng được dựng lại lệch trái theo thứ tự đã sắp."""
+    root = canonical_form(tree, exact)
+    output: List[Node] = []
+    stack: List[Tuple[CanonicalNode, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not node.operands:
+            output.append(Node(node.value))
+        elif not expanded:
+            stack.append((node, True))
+            stack.extend((operand, False) for operand in reversed(node.operands))
+        else:
+            count = len(node.operands)
+            operands = output[-count:]
+            del output[-count:]
+            current = operands[0]
+            for operand in operands[1:]:
+                current = Node(node.value, left=current, right=operand)
+            output.append(current)
+    return ExpressionTree(root=output[0], expression=canonical_expression(root))
+
+
+def deduplicate(expressions: Iterable[str], exact: bool = True) -> Tuple[List[str], List[int]]:
+    """Gộp các biểu thức có cùng dạng chuẩn.
+
+    Trả về (biểu thức đại diện, vị trí đại diện của từng đầu vào): kết quả của
+    đầu vào thứ `i` là kết quả của `representatives[positions[i]]`. Biểu thức
+    không phân tích hoặc không chuẩn hóa được chỉ gộp với chính nó (sau chuẩn
+    hóa khoảng trắng), để lỗi vẫn được báo khi tính.
+    """
+    representatives: List[str] = []
+    positions: List[int] = []
+    groups: Dict[str, int] = {}
+    for expression in expressions:
+        try:
+            key = canonical_key(build_expression_tree(expression), exact)
+        except (ValueError, ArithmeticError):
+            key = "invalid:" + normalize_expression(expression)
+        position = groups.get(key)
+        if position is None:
+            position = groups[key] = len(representatives)
+            representatives.append(expression)
+        positions.append(position)
+    return representatives, positions
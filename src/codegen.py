@@ -0,0 +1,86 @@
+"""Sinh mã Python cho cây biểu thức: mỗi phép toán thành một câu lệnh gán, biên dịch một lần thành hàm."""
+
+from __future__ import annotations
+
+import keyword
+import math
+import unicodedata
+from typing import Any, Callable, Dict, List, Tuple
+
+from .compiler import OP_DIV, Program
+
+# Python spelling of each opcode; OP_DIV additionally gets an explicit zero check.
+_PY_OPERATORS = (None, "+", "-", "*", "/", "**")
+
+
+def _is_parameter_name(name: str) -> bool:
+    """True nếu tên biến dùng được nguyên văn làm tham số Python."""
+    return name.isidentifier() and not keyword.iskeyword(name) and unicodedata.normalize("NFKC", name) == name
+
+
+def _reserved_prefix(names: Tuple[str, ...]) -> str:
+    """Tiền tố cho tên nội bộ (thanh ghi, hằng) không trùng với tên biến nào."""
+    prefix = "_r"
+    while any(name.startswith(prefix) for name in names):
+        prefix = "_" + prefix
+    return prefix
+
+
+def _literal(constant: float, prefix: str) -> str:
+    """Mã Python của một hằng số, đặt trong ngoặc khi có dấu âm (`-1.0 ** x` là `-(1.0 ** x)`)."""
+    if math.isnan(constant):
+        return f"{prefix}nan"
+    text = repr(constant) if math.isfinite(constant) else f"{prefix}inf"
+    if math.copysign(1.0, constant) < 0:
+        return f"(-{text})" if math.isinf(constant) else f"({text})"
+    return text
+
+
+def generate_source(program: Program, name: str = "expression") -> Tuple[str, Dict[str, Any]]:
+    """Sinh mã nguồn hàm `name` cùng namespace toàn cục nó cần.
+
+    Hàm nhận các biến theo thứ tự `program.variables` (tham số vị trí, hoặc
+    theo tên nếu tên biến hợp lệ trong Python). Mỗi toán tử trở thành một câu
+    lệnh gán vào thanh ghi theo độ sâu ngăn xếp, theo đúng thứ tự hậu tự, nên
+    cây sâu không tạo biểu thức lồng nhau và lỗi xuất hiện theo cùng thứ tự
+    như `run_program`.
+    """
+    variables = program.variables
+    prefix = _reserved_prefix(variables)
+    parameters = {
+        variable: variable if _is_parameter_name(variable) else f"{prefix}a{index}"
+        for index, variable in enumerate(variables)
+    }
+    names = {position: parameters[variable] for position, variable in program.slots}
+    namespace: Dict[str, Any] = {f"{prefix}inf": math.inf, f"{prefix}nan": math.nan, f"{prefix}error": ZeroDivisionError}
+
+    lines = [f"def {name}({', '.join(parameters.values())}):"]
+    operands: List[str] = []
+    leaves = iter(enumerate(program.constants))
+    for opcode in program.code:
+        if not opcode:
+            position, constant = next(leaves)
+            if position in names:
+                operands.append(names[position])
+            else:
+                operands.append(_literal(constant, prefix))
+            continue
+        right = operands.pop()
+        left = operands.pop()
+        register = f"{prefix}{len(operands)}"
+        if opcode == OP_DIV:
+            lines.append(f"    if {right} == 0:")
+            lines.append(f"        raise {prefix}error('Division by zero encountered.')")
+        lines.append(f"    {register} = {left} {_PY_OPERATORS[opcode]} {right}")
+        operands.append(register)
+    lines.append(f"    return {operands[0]}")
+    return "\n".join(lines) + "\n", namespace
+
+
+def compile_callable(program: Program, name: str = "expression") -> Callable[..., float]:
+    """Biên dịch chương trình thành một hàm Python thuần (gọi `compile()` đúng một lần)."""
+    source, namespace = generate_source(program, name)
+    exec(compile(source, f"<expression {name}>", "exec"), namespace)
+    function = namespace[name]
+    function.__source__ = source
+    return function
@@ -0,0 +1,172 @@
+"""Biên dịch cây biểu thức thành chương trình bytecode phẳng và thực thi nó."""
+
+from __future__ import annotations
+
+import operator
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate, count
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+from .budget import BudgetGuard, EvaluationBudget
+from .evaluator import _coerce
+from .expression_tree import OPERATORS, is_identifier
+
+OP_CONST = 0
+OP_ADD = 1
+OP_SUB = 2
+OP_MUL = 3
+OP_DIV = 4
+OP_POW = 5
+
+OPCODES = {"+": OP_ADD, "-": OP_SUB, "*": OP_MUL, ":": OP_DIV, "^": OP_POW}
+
+# Integers up to 2^53 are exact in float64, so any grouping of them gives the same bits.
+EXACT_INTEGER_LIMIT = 2**53
+
+
+def _divide(left: float, right: float) -> float:
+    """Phép chia có kiểm tra số chia bằng 0 giống `_apply_operator`."""
+    if right == 0:
+        raise ZeroDivisionError("Division by zero encountered.")
+    return left / right
+
+
+# Indexed by opcode; slot 0 (OP_CONST) is never dispatched.
+_BINARY = (None, operator.add, operator.sub, operator.mul, _divide, operator.pow)
+# Maps each opcode byte to 1 for OP_CONST and 0 for operators.
+_CONST_MASK = bytes(int(opcode == OP_CONST) for opcode in range(256))
+
+
+def max_stack_depth(code: bytes | array) -> int:
+    """Độ sâu ngăn xếp lớn nhất khi chạy mảng opcode `code`."""
+    constants = accumulate(bytes(code).translate(_CONST_MASK))
+    # After instruction i the stack holds constants - operators = 2 * constants - (i + 1) values.
+    return max(map(operator.sub, map((2).__mul__, constants), count(1)), default=0)
+
+
+@dataclass(frozen=True)
+class Program:
+    """Chương trình đã biên dịch: mảng opcode hậu tự và bể hằng số đã parse sẵn.
+
+    Mỗi `OP_CONST` lấy hằng số kế tiếp trong `constants` theo đúng thứ tự xuất
+    hiện, nên không cần lưu chỉ số toán hạng trong mảng lệnh. Lá là biến giữ
+    chỗ trong `constants` và được ghi trong `slots` dạng (vị trí, tên biến).
+    """
+
+    code: array
+    constants: Tuple[float, ...]
+    max_stack: int
+    slots: Tuple[Tuple[int, str], ...] = ()
+
+    @classmethod
+    def from_code(cls, code: bytes | array, constants: Iterable[float]) -> "Program":
+        """Chương trình không có biến từ mảng opcode và giá trị lá sẵn có; `max_stack` được tính lại."""
+        return cls(code=array("B", code), constants=tuple(constants), max_stack=max_stack_depth(code))
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """Các tên biến mà chương trình cần, theo thứ tự xuất hiện đầu tiên."""
+        return tuple(dict.fromkeys(name for _, name in self.slots))
+
+    def bind(self, variables: Optional[Mapping[str, Any]] = None) -> List[Any]:
+        """Trả về danh sách giá trị lá sau khi thay biến bằng giá trị được cung cấp."""
+        leaves: List[Any] = list(self.constants)
+        for position, name in self.slots:
+            if variables is None or name not in variables:
+                raise ValueError(f"Missing value for variable '{name}'.")
+            leaves[position] = variables[name]
+        return leaves
+
+    def evaluate(
+        self,
+        variables: Optional[Mapping[str, float]] = None,
+        budget: Optional[EvaluationBudget] = None,
+    ) -> float:
+        """Thực thi chương trình và trả về kết quả (kiểm tra `budget` nếu có)."""
+        return run_program(self, variables, budget)
+
+
+def compile_postfix(tokens: Iterable[str]) -> Program:
+    """Biên dịch danh sách token postfix thành `Program`."""
+    code = array("B")
+    constants: List[float] = []
+    slots: List[Tuple[int, str]] = []
+    depth = 0
+    max_stack = 0
+    for token in tokens:
+        if token in OPERATORS:
+            if depth < 2:
+                raise ValueError("Invalid postfix expression.")
+            code.append(OPCODES[token])
+            depth -= 1
+            continue
+        if is_identifier(token):
+            slots.append((len(constants), token))
+            constants.append(float("nan"))
+        else:
+            constants.append(_coerce(token))
+        code.append(OP_CONST)
+        depth += 1
+        if depth > max_stack:
+            max_stack = depth
+    if depth != 1:
+        raise ValueError("Postfix expression reduced to multiple values.")
+    return Program(
+        code=code,
+        constants=tuple(constants),
+        max_stack=max_stack,
+        slots=tuple(slots),
+    )
+
+
+def run_program(
+    program: Program,
+    variables: Optional[Mapping[str, float]] = None,
+    budget: Optional[EvaluationBudget] = None,
+) -> float:
+    """Chạy chương trình bytecode, không thao tác chuỗi nào trong vòng lặp."""
+    if budget is not None and not budget.allows_unchecked(len(program.code), OP_POW in program.code):
+        return _run_budgeted(program, variables, budget)
+    stack: List[float] = []
+    push = stack.append
+    pop = stack.pop
+    binary = _BINARY
+    leaves = program.bind(variables) if program.slots else program.constants
+    next_constant = iter(leaves).__next__
+    for opcode in program.code:
+        if opcode:
+            right = pop()
+            stack[-1] = binary[opcode](stack[-1], right)
+        else:
+            push(next_constant())
+    return stack[0]
+
+
+def _run_budgeted(program: Program, variables: Optional[Mapping[str, float]], budget: EvaluationBudget) -> float:
+    """Như `run_program` nhưng kiểm tra số nút, độ sâu, độ lớn, lũy thừa và thời gian."""
+    guard = BudgetGuard(budget)
+    guard.check_nodes(len(program.code))
+    stack: List[float] = []
+    depths: List[int] = []
+    leaves = program.bind(variables) if program.slots else program.constants
+    next_constant = iter(leaves).__next__
+    for opcode in program.code:
+        guard.tick()
+        if opcode:
+            right = stack.pop()
+            depth = max(depths.pop(), depths[-1]) + 1
+            guard.check_depth(depth)
+            if opcode == OP_POW:
+                guard.check_power(stack[-1], right)
+            value = stack[-1] = _BINARY[opcode](stack[-1], right)
+            depths[-1] = depth
+        else:
+            value = next_constant()
+            stack.append(value)
+            depths.append(1)
+        guard.check_value(value)
+    return stack[0]
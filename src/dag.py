@@ -0,0 +1,110 @@
+"""Dựng đồ thị biểu thức (DAG) bằng hash-consing và tính mỗi biểu thức con đúng một lần."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+from .evaluator import _apply_operator, _coerce
+from .expression_tree import OPERATORS, Node, _is_operand, is_identifier
+
+# Children are interned before their parent, so their identity stands in for
+# their whole structure and a key costs O(1) to build and compare.
+InternTable = Dict[Tuple[str, Optional[int], Optional[int]], Node]
+
+
+def build_dag_from_postfix(tokens: Iterable[str], table: Optional[InternTable] = None) -> Node:
+    """Dựng DAG từ token postfix, gộp các cây con giống hệt nhau thành một nút dùng chung.
+
+    Truyền cùng một `table` cho nhiều lần gọi để chia sẻ nút giữa các biểu thức.
+    """
+    if table is None:
+        table = {}
+    stack: List[Node] = []
+    for token in tokens:
+        if _is_operand(token):
+            key = (token, None, None)
+            node = table.get(key)
+            if node is None:
+                node = table[key] = Node(token)
+            stack.append(node)
+            continue
+        if token not in OPERATORS:
+            raise ValueError(f"Encountered invalid token '{token}'.")
+        if len(stack) < 2:
+            raise ValueError("Invalid postfix expression.")
+        right = stack.pop()
+        left = stack.pop()
+        key = (token, id(left), id(right))
+        node = table.get(key)
+        if node is None:
+            node = table[key] = Node(token, left=left, right=right)
+        stack.append(node)
+
+    if len(stack) != 1:
+        raise ValueError("Postfix expression did not reduce to a single tree.")
+    return stack[0]
+
+
+def _unique_post_order(root: Node) -> List[Node]:
+    """Trả về các nút phân biệt (theo định danh) theo thứ tự hậu tự, con trước cha."""
+    order: List[Node] = []
+    seen = set()
+    stack: List[Tuple[Node, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in seen:
+            continue
+        if expanded or node.is_leaf():
+            seen.add(id(node))
+            order.append(node)
+            continue
+        stack.append((node, True))
+        if node.right is not None:
+            stack.append((node.right, False))
+        if node.left is not None:
+            stack.append((node.left, False))
+    return order
+
+
+@dataclass(frozen=True)
+class DagStats:
+    """Số nút khi trải thành cây so với số nút thực sự lưu trong DAG."""
+
+    tree_nodes: int
+    unique_nodes: int
+
+    @property
+    def reduction(self) -> float:
+        """Tỉ lệ số nút được loại bỏ nhờ dùng chung (0 nếu không có nút trùng)."""
+        return 1 - self.unique_nodes / self.tree_nodes if self.tree_nodes else 0.0
+
+
+def dag_stats(root: Node) -> DagStats:
+    """Đếm số nút của cây tương đương và số nút phân biệt trong DAG."""
+    sizes: Dict[int, int] = {}
+    for node in _unique_post_order(root):
+        size = 1
+        if node.left is not None:
+            size += sizes[id(node.left)]
+        if node.right is not None:
+            size += sizes[id(node.right)]
+        sizes[id(node)] = size
+    return DagStats(tree_nodes=sizes[id(root)], unique_nodes=len(sizes))
+
+
+def evaluate_dag(root: Node, variables: Optional[Mapping[Hashable, float]] = None) -> float:
+    """Tính giá trị DAG (hoặc cây thường), mỗi nút phân biệt chỉ được tính một lần."""
+    values: Dict[int, float] = {}
+    for node in _unique_post_order(root):
+        if node.is_leaf():
+            token = node.value
+            if is_identifier(token):
+                if variables is None or token not in variables:
+                    raise ValueError(f"Missing value for variable '{token}'.")
+                values[id(node)] = variables[token]
+            else:
+                values[id(node)] = _coerce(token)
+            continue
+        values[id(node)] = _apply_operator(node.value, values[id(node.left)], values[id(node.right)])
+    return values[id(root)]
@@ -0,0 +1,263 @@
+"""Bộ nhớ đệm bền vững trên đĩa (SQLite) cho cây đã phân tích, chương trình biên dịch và giá trị đã tính.
+
+Mỗi mục được khóa bằng băm của biểu thức đã chuẩn hóa cùng phiên bản định
+dạng bản ghi, lưu bản ghi nhị phân của `src.serialization` (cây dạng mảng kèm
+chương trình đã biên dịch) và kết quả tính gần nhất. Nhiều tiến trình có thể
+dùng chung một file: SQLite ở chế độ WAL cho phép đọc song song, còn ghi được
+tuần tự hóa bằng khóa của SQLite (chờ tối đa `BUSY_TIMEOUT` giây).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Tuple
+
+from .cache import normalize_expression
+from .expression_tree import ExpressionTree
+from .serialization import FORMAT_VERSION, dumps, loads
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+BUSY_TIMEOUT = 30.0
+SCHEMA_VERSION = 1
+
+# Recency updates and size checks are batched to keep lookups read-only.
+_FLUSH_INTERVAL = 256
+# Eviction frees space down to this share of `max_bytes`, so it does not run on every write.
+_LOW_WATERMARK = 0.9
+# Rough per-row overhead (key, columns, b-tree cell) counted towards `max_bytes`.
+_ROW_OVERHEAD = 48
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key BLOB PRIMARY KEY,
+    record BLOB NOT NULL,
+    value REAL,
+    error TEXT,
+    size INTEGER NOT NULL,
+    used INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+
+
+def cache_key(expression: str) -> bytes:
+    """Khóa của biểu thức: băm của dạng chuẩn hóa và phiên bản định dạng bản ghi."""
+    text = f"{FORMAT_VERSION}\0{normalize_expression(expression)}"
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass(frozen=True)
+class CachedExpression:
+    """Một mục đọc từ đĩa: cây (kèm chương trình) và kết quả tính gần nhất nếu có."""
+
+    tree: ExpressionTree
+    value: Optional[float]
+    error: Optional[str]
+
+    @property
+    def evaluated(self) -> bool:
+        """True nếu mục đã lưu giá trị hoặc lỗi chia cho 0 của lần tính trước."""
+        return self.value is not None or self.error is not None
+
+
+@dataclass(frozen=True)
+class DiskCacheStats:
+    """Số liệu của tiến trình hiện tại cùng kích thước file tại thời điểm chụp."""
+
+    hits: int
+    misses: int
+    writes: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Tỉ lệ trúng đệm trên tổng số lần tra cứu (0 nếu chưa tra cứu)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DiskCache:
+    """Bộ nhớ đệm SQLite có giới hạn dung lượng, loại mục ít được dùng gần đây nhất.
+
+    Mỗi tiến trình mở kết nối riêng (tự mở lại sau `fork`), nên cùng một đối
+    tượng có thể được truyền cho worker của `multiprocessing`; khi pickle chỉ
+    đường dẫn và giới hạn được gửi đi. Một đối tượng không dùng chung giữa các luồng.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1.")
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = os.getpid()
+        self._touched: Dict[bytes, int] = {}
+        self._pending_writes = 0
+        self._hits = self._misses = self._writes = self._evictions = 0
+
+    def __reduce__(self) -> Tuple[object, Tuple[str, int]]:
+        return shared_cache, (self.path, self.max_bytes)
+
+    def __enter__(self) -> "DiskCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Kết nối của tiến trình hiện tại, mở (và tạo bảng) khi cần."""
+        if self._pid != os.getpid():
+            # Inherited through fork: the parent's connection must not be used here.
+            self._db = None
+            self._pid = os.getpid()
+            self._touched.clear()
+            self._pending_writes = 0
+            self.reset()
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                db.execute("BEGIN IMMEDIATE")
+                if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    db.execute("DROP TABLE IF EXISTS entries")
+                    db.execute(_SCHEMA)
+                    db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+                db.execute("COMMIT")
+            self._db = db
+        return self._db
+
+    def get(self, expression: str) -> Optional[CachedExpression]:
+        """Đọc mục của `expression`; None nếu chưa có."""
+        key = cache_key(expression)
+        row = self._connection().execute(
+            "SELECT record, value, error FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._touched[key] = time.time_ns()
+        if len(self._touched) >= _FLUSH_INTERVAL:
+            self.flush()
+        record, value, error = row
+        return CachedExpression(loads(record), value, error)
+
+    def put(
+        self,
+        expression: str,
+        tree: ExpressionTree,
+        value: Optional[float] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Ghi (hoặc thay) mục của `expression` bằng bản ghi của `tree` và kết quả tính nếu có."""
+        record = dumps(tree)
+        self._connection().execute(
+            "INSERT OR REPLACE INTO entries (key, record, value, error, size, used) VALUES (?, ?, ?, ?, ?, ?)",
+            (cache_key(expression), record, value, error, len(record) + _ROW_OVERHEAD, time.time_ns()),
+        )
+        self._writes += 1
+        self._pending_writes += 1
+        if self._pending_writes >= _FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Ghi thời điểm dùng gần nhất của các mục vừa trúng và loại mục cũ nếu vượt giới hạn."""
+        db = self._connection()
+        touched = list(self._touched.items())
+        self._touched.clear()
+        self._pending_writes = 0
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany("UPDATE entries SET used = ? WHERE key = ?", [(used, key) for key, used in touched])
+            self._evictions += self._evict(db)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _evict(self, db: sqlite3.Connection) -> int:
+        """Xóa các mục cũ nhất cho tới khi tổng dung lượng không vượt ngưỡng dưới; trả về số mục đã xóa."""
+        total = db.execute("SELECT total(size) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        excess = total - int(self.max_bytes * _LOW_WATERMARK)
+        # Oldest rows first; a row goes while the space freed before it is still short of `excess`.
+        return db.execute(
+            """
+            DELETE FROM entries WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, size, SUM(size) OVER (ORDER BY used, key) AS running FROM entries
+                ) WHERE running - size < ?
+            )
+            """,
+            (excess,),
+        ).rowcount
+
+    def stats(self) -> DiskCacheStats:
+        """Bộ đếm của tiến trình hiện tại (kể cả số liệu đã gộp từ worker) và kích thước file."""
+        entries, size = self._connection().execute("SELECT count(*), total(size) FROM entries").fetchone()
+        return DiskCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            writes=self._writes,
+            evictions=self._evictions,
+            entries=entries,
+            size_bytes=int(size),
+            max_bytes=self.max_bytes,
+        )
+
+    def export(self) -> Tuple[int, int, int, int]:
+        """Bộ đếm (trúng, trượt, ghi, loại bỏ) để gửi từ tiến trình con về tiến trình chính."""
+        return self._hits, self._misses, self._writes, self._evictions
+
+    def merge(self, counters: Tuple[int, int, int, int]) -> None:
+        """Cộng bộ đếm nhận từ `export()` của tiến trình khác."""
+        hits, misses, writes, evictions = counters
+        self._hits += hits
+        self._misses += misses
+        self._writes += writes
+        self._evictions += evictions
+
+    def reset(self) -> None:
+        """Đặt lại các bộ đếm; dữ liệu trên đĩa không đổi."""
+        self._hits = self._misses = self._writes = self._evictions = 0
+
+    def clear(self) -> None:
+        """Xóa mọi mục trong file và đặt lại các bộ đếm."""
+        self._touched.clear()
+        self._connection().execute("DELETE FROM entries")
+        self.reset()
+
+    def close(self) -> None:
+        """Ghi nốt thông tin đang chờ và đóng kết nối (mở lại tự động nếu dùng tiếp)."""
+        if self._db is None or self._pid != os.getpid():
+            return
+        self.flush()
+        self._db.close()
+        self._db = None
+
+
+_SHARED: Dict[Tuple[str, int], DiskCache] = {}
+
+
+def shared_cache(path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> DiskCache:
+    """`DiskCache` dùng chung trong tiến trình cho cặp (đường dẫn, giới hạn); worker nhận lại đúng đối tượng này."""
+    key = (os.path.abspath(path), max_bytes)
+    cache = _SHARED.get(key)
+    if cache is None:
+        cache = _SHARED[key] = DiskCache(path, max_bytes)
+    return cache
+
+
+def cache_stats_summary(cache: DiskCache) -> Dict[str, object]:
+    """Số liệu của bộ nhớ đệm dạng dict để xuất JSON (`--cache-stats`)."""
+    stats = cache.stats()
+    return {"path": cache.path, **asdict(stats), "hit_rate": stats.hit_rate}
+
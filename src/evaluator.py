@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Iterable, List
+from typing import Any, Iterable, List, Optional
 
-from .expression_tree import OPERATORS
+from .budget import BudgetGuard, EvaluationBudget
+from .expression_tree import _INVALID_CHAR, OPERATORS, PRECEDENCE, RIGHT_ASSOCIATIVE, TOKEN_PATTERN, is_identifier
+from .instrumentation import instrumented
 
 
 def _apply_operator(op: str, left: float, right: float) -> float:
@@ -25,15 +27,29 @@ def _apply_operator(op: str, left: float, right: float) -> float:
 
 
 def _coerce(token: str) -> float:
-    """Chuyển token chuỗi thành số thực, báo lỗi nếu không hợp lệ."""
+    """Chuyển token chuỗi thành số thực, báo lỗi nếu không hợp lệ.
+
+    Tên biến như `inf`, `nan` bị từ chối dù `float()` chấp nhận, để mọi evaluator
+    (kể cả bản biên dịch, coi chúng là biến) xử lý giống nhau.
+    """
     try:
-        return float(token)
+        value = float(token)
     except ValueError as exc:
         raise ValueError(f"Token '{token}' is not a valid number.") from exc
+    if value - value and is_identifier(token):  # only inf/nan reach the identifier check
+        raise ValueError(f"Token '{token}' is not a valid number.")
+    return value
+
 
+def evaluate_prefix(tokens: Iterable[str], budget: Optional[EvaluationBudget] = None) -> float:
+    """Nhận danh sách token prefix và trả về kết quả tính toán.
 
-def evaluate_prefix(tokens: Iterable[str]) -> float:
-    """Nhận danh sách token prefix và trả về kết quả tính toán."""
+    Với `budget`, biểu thức vượt giới hạn sẽ ném `BudgetExceededError`.
+    """
+    if budget is not None:
+        tokens = list(tokens)
+        if not budget.allows_unchecked(len(tokens), "^" in tokens):
+            return _evaluate_budgeted(tokens, budget, prefix=True)
     stack: List[float] = []
     for token in reversed(list(tokens)):
         if token in OPERATORS:
@@ -49,8 +65,15 @@ def evaluate_prefix(tokens: Iterable[str]) -> float:
     return stack[0]
 
 
-def evaluate_postfix(tokens: Iterable[str]) -> float:
-    """Nhận danh sách token postfix và trả về kết quả tính toán."""
+def evaluate_postfix(tokens: Iterable[str], budget: Optional[EvaluationBudget] = None) -> float:
+    """Nhận danh sách token postfix và trả về kết quả tính toán.
+
+    Với `budget`, biểu thức vượt giới hạn sẽ ném `BudgetExceededError`.
+    """
+    if budget is not None:
+        tokens = list(tokens)
+        if not budget.allows_unchecked(len(tokens), "^" in tokens):
+            return _evaluate_budgeted(tokens, budget, prefix=False)
     stack: List[float] = []
     for token in tokens:
         if token in OPERATORS:
@@ -66,6 +89,114 @@ def evaluate_postfix(tokens: Iterable[str]) -> float:
     return stack[0]
 
 
+def _evaluate_budgeted(tokens: List[str], budget: EvaluationBudget, prefix: bool) -> float:
+    """Vòng lặp ngăn xếp như `evaluate_prefix`/`evaluate_postfix`, kiểm tra ngân sách ở từng bước."""
+    kind = "prefix" if prefix else "postfix"
+    guard = BudgetGuard(budget)
+    guard.check_nodes(len(tokens))
+    stack: List[float] = []
+    depths: List[int] = []
+    for token in reversed(tokens) if prefix else tokens:
+        guard.tick()
+        if token in OPERATORS:
+            if len(stack) < 2:
+                raise ValueError(f"Invalid {kind} expression.")
+            if prefix:
+                left, right = stack.pop(), stack.pop()
+            else:
+                right, left = stack.pop(), stack.pop()
+            depth = max(depths.pop(), depths.pop()) + 1
+            guard.check_depth(depth)
+            if token == "^":
+                guard.check_power(left, right)
+            value = _apply_operator(token, left, right)
+        else:
+            value = _coerce(token)
+            depth = 1
+        guard.check_value(value)
+        stack.append(value)
+        depths.append(depth)
+    if len(stack) != 1:
+        raise ValueError(f"{kind.capitalize()} expression reduced to multiple values.")
+    return stack[0]
+
+
+@instrumented("evaluate_infix")
+def evaluate_infix(expression: str) -> float:
+    """Tính trực tiếp biểu thức infix trong một lượt bằng hai ngăn xếp (toán tử và giá trị), không dựng cây.
+
+    Thứ tự ưu tiên, kết hợp phải và các lỗi giống hệt đường
+    `tokenize` → `infix_to_postfix` → `build_tree_from_postfix` → `evaluate_postfix`:
+    lỗi cú pháp luôn được báo trước, rồi mới tới lỗi tính toán đầu tiên theo thứ tự hậu tự.
+    """
+    invalid = _INVALID_CHAR.search(expression)
+    if invalid:
+        raise ValueError(f"Unsupported character '{invalid.group()}' in expression: {expression}")
+    values: List[Any] = []
+    operators: List[str] = []
+    # Errors the tree pipeline would only hit after parsing the whole expression.
+    malformed = False
+    failure: Optional[BaseException] = None
+
+    def emit(op: str) -> None:
+        # Same step as appending `op` to the postfix output and evaluating it.
+        nonlocal malformed, failure
+        if malformed:
+            return
+        if len(values) < 2:
+            malformed = True
+            return
+        right = values.pop()
+        left = values.pop()
+        if failure is None:
+            try:
+                values.append(_apply_operator(op, left, right))
+                return
+            except (ValueError, ArithmeticError) as exc:
+                failure = exc
+        values.append(None)
+
+    for token in TOKEN_PATTERN.findall(expression):
+        if token == "(":
+            operators.append(token)
+        elif token == ")":
+            while operators and operators[-1] != "(":
+                emit(operators.pop())
+            if not operators:
+                raise ValueError("Mismatched parentheses in expression.")
+            operators.pop()
+        elif token in OPERATORS:
+            precedence = PRECEDENCE[token]
+            while operators and operators[-1] != "(":
+                top_precedence = PRECEDENCE[operators[-1]]
+                if top_precedence > precedence or (top_precedence == precedence and token not in RIGHT_ASSOCIATIVE):
+                    emit(operators.pop())
+                else:
+                    break
+            operators.append(token)
+        elif failure is None:
+            try:
+                values.append(_coerce(token))
+            except ValueError as exc:
+                failure = exc
+                values.append(None)
+        else:
+            values.append(None)
+
+    while operators:
+        top = operators.pop()
+        if top == "(":
+            raise ValueError("Mismatched parentheses in expression.")
+        emit(top)
+    if malformed:
+        raise ValueError("Invalid postfix expression.")
+    if len(values) != 1:
+        raise ValueError("Postfix expression did not reduce to a single tree.")
+    if failure is not None:
+        raise failure
+    return values[0]
+
+
 def evaluate_prefix_expression(expression: str) -> float:
     """Tính giá trị chuỗi prefix (token phân tách bởi khoảng trắng)."""
     tokens = [token for token in expression.split() if token]
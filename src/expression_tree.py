@@ -2,8 +2,21 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple, Union
+
+from .cache import CacheStats, ParseCache, normalize_expression
+from .instrumentation import count_first_argument, count_lines, count_result, instrumented
+
+if TYPE_CHECKING:
+    from .compiler import Program
+    from .flat_tree import FlatTree
+    from .incremental import IncrementalState, LeafRef
+    from .rebalance import RebalanceResult
+    from .simplify import SimplifyResult
+    from .vectorized import ColumnResult
 
 
 OPERATORS = {"+", "-", "*", ":", "^"}
@@ -11,9 +24,12 @@ RIGHT_ASSOCIATIVE = {"^"}
 PRECEDENCE = {"+": 1, "-": 1, "*": 2, ":": 2, "^": 3}
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
-    """Đại diện cho một nút trong cây biểu thức (toán hạng hoặc toán tử)."""
+    """Đại diện cho một nút trong cây biểu thức (toán hạng hoặc toán tử).
+
+    Dùng `__slots__` nên mỗi nút không mang theo `__dict__` riêng.
+    """
 
     value: str
     left: Optional["Node"] = None
@@ -24,36 +40,29 @@ class Node:
         return self.left is None and self.right is None
 
 
-def _emit_number(buffer: List[str], tokens: List[str]) -> None:
-    """Đẩy chuỗi chữ số đang gom vào danh sách token rồi xóa bộ đệm."""
-    if buffer:
-        tokens.append("".join(buffer))
-        buffer.clear()
+# Numbers are digit runs; names start with a letter or "_" and continue with
+# letters, digits or "_" (so "2x" splits into "2", "x"). The C-level scanner
+# replaces the old per-character isdigit()/isspace() loop.
+TOKEN_PATTERN = re.compile(r"[-+*:^()]|\d+|[^\W\d]\w*")
+_INVALID_CHAR = re.compile(r"[^\w\s+\-*:^()]")
 
 
+@instrumented("tokenize", count_result)
 def tokenize(expression: str) -> List[str]:
-    """Tách biểu thức infix thành danh sách token (số, toán tử, ngoặc)."""
-    tokens: List[str] = []
-    number_buffer: List[str] = []
-    for char in expression:
-        if char.isdigit():
-            number_buffer.append(char)
-            continue
-        if char.isspace():
-            _emit_number(number_buffer, tokens)
-            continue
-        if char in OPERATORS or char in {"(", ")"}:
-            _emit_number(number_buffer, tokens)
-            tokens.append(char)
-            continue
-        raise ValueError(f"Unsupported character '{char}' in expression: {expression}")
+    """Tách biểu thức infix thành danh sách token (số, tên biến, toán tử, ngoặc)."""
+    invalid = _INVALID_CHAR.search(expression)
+    if invalid:
+        raise ValueError(f"Unsupported character '{invalid.group()}' in expression: {expression}")
+    return TOKEN_PATTERN.findall(expression)
+
 
-    _emit_number(number_buffer, tokens)
-    return tokens
+def is_identifier(token: str) -> bool:
+    """Trả về True nếu token là tên biến (bắt đầu bằng chữ cái hoặc `_`)."""
+    return bool(token) and (token[0].isalpha() or token[0] == "_")
 
 
 def _is_operand(token: str) -> bool:
-    """Trả về True nếu token là toán hạng (số) hợp lệ."""
+    """Trả về True nếu token là toán hạng (số hoặc tên biến) hợp lệ."""
     if not token:
         return False
     if token in OPERATORS or token in {"(", ")"}:
@@ -61,6 +70,7 @@ def _is_operand(token: str) -> bool:
     return True
 
 
+@instrumented("infix_to_postfix", count_result)
 def infix_to_postfix(tokens: Iterable[str]) -> List[str]:
     """Chuyển biểu thức infix (đã tách token) sang postfix bằng giải thuật shunting-yard."""
     output: List[str] = []
@@ -107,6 +117,7 @@ def infix_to_postfix(tokens: Iterable[str]) -> List[str]:
     return output
 
 
+@instrumented("build_tree_from_postfix", count_first_argument)
 def build_tree_from_postfix(tokens: Iterable[str]) -> Node:
     """Dựng cây biểu thức từ chuỗi token postfix."""
     stack: List[Node] = []
@@ -127,90 +138,469 @@ def build_tree_from_postfix(tokens: Iterable[str]) -> Node:
     return stack[0]
 
 
-def build_expression_tree(expression: str) -> "ExpressionTree":
-    """Hàm tiện ích: nhận biểu thức infix và trả về `ExpressionTree` tương ứng."""
-    return ExpressionTree.from_infix(expression)
+# Parsed trees keyed on the whitespace-normalized expression; see `src.cache`.
+PARSE_CACHE: "ParseCache[ExpressionTree]" = ParseCache()
+
+
+def build_expression_tree(expression: str, use_cache: bool = True) -> "ExpressionTree":
+    """Hàm tiện ích: nhận biểu thức infix và trả về `ExpressionTree` tương ứng.
+
+    Mặc định kết quả phân tích được lấy từ `PARSE_CACHE`; cây trả về khi đó dùng
+    chung các `Node` với cache (`is_shared`) cho tới lần đầu truy cập `root`.
+    """
+    if not use_cache or not PARSE_CACHE.enabled:
+        return ExpressionTree.from_infix(expression)
+    template = PARSE_CACHE.get_or_create(
+        normalize_expression(expression),
+        lambda: ExpressionTree.from_infix(expression),
+    )
+    return template._share(expression)
+
+
+def configure_parse_cache(maxsize: Optional[int] = None, enabled: Optional[bool] = None) -> None:
+    """Đổi kích thước hoặc bật/tắt bộ nhớ đệm phân tích dùng bởi `build_expression_tree`."""
+    PARSE_CACHE.configure(maxsize=maxsize, enabled=enabled)
+
+
+def parse_cache_stats() -> CacheStats:
+    """Trả về số liệu trúng/trượt/loại bỏ của bộ nhớ đệm phân tích."""
+    return PARSE_CACHE.stats()
 
 
 def _pre_order(node: Optional[Node], acc: List[str]) -> None:
-    """Duyệt tiền tự (NLR) và ghi kết quả vào `acc`."""
-    if not node:
-        return
-    acc.append(node.value)
-    _pre_order(node.left, acc)
-    _pre_order(node.right, acc)
+    """Duyệt tiền tự (NLR) bằng ngăn xếp tường minh và ghi kết quả vào `acc`.
+
+    Đi dọc nhánh trái và chỉ đẩy con phải vào ngăn xếp, nên mỗi nút chỉ tốn vài
+    thao tác thay vì một lời gọi hàm.
+    """
+    append = acc.append
+    stack: List[Node] = []
+    push = stack.append
+    pop = stack.pop
+    current = node
+    while True:
+        while current is not None:
+            append(current.value)
+            right = current.right
+            if right is not None:
+                push(right)
+            current = current.left
+        if not stack:
+            return
+        current = pop()
 
 
 def _in_order(node: Optional[Node], acc: List[str]) -> None:
-    """Duyệt trung tự (LNR) và ghi kết quả vào `acc`."""
-    if not node:
-        return
-    _in_order(node.left, acc)
-    acc.append(node.value)
-    _in_order(node.right, acc)
+    """Duyệt trung tự (LNR) bằng ngăn xếp tường minh và ghi kết quả vào `acc`."""
+    append = acc.append
+    stack: List[Node] = []
+    push = stack.append
+    pop = stack.pop
+    current = node
+    while True:
+        while current is not None:
+            push(current)
+            current = current.left
+        if not stack:
+            return
+        current = pop()
+        append(current.value)
+        current = current.right
 
 
 def _post_order(node: Optional[Node], acc: List[str]) -> None:
-    """Duyệt hậu tự (LRN) và ghi kết quả vào `acc`."""
-    if not node:
+    """Duyệt hậu tự (LRN) và ghi kết quả vào `acc`.
+
+    Duyệt theo thứ tự N-R-L giống `_pre_order` (đối xứng) rồi đảo ngược phần vừa
+    ghi, nhanh hơn so với theo dõi nút đã thăm như `_iter_post_order`.
+    """
+    start = len(acc)
+    append = acc.append
+    stack: List[Node] = []
+    push = stack.append
+    pop = stack.pop
+    current = node
+    while True:
+        while current is not None:
+            append(current.value)
+            left = current.left
+            if left is not None:
+                push(left)
+            current = current.right
+        if not stack:
+            break
+        current = pop()
+    if start:
+        acc[start:] = acc[:start - 1:-1]
+    else:
+        acc.reverse()
+
+
+def _iter_pre_order(node: Optional[Node]) -> Iterator[str]:
+    """Sinh lần lượt giá trị các nút theo thứ tự tiền tự (NLR)."""
+    if node is None:
         return
-    _post_order(node.left, acc)
-    _post_order(node.right, acc)
-    acc.append(node.value)
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current.value
+        if current.right is not None:
+            stack.append(current.right)
+        if current.left is not None:
+            stack.append(current.left)
 
 
-def _render_ascii(node: Optional[Node], prefix: str, is_tail: bool, acc: List[str]) -> None:
-    """Đệ quy dựng từng dòng ASCII thể hiện quan hệ cha-con."""
-    if not node:
+def _iter_in_order(node: Optional[Node]) -> Iterator[str]:
+    """Sinh lần lượt giá trị các nút theo thứ tự trung tự (LNR)."""
+    stack: List[Node] = []
+    current = node
+    while current is not None or stack:
+        while current is not None:
+            stack.append(current)
+            current = current.left
+        current = stack.pop()
+        yield current.value
+        current = current.right
+
+
+def _iter_post_order(node: Optional[Node]) -> Iterator[str]:
+    """Sinh lần lượt giá trị các nút theo thứ tự hậu tự (LRN), chỉ giữ ngăn xếp theo độ sâu."""
+    # Each entry carries a "right child done" flag; comparing against the last
+    # visited node breaks on DAGs where left and right are the same object.
+    stack: List[Tuple[Node, bool]] = []
+    current = node
+    while current is not None or stack:
+        if current is not None:
+            stack.append((current, False))
+            current = current.left
+            continue
+        peek, right_done = stack[-1]
+        if peek.right is not None and not right_done:
+            stack[-1] = (peek, True)
+            current = peek.right
+        else:
+            yield peek.value
+            stack.pop()
+
+
+# Display label of a node.
+_node_label = attrgetter("value")
+
+
+def _node_children(node: Node) -> Tuple[Node, ...]:
+    """Các con khác None của một nút, theo thứ tự trái rồi phải."""
+    left, right = node.left, node.right
+    if left is None:
+        return () if right is None else (right,)
+    return (left,) if right is None else (left, right)
+
+
+def _iter_ascii(
+    root: Any,
+    label: Callable[[Any], str],
+    children: Callable[[Any], Sequence[Any]],
+    max_depth: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+) -> Iterator[str]:
+    """Sinh từng dòng ASCII thể hiện quan hệ cha-con mà không giữ toàn bộ kết quả.
+
+    Nút ở tầng `max_depth` (gốc là tầng 1) có con thì các con được thay bằng một
+    dòng `...`; sau `max_nodes` nút, một dòng ghi chú kết thúc phần hiển thị.
+    """
+    if root is None:
         return
-    connector = "└── " if is_tail else "├── "
-    acc.append(f"{prefix}{connector}{node.value}")
-    children = []
-    if node.left:
-        children.append(node.left)
-    if node.right:
-        children.append(node.right)
-    for index, child in enumerate(children):
-        extension = "    " if is_tail else "│   "
-        _render_ascii(child, prefix + extension, index == len(children) - 1, acc)
+    stack = [(root, "", True, 1)]
+    shown = 0
+    while stack:
+        current, prefix, is_tail, level = stack.pop()
+        if max_nodes is not None and shown >= max_nodes:
+            yield f"... (truncated after {shown} nodes)"
+            return
+        yield f"{prefix}{'└── ' if is_tail else '├── '}{label(current)}"
+        shown += 1
+        kids = children(current)
+        if not kids:
+            continue
+        child_prefix = prefix + ("    " if is_tail else "│   ")
+        if max_depth is not None and level >= max_depth:
+            yield f"{child_prefix}└── ..."
+            continue
+        for index in range(len(kids) - 1, -1, -1):
+            stack.append((kids[index], child_prefix, index == len(kids) - 1, level + 1))
 
 
 class ExpressionTree:
     """Bao bọc cây biểu thức và cung cấp các thao tác xây dựng + duyệt."""
 
-    def __init__(self, root: Node, expression: str) -> None:
-        self.root = root
+    def __init__(self, root: Optional[Node], expression: str, flat: Optional["FlatTree"] = None) -> None:
+        # Exactly one storage is active: array-backed `_flat` or the `_root` Node graph.
+        self._flat = flat
+        self._root = root if flat is None else None
         self.expression = expression
+        self._program: Optional["Program"] = None
+        self._callable: Optional[Callable[..., float]] = None
+        # Cached tree this one shares its nodes with (None when the nodes are private).
+        self._template: Optional["ExpressionTree"] = None
+        # Per-node values for `value()`/`set_leaf()`, built on first use.
+        self._incremental: Optional["IncrementalState"] = None
+
+    @property
+    def root(self) -> Optional[Node]:
+        """Nút gốc, được phép sửa trực tiếp.
+
+        Cây dùng chung nút với cache được sao chép riêng ở lần truy cập đầu; cây
+        dạng mảng được chuyển sang lưu bằng `Node`.
+        """
+        if self._template is not None:
+            # Copy-on-write: the caller may modify nodes that later cache hits would see.
+            self.root = build_tree_from_postfix(self.postorder())
+        return self.root_view
+
+    @root.setter
+    def root(self, value: Optional[Node]) -> None:
+        self._root = value
+        self._flat = None
+        self._program = None
+        self._callable = None
+        self._template = None
+        self._incremental = None
+
+    @property
+    def root_view(self) -> Optional[Node]:
+        """Nút gốc chỉ để đọc: không sao chép nút dùng chung với cache, nên không được sửa."""
+        if self._flat is not None:
+            self._root = self._flat.to_node()
+            self._flat = None
+        return self._root
+
+    @property
+    def flat(self) -> Optional["FlatTree"]:
+        """Bản lưu dạng mảng nếu cây đang dùng nó, ngược lại None."""
+        return self._flat
+
+    def _share(self, expression: str) -> "ExpressionTree":
+        """Tạo cây mới dùng chung `Node` (và chương trình biên dịch) với cây này."""
+        tree = ExpressionTree(root=self._root, expression=expression, flat=self._flat)
+        tree._program = self._program
+        tree._callable = self._callable
+        tree._template = self
+        return tree
+
+    @property
+    def is_shared(self) -> bool:
+        """True nếu các `Node` còn dùng chung với bộ nhớ đệm (chưa truy cập `root` hay `set_leaf`)."""
+        return self._template is not None
+
+    def copy(self) -> "ExpressionTree":
+        """Trả về bản sao sâu với các `Node` riêng, có thể sửa mà không ảnh hưởng cache."""
+        return ExpressionTree(root=build_tree_from_postfix(self.postorder()), expression=self.expression)
 
     @classmethod
-    def from_infix(cls, expression: str) -> "ExpressionTree":
-        """Khởi tạo cây trực tiếp từ biểu thức infix."""
+    def from_infix(cls, expression: str, share_subtrees: bool = False, compact: bool = False) -> "ExpressionTree":
+        """Khởi tạo cây trực tiếp từ biểu thức infix.
+
+        Với `share_subtrees=True`, các cây con giống nhau được gộp thành nút dùng
+        chung (DAG, xem `src.dag`); kết quả duyệt không thay đổi. Với
+        `compact=True`, cây được lưu dạng mảng song song (xem `src.flat_tree`).
+        """
         tokens = tokenize(expression)
         postfix = infix_to_postfix(tokens)
-        root = build_tree_from_postfix(postfix)
+        if compact:
+            if share_subtrees:
+                raise ValueError("share_subtrees and compact cannot be combined.")
+            from .flat_tree import FlatTree
+
+            return cls(root=None, expression=expression, flat=FlatTree.from_postfix(postfix))
+        if share_subtrees:
+            from .dag import build_dag_from_postfix
+
+            root = build_dag_from_postfix(postfix)
+        else:
+            root = build_tree_from_postfix(postfix)
         return cls(root=root, expression=expression)
 
+    @classmethod
+    def from_stream(cls, source: Union[str, TextIO], chunk_size: int = 1 << 16) -> "ExpressionTree":
+        """Dựng cây trong một lượt từ chuỗi hoặc file văn bản (xem `src.streaming`)."""
+        from .streaming import build_tree_from_tokens, iter_tokens
+
+        root = build_tree_from_tokens(iter_tokens(source, chunk_size))
+        expression = source if isinstance(source, str) else str(getattr(source, "name", ""))
+        return cls(root=root, expression=expression)
+
+    @instrumented("preorder", count_result)
     def preorder(self) -> List[str]:
         """Trả về danh sách token theo thứ tự duyệt tiền tự."""
+        if self._flat is not None:
+            return self._flat.preorder()
         result: List[str] = []
-        _pre_order(self.root, result)
+        _pre_order(self._root, result)
         return result
 
+    @instrumented("inorder", count_result)
     def inorder(self) -> List[str]:
         """Trả về danh sách token theo thứ tự duyệt trung tự."""
+        if self._flat is not None:
+            return self._flat.inorder()
         result: List[str] = []
-        _in_order(self.root, result)
+        _in_order(self._root, result)
         return result
 
+    @instrumented("postorder", count_result)
     def postorder(self) -> List[str]:
         """Trả về danh sách token theo thứ tự duyệt hậu tự."""
+        if self._flat is not None:
+            return self._flat.postorder()
         result: List[str] = []
-        _post_order(self.root, result)
+        _post_order(self._root, result)
         return result
 
-    def render_ascii(self) -> str:
-        """Trả về chuỗi ASCII mô tả cây theo dạng gạch kết nối."""
-        lines: List[str] = []
-        if self.root:
-            _render_ascii(self.root, "", True, lines)
-        return "\n".join(lines)
+    def iter_preorder(self) -> Iterator[str]:
+        """Sinh token theo thứ tự tiền tự mà không dựng cả danh sách."""
+        if self._flat is not None:
+            return self._flat.iter_preorder()
+        return _iter_pre_order(self._root)
+
+    def iter_inorder(self) -> Iterator[str]:
+        """Sinh token theo thứ tự trung tự mà không dựng cả danh sách."""
+        if self._flat is not None:
+            return self._flat.iter_inorder()
+        return _iter_in_order(self._root)
+
+    def iter_postorder(self) -> Iterator[str]:
+        """Sinh token theo thứ tự hậu tự mà không dựng cả danh sách."""
+        if self._flat is not None:
+            return self._flat.iter_postorder()
+        return _iter_post_order(self._root)
+
+    @instrumented("render_ascii", count_lines)
+    def render_ascii(self, max_depth: Optional[int] = None, max_nodes: Optional[int] = None) -> str:
+        """Trả về chuỗi ASCII mô tả cây theo dạng gạch kết nối (có thể cắt bớt, xem `iter_ascii`)."""
+        return "\n".join(self.iter_ascii(max_depth, max_nodes))
+
+    def iter_ascii(self, max_depth: Optional[int] = None, max_nodes: Optional[int] = None) -> Iterator[str]:
+        """Sinh lần lượt các dòng của `render_ascii`, giới hạn theo số tầng và số nút nếu cần."""
+        if self._flat is not None:
+            flat = self._flat
+            return _iter_ascii(flat.root_index, flat.labels().__getitem__, flat.children, max_depth, max_nodes)
+        return _iter_ascii(self._root, _node_label, _node_children, max_depth, max_nodes)
+
+    def write_ascii(self, stream: TextIO, max_depth: Optional[int] = None, max_nodes: Optional[int] = None) -> int:
+        """Ghi thẳng từng dòng ASCII ra `stream` và trả về số dòng đã ghi."""
+        written = 0
+        for line in self.iter_ascii(max_depth, max_nodes):
+            stream.write(line + "\n")
+            written += 1
+        return written
+
+    @instrumented("compile")
+    def compile(self) -> "Program":
+        """Biên dịch cây thành `Program` phẳng; kết quả được lưu lại để tái sử dụng."""
+        if self._program is None:
+            if self._template is not None:
+                self._program = self._template.compile()
+            elif self._flat is not None:
+                self._program = self._flat.to_program()
+            else:
+                from .compiler import compile_postfix
+
+                self._program = compile_postfix(self.postorder())
+        return self._program
+
+    def to_callable(self) -> Callable[..., float]:
+        """Sinh và biên dịch một hàm Python cho cây (xem `src.codegen`); hàm được lưu lại theo cây.
+
+        Các biến là tham số theo thứ tự `variables()`, ví dụ
+        `ExpressionTree.from_infix("x : y").to_callable()(1.0, 2.0)`.
+        """
+        if self._callable is None:
+            if self._template is not None:
+                self._callable = self._template.to_callable()
+            else:
+                from .codegen import compile_callable
+
+                self._callable = compile_callable(self.compile())
+        return self._callable
+
+    def variables(self) -> List[str]:
+        """Trả về các tên biến trong cây theo thứ tự xuất hiện đầu tiên (hậu tự)."""
+        seen = {}
+        for token in self.postorder():
+            if is_identifier(token):
+                seen.setdefault(token, None)
+        return list(seen)
+
+    def evaluate_columns(self, columns: Mapping[str, Any]) -> "ColumnResult":
+        """Tính cây một lần trên toàn bộ các cột NumPy (xem `src.vectorized`)."""
+        from .vectorized import evaluate_columns
+
+        return evaluate_columns(self.compile(), columns)
+
+    def _incremental_state(self, private: bool = False) -> "IncrementalState":
+        """Trạng thái tính gia tăng; với `private=True` đảm bảo các `Node` không dùng chung với ai."""
+        from .incremental import IncrementalState
+
+        state = self._incremental
+        if private and (self._template is not None or (state is not None and state.shared)):
+            # Copy-on-write: cached or DAG nodes must not be modified in place.
+            self.root = build_tree_from_postfix(self.postorder())
+            state = None
+        if state is None:
+            state = IncrementalState(self.root_view)
+            if private and state.shared:
+                self.root = build_tree_from_postfix(self.postorder())
+                state = IncrementalState(self.root)
+            self._incremental = state
+        return state
+
+    def value(self) -> float:
+        """Giá trị hiện tại của cây; sau `set_leaf` chỉ tính lại các nút tổ tiên của lá đã đổi."""
+        return self._incremental_state().value()
+
+    def set_leaf(self, path_or_handle: "LeafRef", value: Union[float, str]) -> int:
+        """Đổi giá trị một lá, chỉ định bằng đường đi "L"/"R" từ gốc hoặc handle.
+
+        Trả về handle (chỉ số hậu tự của lá) để dùng lại cho các lần cập nhật
+        sau mà không cần đi từ gốc. Cây dùng chung nút với cache hoặc dạng DAG
+        được sao chép riêng trước khi sửa.
+        """
+        handle = self._incremental_state(private=True).set_leaf(path_or_handle, value)
+        self._program = None
+        self._callable = None
+        return handle
+
+    def leaf_handles(self) -> List[int]:
+        """Handle của mọi lá theo thứ tự từ trái sang phải, dùng cho `set_leaf`."""
+        return self._incremental_state().leaf_handles()
+
+    def rebalance(self, exact: bool = True) -> "RebalanceResult":
+        """Cân bằng các chuỗi `+`/`-`, `*`/`:` dài thành cây độ sâu O(log n), trả về cây mới (xem `src.rebalance`).
+
+        Với `exact=True` (mặc định) chỉ nhóm lại khi kết quả chắc chắn giống hệt
+        từng bit; `exact=False` cho phép sai khác làm tròn số thực.
+        """
+        from .rebalance import rebalance_tree
+
+        return rebalance_tree(self, exact=exact)
+
+    def simplify(self) -> "SimplifyResult":
+        """Gộp hằng số và áp dụng đồng nhất thức an toàn, trả về cây mới kèm số nút đã bỏ."""
+        from .simplify import simplify_tree
+
+        return simplify_tree(self)
+
+    def canonical_key(self, exact: bool = True) -> str:
+        """Khóa dạng chuẩn: công thức chỉ khác thứ tự toán hạng của `+`/`*` (hay cách nhóm chuỗi) có cùng khóa.
+
+        Dùng để gộp công thức trùng trước khi tính (xem `src.canonical`);
+        `exact=False` làm phẳng cả các chuỗi có thể lệch kết quả do làm tròn.
+        """
+        from .canonical import canonical_key
+
+        return canonical_key(self, exact)
+
+    def canonicalize(self, exact: bool = True) -> "ExpressionTree":
+        """Trả về cây mới ở dạng chuẩn, kèm biểu thức infix chuẩn trong `expression`."""
+        from .canonical import canonical_tree
+
+        return canonical_tree(self, exact)
@@ -0,0 +1,204 @@
+"""Lưu cây biểu thức dạng mảng song song (struct-of-arrays) thay vì một đối tượng mỗi nút."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .compiler import OP_CONST, OPCODES, Program
+from .evaluator import _coerce
+from .expression_tree import OPERATORS, Node, _is_operand, _iter_post_order, is_identifier
+
+# Indexed by opcode; OP_CONST (0) marks a leaf whose text lives in `tokens`.
+_SYMBOLS = ("",) + tuple(sorted(OPCODES, key=OPCODES.get))
+
+
+class FlatTree:
+    """Cây lưu theo thứ tự hậu tự trong các mảng song song, gốc là phần tử cuối.
+
+    - `ops[i]`: opcode của nút `i` (`OP_CONST` với lá), cùng mã với `src.compiler`.
+    - `leaf[i]`: chỉ số token trong bể `tokens` (chỉ với lá, ngược lại -1).
+    - `left[i]`, `right[i]`: chỉ số con trái/phải (-1 nếu không có).
+
+    Mỗi nút tốn 13 byte trong mảng; các token trùng nhau dùng chung một chuỗi.
+    """
+
+    __slots__ = ("ops", "leaf", "left", "right", "tokens")
+
+    def __init__(self, ops: array, leaf: array, left: array, right: array, tokens: List[str]) -> None:
+        self.ops = ops
+        self.leaf = leaf
+        self.left = left
+        self.right = right
+        self.tokens = tokens
+
+    @classmethod
+    def from_postfix(cls, tokens: Iterable[str]) -> "FlatTree":
+        """Dựng cây mảng trực tiếp từ token postfix, không tạo `Node` nào."""
+        ops = array("B")
+        leaf = array("i")
+        left = array("i")
+        right = array("i")
+        pool: List[str] = []
+        pool_index: Dict[str, int] = {}
+        stack: List[int] = []
+        for token in tokens:
+            index = len(ops)
+            if _is_operand(token):
+                slot = pool_index.get(token)
+                if slot is None:
+                    slot = pool_index[token] = len(pool)
+                    pool.append(token)
+                ops.append(OP_CONST)
+                leaf.append(slot)
+                left.append(-1)
+                right.append(-1)
+                stack.append(index)
+                continue
+            if token not in OPERATORS:
+                raise ValueError(f"Encountered invalid token '{token}'.")
+            if len(stack) < 2:
+                raise ValueError("Invalid postfix expression.")
+            right_index = stack.pop()
+            left_index = stack.pop()
+            ops.append(OPCODES[token])
+            leaf.append(-1)
+            left.append(left_index)
+            right.append(right_index)
+            stack.append(index)
+
+        if len(stack) != 1:
+            raise ValueError("Postfix expression did not reduce to a single tree.")
+        return cls(ops, leaf, left, right, pool)
+
+    @classmethod
+    def from_node(cls, root: Node) -> "FlatTree":
+        """Chuyển cây `Node` sang dạng mảng."""
+        return cls.from_postfix(_iter_post_order(root))
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    @property
+    def root_index(self) -> int:
+        """Chỉ số của nút gốc (luôn là nút cuối theo thứ tự hậu tự)."""
+        return len(self.ops) - 1
+
+    def nbytes(self) -> int:
+        """Số byte dữ liệu của các mảng (không tính bể token)."""
+        return sum(column.itemsize * len(column) for column in (self.ops, self.leaf, self.left, self.right))
+
+    def labels(self) -> List[str]:
+        """Nhãn của từng nút theo chỉ số, cũng chính là thứ tự hậu tự."""
+        tokens = self.tokens
+        return [_SYMBOLS[op] if op else tokens[slot] for op, slot in zip(self.ops, self.leaf)]
+
+    def postorder(self) -> List[str]:
+        """Danh sách token hậu tự: chỉ cần đọc tuần tự các mảng."""
+        return self.labels()
+
+    def preorder(self) -> List[str]:
+        """Danh sách token tiền tự bằng ngăn xếp chỉ số."""
+        labels = self.labels()
+        left = self.left
+        right = self.right
+        result: List[str] = []
+        append = result.append
+        stack: List[int] = []
+        current = self.root_index
+        while True:
+            while current >= 0:
+                append(labels[current])
+                if right[current] >= 0:
+                    stack.append(right[current])
+                current = left[current]
+            if not stack:
+                return result
+            current = stack.pop()
+
+    def inorder(self) -> List[str]:
+        """Danh sách token trung tự bằng ngăn xếp chỉ số."""
+        labels = self.labels()
+        left = self.left
+        right = self.right
+        result: List[str] = []
+        stack: List[int] = []
+        current = self.root_index
+        while True:
+            while current >= 0:
+                stack.append(current)
+                current = left[current]
+            if not stack:
+                return result
+            current = stack.pop()
+            result.append(labels[current])
+            current = right[current]
+
+    def iter_preorder(self) -> Iterator[str]:
+        """Sinh token tiền tự, chỉ giữ ngăn xếp theo độ sâu."""
+        stack = [self.root_index]
+        while stack:
+            current = stack.pop()
+            yield self.label(current)
+            if self.right[current] >= 0:
+                stack.append(self.right[current])
+            if self.left[current] >= 0:
+                stack.append(self.left[current])
+
+    def iter_inorder(self) -> Iterator[str]:
+        """Sinh token trung tự, chỉ giữ ngăn xếp theo độ sâu."""
+        stack: List[int] = []
+        current = self.root_index
+        while current >= 0 or stack:
+            while current >= 0:
+                stack.append(current)
+                current = self.left[current]
+            current = stack.pop()
+            yield self.label(current)
+            current = self.right[current]
+
+    def iter_postorder(self) -> Iterator[str]:
+        """Sinh token hậu tự theo đúng thứ tự lưu trữ."""
+        for index in range(len(self.ops)):
+            yield self.label(index)
+
+    def label(self, index: int) -> str:
+        """Nhãn (toán tử hoặc toán hạng) của nút `index`."""
+        op = self.ops[index]
+        return _SYMBOLS[op] if op else self.tokens[self.leaf[index]]
+
+    def children(self, index: int) -> Tuple[int, ...]:
+        """Chỉ số các con của nút `index` (rỗng với lá; nút toán tử luôn có đủ hai con)."""
+        left = self.left[index]
+        return () if left < 0 else (left, self.right[index])
+
+    def to_node(self) -> Node:
+        """Dựng lại cây `Node` tương đương."""
+        nodes: List[Node] = []
+        tokens = self.tokens
+        for op, slot, left, right in zip(self.ops, self.leaf, self.left, self.right):
+            if op:
+                nodes.append(Node(_SYMBOLS[op], left=nodes[left], right=nodes[right]))
+            else:
+                nodes.append(Node(tokens[slot]))
+        return nodes[-1]
+
+    def to_program(self) -> Program:
+        """Biên dịch trực tiếp: mảng opcode đã có sẵn, mỗi token phân biệt chỉ parse một lần."""
+        names = [is_identifier(token) for token in self.tokens]
+        parsed = [float("nan") if name else _coerce(token) for token, name in zip(self.tokens, names)]
+        constants: List[float] = []
+        slots: List[Tuple[int, str]] = []
+        depth = 0
+        max_stack = 0
+        for op, slot in zip(self.ops, self.leaf):
+            if op:
+                depth -= 1
+                continue
+            if names[slot]:
+                slots.append((len(constants), self.tokens[slot]))
+            constants.append(parsed[slot])
+            depth += 1
+            if depth > max_stack:
+                max_stack = depth
+        return Program(code=array("B", self.ops), constants=tuple(constants), max_stack=max_stack, slots=tuple(slots))
@@ -0,0 +1,131 @@
+"""Tính lại gia tăng: lưu giá trị từng nút, cập nhật một lá chỉ đánh dấu các nút tổ tiên cần tính lại."""
+
+from __future__ import annotations
+
+from array import array
+from typing import List, Optional, Sequence, Set, Tuple, Union
+
+from .evaluator import _apply_operator, _coerce
+from .expression_tree import Node, _is_operand
+from .simplify import format_number
+
+# A leaf is addressed by its post-order index (handle) or by a path from the
+# root: a string of "L"/"R" steps, e.g. "LR" = right child of the left child.
+LeafRef = Union[int, str, Sequence[str]]
+
+
+class IncrementalState:
+    """Giá trị đã tính của mọi nút (theo chỉ số hậu tự) kèm con trỏ cha.
+
+    `set_leaf` đổi giá trị lá và đánh dấu bẩn các nút tổ tiên (dừng ở nút đã
+    bẩn); `value` chỉ tính lại các nút bẩn theo thứ tự tăng dần chỉ số, tức con
+    trước cha, nên mỗi lần cập nhật tốn O(độ sâu) thay vì O(n).
+    """
+
+    __slots__ = ("nodes", "left", "right", "parent", "values", "dirty", "shared")
+
+    def __init__(self, root: Node) -> None:
+        nodes: List[Node] = []
+        stack: List[Tuple[Node, bool]] = []
+        current: Optional[Node] = root
+        while current is not None or stack:
+            if current is not None:
+                stack.append((current, False))
+                current = current.left
+                continue
+            peek, right_done = stack[-1]
+            if peek.right is not None and not right_done:
+                stack[-1] = (peek, True)
+                current = peek.right
+            else:
+                nodes.append(peek)
+                stack.pop()
+
+        # A DAG visits shared nodes more than once; leaves cannot then be updated in place.
+        self.shared = len({id(node) for node in nodes}) != len(nodes)
+        self.left = array("i", [-1]) * len(nodes)
+        self.right = array("i", [-1]) * len(nodes)
+        self.parent = array("i", [-1]) * len(nodes)
+        pending: List[int] = []
+        for position, node in enumerate(nodes):
+            if node.is_leaf():
+                pending.append(position)
+                continue
+            right = pending.pop()
+            left = pending.pop()
+            self.left[position] = left
+            self.right[position] = right
+            self.parent[left] = position
+            self.parent[right] = position
+            pending.append(position)
+        self.nodes = nodes
+        self.values: List[Optional[float]] = [None] * len(nodes)
+        self.dirty: Set[int] = set(range(len(nodes)))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def handle(self, ref: LeafRef) -> int:
+        """Đổi đường đi ("L"/"R" từ gốc) hoặc chỉ số hậu tự thành chỉ số của một lá."""
+        if isinstance(ref, int):
+            if not 0 <= ref < len(self.nodes):
+                raise IndexError(f"Leaf handle {ref} is out of range.")
+            position = ref
+        else:
+            position = len(self.nodes) - 1
+            for step in ref:
+                if step in ("L", "l"):
+                    child = self.left[position]
+                elif step in ("R", "r"):
+                    child = self.right[position]
+                else:
+                    raise ValueError(f"Invalid path step '{step}'; expected 'L' or 'R'.")
+                if child < 0:
+                    raise ValueError(f"Path {''.join(ref)!r} goes below a leaf.")
+                position = child
+        if self.left[position] >= 0:
+            raise ValueError(f"Node {position} ('{self.nodes[position].value}') is not a leaf.")
+        return position
+
+    def leaf_handles(self) -> List[int]:
+        """Chỉ số của mọi lá theo thứ tự từ trái sang phải."""
+        return [position for position, child in enumerate(self.left) if child < 0]
+
+    def set_leaf(self, ref: LeafRef, value: Union[float, str]) -> int:
+        """Ghi giá trị (số hoặc token) mới cho lá và đánh dấu bẩn các nút tổ tiên; trả về chỉ số lá."""
+        token = value if isinstance(value, str) else format_number(float(value))
+        if not _is_operand(token):
+            raise ValueError(f"Leaf value '{token}' is not an operand.")
+        position = self.handle(ref)
+        self.nodes[position].value = token
+        parent = self.parent
+        dirty = self.dirty
+        current = position
+        while current >= 0 and current not in dirty:
+            dirty.add(current)
+            current = parent[current]
+        return position
+
+    def value(self) -> float:
+        """Giá trị của gốc sau khi tính lại các nút bẩn."""
+        dirty = self.dirty
+        if dirty:
+            order = sorted(dirty)
+            values = self.values
+            nodes = self.nodes
+            left = self.left
+            right = self.right
+            for step, position in enumerate(order):
+                try:
+                    if left[position] < 0:
+                        values[position] = _coerce(nodes[position].value)
+                    else:
+                        values[position] = _apply_operator(
+                            nodes[position].value, values[left[position]], values[right[position]]
+                        )
+                except (ValueError, ArithmeticError):
+                    # Ancestors come later in post-order, so the remaining suffix stays dirty.
+                    self.dirty = set(order[step:])
+                    raise
+            dirty.clear()
+        return self.values[-1]
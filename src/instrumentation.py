@@ -0,0 +1,213 @@
+"""Đo thời gian theo từng giai đoạn (tách token, shunting-yard, dựng cây, duyệt, tính toán).
+
+Mặc định tắt: hàm được bọc chỉ tốn thêm một phép kiểm tra cờ. Khi bật, mỗi lần
+gọi ghi lại thời gian và số phần tử (token/nút) xử lý; `snapshot()` trả về số
+lần gọi, tổng thời gian và các phân vị, còn `add_listener` cho phép chuyển tiếp
+từng sự kiện sang hệ thống metrics bên ngoài.
+"""
+
+from __future__ import annotations
+
+import functools
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sized, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+Listener = Callable[[str, float, int], None]
+ItemCounter = Callable[[tuple, Any], int]
+
+# Latency samples kept per stage for percentiles (reservoir sampling beyond this).
+RESERVOIR_SIZE = 4096
+PERCENTILES = (50, 90, 99)
+
+
+class _StageStats:
+    """Bộ đếm của một giai đoạn: số lần gọi, tổng thời gian, số phần tử và mẫu độ trễ."""
+
+    __slots__ = ("calls", "total", "maximum", "items", "samples")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.items = 0
+        self.samples: List[float] = []
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Phân vị theo phương pháp nearest-rank trên danh sách đã sắp xếp."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def _merge_samples(rng: random.Random, ours: List[float], our_calls: int, theirs: List[float], their_calls: int) -> List[float]:
+    """Gộp reservoir `theirs` vào `ours` (sửa tại chỗ) để được mẫu đều trên cả `our_calls + their_calls` lần gọi.
+
+    Số chỗ dành cho `theirs` tỷ lệ với số lần gọi của nó (làm tròn ngẫu nhiên),
+    các mẫu được chọn ngẫu nhiên ở mỗi bên; chi phí O(số mẫu nhận vào), không phụ
+    thuộc `RESERVOIR_SIZE`.
+    """
+    if len(ours) + len(theirs) <= RESERVOIR_SIZE:
+        ours.extend(theirs)
+        return ours
+    share = RESERVOIR_SIZE * their_calls / (our_calls + their_calls)
+    taken = int(share) + (rng.random() < share - int(share))
+    # Never leave slots empty when our side has fewer samples than its share.
+    taken = min(len(theirs), max(taken, RESERVOIR_SIZE - len(ours)))
+    incoming = rng.sample(theirs, taken)
+    replaced = len(ours) + taken - RESERVOIR_SIZE
+    for slot, sample in zip(rng.sample(range(len(ours)), replaced), incoming):
+        ours[slot] = sample
+    ours.extend(incoming[replaced:])
+    return ours
+
+
+class Profiler:
+    """Thu thập số liệu theo giai đoạn; an toàn khi dùng từ nhiều luồng."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._stages: Dict[str, _StageStats] = {}
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+        self._random = random.Random(0)
+
+    def record(self, stage: str, seconds: float, items: int = 0) -> None:
+        """Ghi một lần chạy của `stage` và báo cho các listener."""
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = _StageStats()
+            stats.calls += 1
+            stats.total += seconds
+            stats.items += items
+            if seconds > stats.maximum:
+                stats.maximum = seconds
+            if len(stats.samples) < RESERVOIR_SIZE:
+                stats.samples.append(seconds)
+            else:
+                slot = self._random.randrange(stats.calls)
+                if slot < RESERVOIR_SIZE:
+                    stats.samples[slot] = seconds
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(stage, seconds, items)
+
+    def add_listener(self, listener: Listener) -> None:
+        """Đăng ký hàm `listener(stage, seconds, items)` được gọi sau mỗi lần ghi."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener) -> None:
+        """Hủy đăng ký listener đã thêm bằng `add_listener`."""
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def reset(self) -> None:
+        """Xóa toàn bộ số liệu đã thu thập (giữ nguyên trạng thái bật/tắt và listener)."""
+        with self._lock:
+            self._stages.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Trả về số liệu tổng hợp của từng giai đoạn, sẵn sàng để xuất JSON."""
+        with self._lock:
+            stages = {name: (stats.calls, stats.total, stats.maximum, stats.items, sorted(stats.samples))
+                      for name, stats in self._stages.items()}
+        summary: Dict[str, Dict[str, float]] = {}
+        for name, (calls, total, maximum, items, ordered) in sorted(stages.items()):
+            entry: Dict[str, float] = {
+                "calls": calls,
+                "total_seconds": total,
+                "mean_seconds": total / calls if calls else 0.0,
+                "max_seconds": maximum,
+                "items": items,
+            }
+            for percent in PERCENTILES:
+                entry[f"p{percent}_seconds"] = _percentile(ordered, percent)
+            summary[name] = entry
+        return summary
+
+    def export(self) -> Dict[str, tuple]:
+        """Trạng thái thô có thể pickle, dùng để gộp số liệu từ tiến trình con bằng `merge`."""
+        with self._lock:
+            return {name: (s.calls, s.total, s.maximum, s.items, list(s.samples)) for name, s in self._stages.items()}
+
+    def merge(self, state: Dict[str, tuple]) -> None:
+        """Cộng trạng thái lấy từ `export()` của một profiler khác vào profiler này."""
+        with self._lock:
+            for name, (calls, total, maximum, items, samples) in state.items():
+                stats = self._stages.get(name)
+                if stats is None:
+                    stats = self._stages[name] = _StageStats()
+                stats.samples = _merge_samples(self._random, stats.samples, stats.calls, samples, calls)
+                stats.calls += calls
+                stats.total += total
+                stats.items += items
+                stats.maximum = max(stats.maximum, maximum)
+
+
+PROFILER = Profiler()
+
+
+def enable_profiling() -> None:
+    """Bật thu thập số liệu cho profiler toàn cục."""
+    PROFILER.enabled = True
+
+
+def disable_profiling() -> None:
+    """Tắt thu thập số liệu cho profiler toàn cục."""
+    PROFILER.enabled = False
+
+
+def count_result(args: tuple, result: Any) -> int:
+    """Số phần tử = độ dài kết quả (danh sách token)."""
+    return len(result)
+
+
+def count_first_argument(args: tuple, result: Any) -> int:
+    """Số phần tử = độ dài đối số đầu tiên nếu có thể đo (danh sách token đầu vào)."""
+    return len(args[0]) if args and isinstance(args[0], Sized) else 0
+
+
+def count_lines(args: tuple, result: str) -> int:
+    """Số phần tử = số dòng của chuỗi kết quả (bản vẽ ASCII)."""
+    return result.count("\n") + 1 if result else 0
+
+
+def profiled_call(stage: str, count: Optional[ItemCounter], func: Callable[..., Any], *args: Any) -> Any:
+    """Gọi `func(*args)` và ghi thời gian vào `PROFILER` dưới tên `stage` khi đang bật.
+
+    Dùng tại nơi gọi các hàm nóng (`run_program`, `evaluate_prefix`,
+    `evaluate_postfix`): bọc chúng bằng `instrumented` sẽ tốn thêm một lớp gọi
+    hàm cho mọi lần gọi, kể cả khi tắt đo.
+    """
+    if not PROFILER.enabled:
+        return func(*args)
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+    except BaseException:
+        # Failed calls still cost time; they are recorded without item counts.
+        PROFILER.record(stage, time.perf_counter() - start)
+        raise
+    PROFILER.record(stage, time.perf_counter() - start, count(args, result) if count else 0)
+    return result
+
+
+def instrumented(stage: str, count: Optional[ItemCounter] = None) -> Callable[[F], F]:
+    """Decorator ghi thời gian của hàm vào `PROFILER` dưới tên `stage` khi đang bật."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            return profiled_call(stage, count, functools.partial(func, **kwargs), *args)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
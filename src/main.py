@@ -3,10 +3,21 @@
 from __future__ import annotations
 
 import argparse
-from typing import Iterable, List
+import json
+import math
+import sys
+from functools import partial
+from itertools import chain, islice
+from multiprocessing import Pool
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, TextIO, Tuple
 
+from .budget import DEFAULT_BUDGET, EvaluationBudget
+from .compiler import run_program
+from .disk_cache import DEFAULT_MAX_BYTES, CachedExpression, DiskCache, cache_stats_summary, shared_cache
 from .evaluator import evaluate_postfix, evaluate_prefix
-from .expression_tree import ExpressionTree, build_expression_tree
+from .expression_tree import ExpressionTree, build_expression_tree, parse_cache_stats
+from .instrumentation import PROFILER, count_first_argument, disable_profiling, enable_profiling, profiled_call
 
 DEFAULT_EXPRESSIONS = [
     "(3^2 + 5) - 4 : 2",
@@ -16,6 +27,9 @@ DEFAULT_EXPRESSIONS = [
     "(1 + 2 * 3) : (4 - 5 - 6 +7)",
 ]
 
+FIELDS = ("prefix", "postfix", "value", "tree")
+DEFAULT_FIELDS = "prefix,postfix,value"
+
 
 def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
     """Khởi tạo bộ phân tích tham số cho CLI."""
@@ -27,26 +41,123 @@ def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
         action="append",
         help="Custom infix expression to evaluate. Can be supplied multiple times.",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--input",
+        metavar="FILE",
+        help="Read newline-delimited expressions from FILE ('-' for stdin).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "jsonl"),
+        default="text",
+        help="Output format: human-readable blocks or one JSON object per line.",
+    )
+    parser.add_argument(
+        "--fields",
+        default=DEFAULT_FIELDS,
+        help=f"Comma-separated jsonl fields from {', '.join(FIELDS)} (default: {DEFAULT_FIELDS}).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes; output order is preserved.",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="Record per-stage timings and write a JSON summary at exit (stderr, or FILE if given).",
+    )
+    parser.add_argument(
+        "--no-tree",
+        dest="tree",
+        action="store_false",
+        help="Skip ASCII tree rendering (text blocks and the jsonl 'tree' field).",
+    )
+    parser.add_argument(
+        "--tree-max-depth",
+        type=int,
+        metavar="N",
+        help="Render at most N tree levels; deeper branches are shown as '...'.",
+    )
+    parser.add_argument(
+        "--tree-max-nodes",
+        type=int,
+        metavar="N",
+        help="Render at most N tree nodes per expression.",
+    )
+    parser.add_argument(
+        "--cache-file",
+        metavar="PATH",
+        help="Persist parsed trees, compiled programs and values in a SQLite file shared across runs and workers.",
+    )
+    parser.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        metavar="N",
+        help=f"Evict least recently used cache entries beyond N bytes (default: {DEFAULT_MAX_BYTES}).",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Write a JSON summary of --cache-file hits, misses and size to stderr at exit.",
+    )
+    args = parser.parse_args(argv)
+    fields = tuple(field.strip() for field in args.fields.split(",") if field.strip())
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown:
+        parser.error(f"unknown field(s) for --fields: {', '.join(unknown)}")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    for name in ("tree_max_depth", "tree_max_nodes"):
+        if getattr(args, name) is not None and getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1")
+    if args.cache_max_bytes < 1:
+        parser.error("--cache-max-bytes must be at least 1")
+    if args.cache_stats and not args.cache_file:
+        parser.error("--cache-stats requires --cache-file")
+    if not args.tree:
+        fields = tuple(field for field in fields if field != "tree")
+    args.fields = fields
+    return args
 
 
-def render_results(expression: str) -> str:
-    """Dựng cây cho một biểu thức cụ thể và trả về nội dung cần in."""
-    tree = build_expression_tree(expression)
+def iter_results(
+    expression: str,
+    budget: EvaluationBudget | None = DEFAULT_BUDGET,
+    show_tree: bool = True,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+    cache: DiskCache | None = None,
+) -> Iterator[str]:
+    """Dựng cây cho một biểu thức cụ thể và trả về lần lượt các dòng cần in.
+
+    Giá trị được tính ngay khi gọi, nên lỗi được ném ra trước khi có dòng nào;
+    các dòng của cây chỉ được vẽ khi đọc tới. `show_tree=False` bỏ qua phần vẽ
+    cây; `max_depth`/`max_nodes` cắt bớt bản vẽ. Với `cache`, cây và giá trị
+    được lấy từ (hoặc ghi vào) bộ nhớ đệm trên đĩa.
+    """
+    tree, entry = _cached_tree(expression, cache)
     prefix_tokens = tree.preorder()
     postfix_tokens = tree.postorder()
     prefix = " ".join(prefix_tokens)
     postfix = " ".join(postfix_tokens)
-    art = tree.render_ascii()
 
-    def safe_eval(func, tokens: List[str]) -> str:
-        try:
-            return f"{func(tokens):.4g}"
-        except ZeroDivisionError:
-            return "undefined (division by zero)"
+    def evaluation(func, tokens: List[str]) -> Callable[[], Any]:
+        return partial(profiled_call, func.__name__, count_first_argument, func, tokens, budget)
+
+    def describe(value: Any, error: str | None) -> str:
+        return "undefined (division by zero)" if error else f"{value:.4g}"
 
-    prefix_value = safe_eval(evaluate_prefix, prefix_tokens)
-    postfix_value = safe_eval(evaluate_postfix, postfix_tokens)
+    # The cache only remembers what the prefix evaluator returned, so errors read the same with or without it.
+    prefix_value = describe(*_cached_value(expression, tree, entry, cache, evaluation(evaluate_prefix, prefix_tokens)))
+    if entry is not None and entry.evaluated:
+        postfix_value = prefix_value
+    else:
+        postfix_value = describe(*_evaluated(evaluation(evaluate_postfix, postfix_tokens)))
 
     lines = [
         f"Expression : {expression}",
@@ -54,20 +165,310 @@ def render_results(expression: str) -> str:
         f"Postfix    : {postfix}",
         f"Prefix eval: {prefix_value}",
         f"Postfix eval: {postfix_value}",
-        "Tree:",
-        art,
     ]
-    return "\n".join(lines)
+    if not show_tree:
+        return iter(lines)
+    lines.append("Tree:")
+    return chain(lines, tree.iter_ascii(max_depth, max_nodes))
+
+
+def render_results(
+    expression: str,
+    budget: EvaluationBudget | None = DEFAULT_BUDGET,
+    show_tree: bool = True,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+    cache: DiskCache | None = None,
+) -> str:
+    """Nội dung cần in cho một biểu thức dưới dạng một chuỗi (các dòng của `iter_results`)."""
+    return "\n".join(iter_results(expression, budget, show_tree, max_depth, max_nodes, cache))
+
+
+def build_record(
+    expression: str,
+    fields: Sequence[str],
+    budget: EvaluationBudget | None = DEFAULT_BUDGET,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+    cache: DiskCache | None = None,
+) -> Dict[str, Any]:
+    """Dựng bản ghi JSON cho một biểu thức với các trường được chọn.
+
+    Chia cho 0 hoặc kết quả không ghi được thành số JSON (số phức, vô cực, NaN)
+    vẫn trả về prefix/postfix, kèm `value` rỗng và trường `error`; biểu thức vượt
+    `budget` sinh bản ghi lỗi `BudgetExceededError`.
+    Với `cache`, cây và giá trị được lấy từ (hoặc ghi vào) bộ nhớ đệm trên đĩa.
+    """
+    tree, entry = _cached_tree(expression, cache)
+    record: Dict[str, Any] = {"expression": expression}
+    if "prefix" in fields:
+        record["prefix"] = " ".join(tree.preorder())
+    if "postfix" in fields:
+        record["postfix"] = " ".join(tree.postorder())
+    if "value" in fields:
+        def compute() -> Any:
+            return profiled_call("run_program", count_first_argument, run_program, tree.compile(), None, budget)
+
+        record["value"], error = _cached_value(expression, tree, entry, cache, compute)
+        if error is None:
+            error = _unrepresentable(record["value"])
+        if error is not None:
+            record["value"] = None
+            record["error"] = error
+    elif cache is not None and entry is None:
+        cache.put(expression, tree)
+    if "tree" in fields:
+        record["tree"] = tree.render_ascii(max_depth, max_nodes)
+    return record
+
+
+def _unrepresentable(value: Any) -> str | None:
+    """Lỗi cho giá trị không có dạng số JSON hợp lệ (số phức, vô cực, NaN), None nếu ghi được."""
+    if isinstance(value, complex):
+        return "ValueError: Result is a complex number."
+    if isinstance(value, float) and not math.isfinite(value):
+        return "ValueError: Result is not a finite number."
+    return None
+
+
+def _cached_tree(expression: str, cache: DiskCache | None) -> Tuple[ExpressionTree, CachedExpression | None]:
+    """Cây của biểu thức: đọc từ `cache` nếu đã có, ngược lại phân tích như thường."""
+    entry = cache.get(expression) if cache is not None else None
+    if entry is not None:
+        return entry.tree, entry
+    return build_expression_tree(expression), None
+
+
+def _cached_value(
+    expression: str,
+    tree: ExpressionTree,
+    entry: CachedExpression | None,
+    cache: DiskCache | None,
+    compute: Callable[[], Any],
+) -> Tuple[Any, str | None]:
+    """Giá trị và lỗi chia cho 0 (nếu có) do `compute` tính; dùng kết quả đã lưu và ghi kết quả mới vào `cache`.
+
+    Lỗi khác (vượt ngân sách, thiếu biến...) được ném ra và không được lưu.
+    """
+    if entry is not None and entry.evaluated:
+        return entry.value, entry.error
+    value, error = _evaluated(compute)
+    # Complex results do not fit the REAL column; their entry keeps only the tree.
+    stored = None if isinstance(value, complex) else value
+    if cache is not None and (entry is None or stored is not None or error is not None):
+        cache.put(expression, tree, stored, error)
+    return value, error
+
+
+def _evaluated(compute: Callable[[], Any]) -> Tuple[Any, str | None]:
+    """Gọi `compute`; chia cho 0 thành chuỗi lỗi thay vì ngoại lệ."""
+    try:
+        return compute(), None
+    except ZeroDivisionError as exc:
+        return None, f"ZeroDivisionError: {exc}"
+
+
+def _process_line(
+    item: Tuple[int, str],
+    output_format: str,
+    fields: Sequence[str],
+    show_tree: bool = True,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+    cache: DiskCache | None = None,
+) -> str:
+    """Xử lý một dòng đầu vào; lỗi được ghi thành bản ghi thay vì dừng cả lượt chạy."""
+    line_number, expression = item
+    if output_format == "text":
+        return "\n".join(_text_lines(item, show_tree, max_depth, max_nodes, cache))
+    try:
+        record = {
+            "line": line_number,
+            **build_record(expression, fields, max_depth=max_depth, max_nodes=max_nodes, cache=cache),
+        }
+        return json.dumps(record, ensure_ascii=False, allow_nan=False)
+    except (ValueError, TypeError, ArithmeticError) as exc:
+        record = {
+            "line": line_number,
+            "expression": expression,
+            "error": f"{type(exc).__name__}: {exc}",
+        }
+    return json.dumps(record, ensure_ascii=False)
+
+
+def _text_lines(
+    item: Tuple[int, str],
+    show_tree: bool = True,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+    cache: DiskCache | None = None,
+) -> Iterator[str]:
+    """Các dòng văn bản cho một dòng đầu vào; lỗi thành hai dòng báo lỗi."""
+    line_number, expression = item
+    try:
+        return iter_results(expression, show_tree=show_tree, max_depth=max_depth, max_nodes=max_nodes, cache=cache)
+    except (ValueError, ArithmeticError) as exc:
+        return iter((f"Expression : {expression}", f"Error (line {line_number}): {exc}"))
+
+
+def _read_expressions(stream: TextIO) -> Iterator[Tuple[int, str]]:
+    """Đọc từng dòng (bỏ dòng trống) mà không nạp toàn bộ file vào bộ nhớ."""
+    for line_number, line in enumerate(stream, start=1):
+        expression = line.strip()
+        if expression:
+            yield line_number, expression
+
+
+def _run(
+    items: Iterable[Tuple[int, str]],
+    args: argparse.Namespace,
+    out: TextIO,
+    cache: DiskCache | None = None,
+) -> None:
+    """Xử lý các biểu thức (tuần tự hoặc qua nhiều tiến trình) và ghi kết quả theo đúng thứ tự."""
+    worker = partial(
+        _process_line,
+        output_format=args.format,
+        fields=args.fields,
+        show_tree=args.tree,
+        max_depth=args.tree_max_depth,
+        max_nodes=args.tree_max_nodes,
+        cache=cache,
+    )
+    separator = "-" * 40 if args.format == "text" else None
+    if args.jobs > 1:
+        if not args.profile and cache is None:
+            with Pool(args.jobs) as pool:
+                _write_outputs(pool.imap(worker, items, chunksize=256), separator, out)
+            return
+        initializer = enable_profiling if args.profile else None
+        with Pool(args.jobs, initializer=initializer) as pool:
+            results = pool.imap(partial(_tracked, worker, cache), _chunks(items, 256))
+            _write_outputs(_merge_states(results, cache), separator, out)
+    elif args.format == "text":
+        # Without worker processes the lines go straight to `out`, tree included, with no joined string.
+        lines = partial(
+            _text_lines,
+            show_tree=args.tree,
+            max_depth=args.tree_max_depth,
+            max_nodes=args.tree_max_nodes,
+            cache=cache,
+        )
+        _write_outputs(map(lines, items), separator, out)
+    else:
+        _write_outputs(map(worker, items), separator, out)
+
+
+def _chunks(items: Iterable[Tuple[int, str]], size: int) -> Iterator[List[Tuple[int, str]]]:
+    """Chia dãy đầu vào thành các khối `size` phần tử mà không đọc hết trước."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _tracked(
+    worker: Callable[[Tuple[int, str]], str],
+    cache: DiskCache | None,
+    chunk: List[Tuple[int, str]],
+) -> Tuple[List[str], Dict[str, Any]]:
+    """Chạy `worker` cho một khối trong tiến trình con, gửi kèm số liệu đo được và bộ đếm cache của cả khối."""
+    outputs = [worker(item) for item in chunk]
+    state: Dict[str, Any] = {}
+    if PROFILER.enabled:
+        state["profile"] = PROFILER.export()
+        PROFILER.reset()
+    if cache is not None:
+        state["cache"] = cache.export()
+        cache.reset()
+    return outputs, state
+
+
+def _merge_states(results: Iterable[Tuple[List[str], Dict[str, Any]]], cache: DiskCache | None) -> Iterator[str]:
+    """Gộp số liệu của từng khối từ tiến trình con vào `PROFILER` và `cache`, trả lại kết quả theo thứ tự."""
+    for outputs, state in results:
+        if "profile" in state:
+            PROFILER.merge(state["profile"])
+        if "cache" in state:
+            cache.merge(state["cache"])
+        yield from outputs
+
+
+def profile_summary(include_cache: bool = True) -> Dict[str, Any]:
+    """Tổng hợp số liệu theo giai đoạn (và bộ nhớ đệm phân tích) để xuất JSON."""
+    summary: Dict[str, Any] = {"stages": PROFILER.snapshot()}
+    if include_cache:
+        stats = parse_cache_stats()
+        summary["parse_cache"] = {**asdict(stats), "hit_rate": stats.hit_rate}
+    return summary
+
+
+def _write_profile(args: argparse.Namespace) -> None:
+    """Ghi bản tổng hợp `--profile` ra stderr hoặc ra file được chỉ định."""
+    # Worker processes keep their own parse caches, so only report it for serial runs.
+    payload = json.dumps(profile_summary(include_cache=args.jobs == 1), indent=2)
+    if args.profile == "-":
+        print(payload, file=sys.stderr)
+    else:
+        with open(args.profile, "w", encoding="utf-8") as handle:
+            handle.write(payload + "\n")
+
+
+def _write_outputs(outputs: Iterable[str | Iterator[str]], separator: str | None, out: TextIO) -> None:
+    """Ghi từng kết quả (một chuỗi hoặc các dòng của nó) ra `out`, chèn dòng phân cách giữa các khối văn bản."""
+    for index, output in enumerate(outputs):
+        if separator and index:
+            out.write(separator + "\n")
+        if isinstance(output, str):
+            out.write(output + "\n")
+        else:
+            for line in output:
+                out.write(line + "\n")
+
+
+def _close_cache(cache: DiskCache, report: bool) -> None:
+    """Ghi nốt bộ nhớ đệm trên đĩa (loại mục cũ nếu vượt giới hạn) và in `--cache-stats` ra stderr."""
+    cache.flush()
+    if report:
+        print(json.dumps(cache_stats_summary(cache), indent=2), file=sys.stderr)
+    cache.close()
 
 
 def main(argv: Iterable[str] | None = None) -> None:
     """Điểm vào chính: đọc danh sách biểu thức và in kết quả."""
     args = parse_args(argv)
+    cache = shared_cache(args.cache_file, args.cache_max_bytes) if args.cache_file else None
+    if not args.profile and cache is None:
+        _dispatch(args)
+        return
+    if args.profile:
+        PROFILER.reset()
+        enable_profiling()
+    if cache is not None:
+        cache.reset()
+    try:
+        _dispatch(args, cache)
+    finally:
+        if args.profile:
+            disable_profiling()
+            _write_profile(args)
+        if cache is not None:
+            _close_cache(cache, args.cache_stats)
+
+
+def _dispatch(args: argparse.Namespace, cache: DiskCache | None = None) -> None:
+    """Chọn nguồn biểu thức (file, stdin hoặc `--expr`) và chạy."""
+    if args.input:
+        if args.input == "-":
+            _run(_read_expressions(sys.stdin), args, sys.stdout, cache)
+        else:
+            with open(args.input, encoding="utf-8") as stream:
+                _run(_read_expressions(stream), args, sys.stdout, cache)
+        return
     expressions = args.expr if args.expr else DEFAULT_EXPRESSIONS
-    for index, expr in enumerate(expressions, start=1):
-        if index > 1:
-            print("-" * 40)
-        print(render_results(expr))
+    _run(enumerate(expressions, start=1), args, sys.stdout, cache)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+"""Tính một cây rất lớn song song: chia thành các cây con độc lập và gửi cho nhiều tiến trình."""
+
+from __future__ import annotations
+
+import heapq
+import os
+from array import array
+from multiprocessing import Pool
+from multiprocessing.pool import Pool as PoolType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .compiler import _BINARY, Program, run_program
+from .expression_tree import ExpressionTree
+from .flat_tree import FlatTree
+
+# Below this many nodes the pool round-trip costs more than it saves.
+DEFAULT_MIN_NODES = 100_000
+# More pieces than workers evens out uneven subtree sizes.
+PIECES_PER_WORKER = 4
+# If one piece still holds this share of the tree (left/right-deep chains), run serially.
+MAX_PIECE_SHARE = 0.75
+
+# A piece is a contiguous post-order slice: (opcode bytes, float64 leaf values as bytes).
+Piece = Tuple[bytes, bytes]
+
+
+def split_tree(flat: FlatTree, pieces: int) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """Tách cây thành các đoạn hậu tự rời nhau `(start, end)` cùng các nút phía trên nối chúng.
+
+    Luôn tách đoạn lớn nhất tại gốc của nó: con trái chiếm `[start, left]`, con
+    phải chiếm `[left + 1, end - 1]`, còn nút gốc chuyển lên phần tính ở tiến
+    trình chính. Mỗi lần tách tốn O(log số đoạn), không phải duyệt cây.
+    """
+    left = flat.left
+    right = flat.right
+    root = flat.root_index
+    heap: List[Tuple[int, int, int]] = [(-(root + 1), 0, root)]
+    top: List[int] = []
+    while len(heap) < pieces:
+        _, start, end = heap[0]
+        if left[end] < 0:
+            break  # the largest piece is a single leaf
+        heapq.heappop(heap)
+        top.append(end)
+        middle = left[end]
+        heapq.heappush(heap, (-(middle - start + 1), start, middle))
+        heapq.heappush(heap, (-(right[end] - middle), middle + 1, right[end]))
+    ranges = sorted((start, end) for _, start, end in heap)
+    return ranges, sorted(top)
+
+
+def _evaluate_piece(piece: Piece) -> Tuple[Optional[float], Optional[BaseException]]:
+    """Chạy một đoạn trong tiến trình con; lỗi được trả về để tiến trình chính ném đúng thứ tự."""
+    code, leaves = piece
+    program = Program.from_code(code, array("d", leaves))
+    try:
+        return run_program(program), None
+    except (ArithmeticError, ValueError) as exc:
+        return None, exc
+
+
+def evaluate_parallel(
+    tree: ExpressionTree,
+    variables: Optional[Mapping[str, float]] = None,
+    workers: Optional[int] = None,
+    min_nodes: int = DEFAULT_MIN_NODES,
+    pool: Optional[PoolType] = None,
+) -> float:
+    """Tính `tree` bằng nhiều tiến trình, cho cùng kết quả với `tree.compile().evaluate()`.
+
+    - Cây nhỏ hơn `min_nodes` nút, hoặc không tách được thành các phần cân đối
+      (chuỗi lệch hẳn một phía), được tính tuần tự.
+    - Mỗi tiến trình chỉ nhận đoạn opcode và giá trị lá dạng byte, không nhận đồ
+      thị `Node`. Truyền `pool` để tái sử dụng tiến trình giữa các lần gọi.
+    - Lỗi (ví dụ `ZeroDivisionError`) được ném lại đúng như khi tính tuần tự:
+      lỗi xuất hiện sớm nhất theo thứ tự hậu tự.
+
+    Cây lưu dạng mảng (`compact=True`) được tách trực tiếp; cây `Node` phải
+    chuyển sang dạng mảng trước.
+    """
+    program = tree.compile()
+    workers = workers or os.cpu_count() or 1
+    if len(program) < min_nodes or workers < 2:
+        return run_program(program, variables)
+    flat = tree.flat if tree.flat is not None else FlatTree.from_node(tree.root_view)
+    ranges, top = split_tree(flat, workers * PIECES_PER_WORKER)
+    if max(end - start + 1 for start, end in ranges) > MAX_PIECE_SHARE * len(program):
+        return run_program(program, variables)
+
+    leaves = array("d", program.bind(variables) if program.slots else program.constants)
+    code = program.code.tobytes()
+    payloads: List[Piece] = []
+    offset = 0
+    previous = 0
+    for start, end in ranges:
+        offset += code.count(0, previous, start)  # leaves before this piece
+        count = code.count(0, start, end + 1)
+        payloads.append((code[start:end + 1], leaves[offset:offset + count].tobytes()))
+        offset += count
+        previous = end + 1
+
+    if pool is None:
+        with Pool(workers) as owned:
+            outcomes = owned.map(_evaluate_piece, payloads)
+    else:
+        outcomes = pool.map(_evaluate_piece, payloads)
+    return _combine(flat, ranges, outcomes, top)
+
+
+def _combine(
+    flat: FlatTree,
+    ranges: List[Tuple[int, int]],
+    outcomes: List[Tuple[Optional[float], Optional[BaseException]]],
+    top: List[int],
+) -> float:
+    """Tính các nút phía trên từ kết quả của từng đoạn, theo thứ tự hậu tự."""
+    values: Dict[int, Any] = {}
+    failures: List[Tuple[int, BaseException]] = []
+    for (start, end), (value, error) in zip(ranges, outcomes):
+        if error is not None:
+            failures.append((start, error))
+        values[end] = value
+    first_failure = failures[0] if failures else None
+    for index in top:
+        # Serial evaluation would hit an error inside an earlier piece first.
+        if first_failure is not None and first_failure[0] < index:
+            raise first_failure[1]
+        values[index] = _BINARY[flat.ops[index]](values[flat.left[index]], values[flat.right[index]])
+    return values[flat.root_index]
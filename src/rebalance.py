@@ -0,0 +1,186 @@
+"""Cân bằng lại chuỗi toán tử kết hợp (`+`/`-`, `*`/`:`) để cây có độ sâu O(log n)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .compiler import EXACT_INTEGER_LIMIT
+from .expression_tree import ExpressionTree, Node, is_identifier
+
+# Operator family -> (operator, inverse operator). Operands under the right side of
+# an inverse operator are "inverted": subtracted, or divided by.
+_ADDITIVE = ("+", "-")
+_MULTIPLICATIVE = ("*", ":")
+
+# One operand of a chain: (inverted, operand subtree).
+Term = Tuple[bool, Node]
+# A chain that can be regrouped: (operator family, operands from left to right).
+Chain = Tuple[Tuple[str, str], List[Term]]
+
+
+@dataclass(frozen=True)
+class RebalanceResult:
+    """Cây sau khi cân bằng cùng độ sâu trước và sau."""
+
+    tree: ExpressionTree
+    depth_before: int
+    depth_after: int
+    chains: int
+
+
+def tree_depth(root: Node) -> int:
+    """Độ sâu của cây (lá có độ sâu 1), tính không đệ quy."""
+    depth = 0
+    stack: List[Tuple[Node, int]] = [(root, 1)]
+    while stack:
+        node, level = stack.pop()
+        if level > depth:
+            depth = level
+        if node.left is not None:
+            stack.append((node.left, level + 1))
+        if node.right is not None:
+            stack.append((node.right, level + 1))
+    return depth
+
+
+def _integer(node: Node) -> Optional[int]:
+    """Giá trị nguyên của lá hằng số, None nếu không phải."""
+    if not node.is_leaf() or is_identifier(node.value):
+        return None
+    value = float(node.value)
+    return int(value) if value.is_integer() else None
+
+
+def _collect(node: Node, family: Tuple[str, str], ops: FrozenSet[str]) -> Tuple[List[Term], List[Node]]:
+    """Tách chuỗi lớn nhất bắt đầu ở `node` thành các toán hạng (trái sang phải) và các nút trong chuỗi."""
+    inverse = family[1]
+    terms: List[Term] = []
+    internal: List[Node] = []
+    # (inverted, node, expand): the divisor of `:` is kept whole, since flattening
+    # `a : (b : c)` would make `c` a factor and lose its ZeroDivisionError.
+    stack: List[Tuple[bool, Node, bool]] = [(False, node, True)]
+    while stack:
+        inverted, current, expand = stack.pop()
+        if expand and current.value in ops and not current.is_leaf():
+            internal.append(current)
+            stack.append((inverted != (current.value == inverse), current.right, current.value != ":"))
+            stack.append((inverted, current.left, True))
+        else:
+            terms.append((inverted, current))
+    return terms, internal
+
+
+def _is_exact(terms: List[Term], family: Tuple[str, str]) -> bool:
+    """True nếu mọi cách nhóm các toán hạng đều cho cùng kết quả từng bit."""
+    total = 0 if family is _ADDITIVE else 1
+    for inverted, term in terms:
+        value = _integer(term)
+        if value is None or (inverted and family is _MULTIPLICATIVE):
+            return False
+        total = total + abs(value) if family is _ADDITIVE else total * abs(value)
+        if total > EXACT_INTEGER_LIMIT:
+            return False
+    return True
+
+
+def _plan_chain(node: Node, exact: bool) -> Tuple[Optional[Chain], List[Node]]:
+    """Chuỗi bắt đầu ở `node` nếu cân bằng lại được an toàn (ngược lại None), kèm các nút trong chuỗi."""
+    if node.value in _ADDITIVE:
+        family = _ADDITIVE
+        terms, internal = _collect(node, family, frozenset(_ADDITIVE))
+    elif node.value == "*" or (node.value == ":" and not exact):
+        family = _MULTIPLICATIVE
+        terms, internal = _collect(node, family, frozenset(_MULTIPLICATIVE))
+        # Regrouping divisions multiplies divisors together first; only literal
+        # non-zero divisors make that safe (no ZeroDivisionError moved or lost).
+        if any(inverted and not _integer(term) for inverted, term in terms):
+            if node.value != "*":
+                return None, []
+            terms, internal = _collect(node, family, frozenset("*"))
+    else:
+        return None, []
+    if len(terms) < 3 or (exact and not _is_exact(terms, family)):
+        return None, internal
+    return (family, terms), internal
+
+
+def _balanced(terms: List[Term], start: int, end: int, flip: bool, family: Tuple[str, str], built: Dict[int, Node]) -> Node:
+    """Dựng cây cân bằng cho `terms[start:end]`, giữ nguyên thứ tự toán hạng.
+
+    `flip` đảo vai trò của cờ "inverted" trong đoạn con, ví dụ
+    `a - b + c` thành `a - (b - c)`.
+    """
+    if end - start == 1:
+        return built[id(terms[start][1])]
+    middle = (start + end) // 2
+    left = _balanced(terms, start, middle, flip, family, built)
+    inverted = terms[middle][0] != flip
+    right = _balanced(terms, middle, end, flip != inverted, family, built)
+    return Node(family[1] if inverted else family[0], left=left, right=right)
+
+
+def _build_chain(family: Tuple[str, str], terms: List[Term], built: Dict[int, Node]) -> Node:
+    """Dựng lại một chuỗi đã tách thành cây cân bằng."""
+    if family is _MULTIPLICATIVE and any(inverted for inverted, _ in terms):
+        # Grouping as `(a * b) : (2 * 3)` keeps every non-literal operand out of a
+        # divisor position; the divisors are literals, so moving them is harmless.
+        factors = [term for term in terms if not term[0]]
+        divisors = [(False, term) for inverted, term in terms if inverted]
+        return Node(
+            ":",
+            left=_balanced(factors, 0, len(factors), False, family, built),
+            right=_balanced(divisors, 0, len(divisors), False, family, built),
+        )
+    return _balanced(terms, 0, len(terms), False, family, built)
+
+
+def rebalance_tree(tree: ExpressionTree, exact: bool = True) -> RebalanceResult:
+    """Trả về cây mới với các chuỗi `+`/`-` và `*`/`:` được cân bằng; cây gốc không đổi.
+
+    - `exact=True`: chỉ nhóm lại khi chứng minh được kết quả giống hệt từng bit
+      (mọi toán hạng là số nguyên và các tổng/tích trung gian không vượt 2^53).
+    - `exact=False`: nhóm lại mọi chuỗi `+`/`-`/`*`; kết quả số thực có thể lệch
+      ở bit cuối do làm tròn. Phép `:` chỉ được nhóm khi số chia là hằng khác 0.
+
+    Thứ tự toán hạng (và do đó thứ tự lỗi khi tính) luôn được giữ nguyên.
+    """
+    root = tree.root_view
+    # A planned node maps to its chain, or None to be copied as is (leaves,
+    # other operators, and the inner nodes of chains that cannot be regrouped
+    # so that they are not collected again one level down).
+    plans: Dict[int, Optional[Chain]] = {}
+    built: Dict[int, Node] = {}
+    chains = 0
+    stack: List[Tuple[Node, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in built:
+            continue
+        if node.is_leaf():
+            built[id(node)] = Node(node.value)
+            continue
+        if id(node) not in plans:
+            plan, internal = _plan_chain(node, exact)
+            if plan is None:
+                for inner in internal:
+                    plans.setdefault(id(inner), None)
+            plans[id(node)] = plan
+        plan = plans[id(node)]
+        if not expanded:
+            stack.append((node, True))
+            children = [node.left, node.right] if plan is None else [term for _, term in plan[1]]
+            stack.extend((child, False) for child in reversed(children))
+        elif plan is None:
+            built[id(node)] = Node(node.value, left=built[id(node.left)], right=built[id(node.right)])
+        else:
+            built[id(node)] = _build_chain(*plan, built)
+            chains += 1
+
+    balanced = ExpressionTree(root=built[id(root)], expression=tree.expression)
+    return RebalanceResult(
+        tree=balanced,
+        depth_before=tree_depth(root),
+        depth_after=tree_depth(balanced.root),
+        chains=chains,
+    )
@@ -0,0 +1,281 @@
+"""Định dạng nhị phân có phiên bản cho cây biểu thức (không dùng pickle) và file catalog nhiều cây mmap được.
+
+Bản ghi một cây (little-endian, mỗi phần bắt đầu ở biên 8 byte):
+
+    header   `<4sHHIIIIII`: magic `MADT`, phiên bản, cờ, số nút, số lá, số phần
+             tử bể hằng, số byte văn bản của bể, độ dài biểu thức gốc, max_stack
+    ops      1 byte/nút theo thứ tự hậu tự (opcode của `src.compiler`, 0 = lá)
+    leaves   u32/lá: chỉ số trong bể hằng của từng lá, theo thứ tự hậu tự
+    values   f64/phần tử bể: giá trị số đã parse (NaN với tên biến)
+    offsets  u32 * (số phần tử + 1): vị trí văn bản từng phần tử trong `text`
+    text     UTF-8 của các token trong bể, rồi UTF-8 của biểu thức gốc
+
+Catalog: header `<4sHHQQ` (magic `MADC`, phiên bản, dự phòng, số cây, vị trí
+bảng chỉ mục), các bản ghi nối tiếp, rồi bảng chỉ mục `(offset, length)` u64.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from array import array
+from typing import BinaryIO, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .compiler import OP_CONST, Program, run_program
+from .evaluator import _coerce
+from .expression_tree import OPERATORS, ExpressionTree, is_identifier
+from .flat_tree import FlatTree
+
+FORMAT_VERSION = 1
+TREE_MAGIC = b"MADT"
+CATALOG_MAGIC = b"MADC"
+
+_TREE_HEADER = struct.Struct("<4sHHIIIIII")
+_CATALOG_HEADER = struct.Struct("<4sHHQQ")
+_INDEX_ENTRY = struct.Struct("<QQ")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def _pad(size: int) -> int:
+    """Làm tròn lên bội số của 8 để các mảng số được căn lề."""
+    return (size + 7) & ~7
+
+
+def _native(values: array) -> array:
+    """Đổi thứ tự byte của mảng sang little-endian nếu máy chạy big-endian."""
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        values.byteswap()
+    return values
+
+
+def _unpack(typecode: str, data: memoryview) -> array:
+    """Đọc một mảng little-endian từ vùng bộ đệm."""
+    values = array(typecode)
+    values.frombytes(data)
+    return _native(values)
+
+
+def dumps(tree: ExpressionTree) -> bytes:
+    """Mã hóa cây thành một bản ghi nhị phân."""
+    program = tree.compile()
+    tokens = [token for token in tree.iter_postorder() if token not in OPERATORS]
+    pool: dict = {}
+    refs = array("I", (pool.setdefault(token, len(pool)) for token in tokens))
+    values = array("d", (float("nan") if is_identifier(token) else _coerce(token) for token in pool))
+    encoded = [token.encode("utf-8") for token in pool]
+    offsets = array("I", [0])
+    for chunk in encoded:
+        offsets.append(offsets[-1] + len(chunk))
+    expression = tree.expression.encode("utf-8")
+    parts = [
+        _TREE_HEADER.pack(
+            TREE_MAGIC,
+            FORMAT_VERSION,
+            0,
+            len(program.code),
+            len(refs),
+            len(pool),
+            offsets[-1],
+            len(expression),
+            program.max_stack,
+        ),
+        program.code.tobytes(),
+        _native(refs).tobytes(),
+        _native(values).tobytes(),
+        _native(offsets).tobytes(),
+        b"".join(encoded) + expression,
+    ]
+    out = bytearray()
+    for part in parts:
+        out += part
+        out += bytes(_pad(len(out)) - len(out))
+    return bytes(out)
+
+
+class _Record:
+    """Các phần của một bản ghi, đọc trực tiếp trên bộ đệm (bytes hoặc mmap) mà không sao chép."""
+
+    __slots__ = ("ops", "refs", "values", "offsets", "text", "expression_start", "expression_length", "max_stack")
+
+    def __init__(self, buffer: Buffer) -> None:
+        view = memoryview(buffer)
+        if len(view) < _TREE_HEADER.size:
+            raise ValueError("Truncated expression tree record.")
+        magic, version, _, nodes, leaves, pool, text_size, expression_size, max_stack = _TREE_HEADER.unpack_from(view)
+        if magic != TREE_MAGIC:
+            raise ValueError("Not an expression tree record.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported expression tree format version {version}.")
+        position = _pad(_TREE_HEADER.size)
+        sections = []
+        for size in (nodes, leaves * 4, pool * 8, (pool + 1) * 4, text_size + expression_size):
+            sections.append(view[position:position + size])
+            position = _pad(position + size)
+        if position > _pad(len(view)):
+            raise ValueError("Truncated expression tree record.")
+        self.ops = sections[0]
+        self.refs = _unpack("I", sections[1])
+        self.values = _unpack("d", sections[2])
+        self.offsets = _unpack("I", sections[3])
+        self.text = sections[4]
+        self.expression_start = text_size
+        self.expression_length = expression_size
+        self.max_stack = max_stack
+
+    def expression(self) -> str:
+        """Biểu thức infix gốc."""
+        start = self.expression_start
+        return str(self.text[start:start + self.expression_length], "utf-8")
+
+    def tokens(self) -> List[str]:
+        """Văn bản các phần tử trong bể hằng."""
+        offsets = self.offsets
+        text = self.text
+        return [str(text[offsets[i]:offsets[i + 1]], "utf-8") for i in range(len(offsets) - 1)]
+
+    def program(self) -> Program:
+        """Dựng `Program` trực tiếp từ bảng nút và bể hằng, không tạo nút nào."""
+        values = self.values
+        constants = tuple(values[ref] for ref in self.refs)
+        slots: Tuple[Tuple[int, str], ...] = ()
+        if any(value != value for value in values):  # NaN marks a variable
+            names = self.tokens()
+            slots = tuple((position, names[ref]) for position, ref in enumerate(self.refs) if values[ref] != values[ref])
+        return Program(code=_unpack("B", self.ops), constants=constants, max_stack=self.max_stack, slots=slots)
+
+    def flat_tree(self) -> FlatTree:
+        """Dựng lại cây dạng mảng (chỉ số con tính lại bằng ngăn xếp)."""
+        ops = _unpack("B", self.ops)
+        count = len(ops)
+        leaf = array("i", [-1]) * count
+        left = array("i", [-1]) * count
+        right = array("i", [-1]) * count
+        refs = iter(self.refs)
+        stack: List[int] = []
+        for index, op in enumerate(ops):
+            if op == OP_CONST:
+                leaf[index] = next(refs)
+            else:
+                right[index] = stack.pop()
+                left[index] = stack.pop()
+            stack.append(index)
+        return FlatTree(ops, leaf, left, right, self.tokens())
+
+
+def loads(data: Buffer) -> ExpressionTree:
+    """Giải mã một bản ghi thành `ExpressionTree` lưu dạng mảng, kèm sẵn chương trình đã biên dịch."""
+    record = _Record(data)
+    tree = ExpressionTree(root=None, expression=record.expression(), flat=record.flat_tree())
+    tree._program = record.program()
+    return tree
+
+
+def dump(tree: ExpressionTree, stream: BinaryIO) -> int:
+    """Ghi bản ghi của `tree` vào file nhị phân; trả về số byte đã ghi."""
+    return stream.write(dumps(tree))
+
+
+def load(stream: BinaryIO) -> ExpressionTree:
+    """Đọc một bản ghi từ file nhị phân (toàn bộ phần còn lại của file)."""
+    return loads(stream.read())
+
+
+def write_catalog(path: str, items: Iterable[Union[ExpressionTree, str]]) -> int:
+    """Ghi nhiều cây (hoặc biểu thức infix) vào một file catalog; trả về số cây."""
+    index = array("Q")
+    with open(path, "wb") as handle:
+        handle.write(bytes(_CATALOG_HEADER.size))
+        position = _CATALOG_HEADER.size
+        for item in items:
+            tree = ExpressionTree.from_infix(item, compact=True) if isinstance(item, str) else item
+            record = dumps(tree)
+            handle.write(record)
+            index.extend((position, len(record)))
+            position += len(record)
+        handle.write(_native(index).tobytes())
+        handle.seek(0)
+        handle.write(_CATALOG_HEADER.pack(CATALOG_MAGIC, FORMAT_VERSION, 0, len(index) // 2, position))
+    return len(index) // 2
+
+
+class Catalog:
+    """File catalog mở bằng mmap: đọc cây thứ N mà không giải mã các cây khác.
+
+    Dùng như context manager; `program(n)`/`evaluate(n)` chỉ đọc bản ghi thứ
+    `n`, còn `catalog[n]` dựng lại cả `ExpressionTree`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._handle = open(path, "rb")
+        try:
+            try:
+                self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise ValueError("Truncated expression catalog.") from None
+            try:
+                self._count, self._index_offset = self._read_header()
+            except BaseException:
+                self._map.close()
+                raise
+        except BaseException:
+            self._handle.close()
+            raise
+
+    def _read_header(self) -> Tuple[int, int]:
+        """Kiểm tra phần đầu file và bảng chỉ mục, trả về (số cây, vị trí bảng chỉ mục)."""
+        if len(self._map) < _CATALOG_HEADER.size:
+            raise ValueError("Truncated expression catalog.")
+        magic, version, _, count, index_offset = _CATALOG_HEADER.unpack_from(self._map)
+        if magic != CATALOG_MAGIC:
+            raise ValueError("Not an expression catalog.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported expression catalog format version {version}.")
+        if index_offset + count * _INDEX_ENTRY.size > len(self._map):
+            raise ValueError("Truncated expression catalog.")
+        return count, index_offset
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Đóng mmap và file."""
+        self._map.close()
+        self._handle.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, number: int) -> _Record:
+        """Bản ghi thứ `number`, tìm qua bảng chỉ mục."""
+        if number < 0:
+            number += self._count
+        if not 0 <= number < self._count:
+            raise IndexError("Catalog index out of range.")
+        offset, length = _INDEX_ENTRY.unpack_from(self._map, self._index_offset + number * _INDEX_ENTRY.size)
+        return _Record(memoryview(self._map)[offset:offset + length])
+
+    def __getitem__(self, number: int) -> ExpressionTree:
+        record = self._record(number)
+        tree = ExpressionTree(root=None, expression=record.expression(), flat=record.flat_tree())
+        tree._program = record.program()
+        return tree
+
+    def __iter__(self) -> Iterator[ExpressionTree]:
+        for number in range(self._count):
+            yield self[number]
+
+    def expression(self, number: int) -> str:
+        """Biểu thức infix gốc của cây thứ `number`."""
+        return self._record(number).expression()
+
+    def program(self, number: int) -> Program:
+        """Chương trình đã biên dịch của cây thứ `number`."""
+        return self._record(number).program()
+
+    def evaluate(self, number: int, variables: Optional[Mapping[str, float]] = None) -> float:
+        """Tính cây thứ `number` trực tiếp từ bảng nút."""
+        return run_program(self.program(number), variables)
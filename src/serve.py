@@ -0,0 +1,292 @@
+"""Dịch vụ tính biểu thức cục bộ bằng asyncio: giao thức JSON theo dòng, gom yêu cầu thành lô nhỏ.
+
+Chạy:
+    python -m src.serve --port 8765
+    python -m src.serve --unix /tmp/mad.sock --workers 4
+
+Mỗi dòng yêu cầu là một object JSON `{"id": ..., "expression": "...", "variables": {...}}`
+(`id` và `variables` không bắt buộc). Mỗi dòng trả lời có dạng `{"id": ..., "value": ...}`
+hoặc `{"id": ..., "error": "..."}`, theo đúng thứ tự yêu cầu trên từng kết nối.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .budget import DEFAULT_BUDGET
+from .expression_tree import build_expression_tree
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_BATCH_DELAY = 0.002
+DEFAULT_MAX_IN_FLIGHT = 1024
+DEFAULT_MAX_LINE = 1 << 20
+
+Request = Tuple[str, Optional[Dict[str, float]]]
+Response = Dict[str, Any]
+
+
+def evaluate_batch(requests: List[Request]) -> List[Response]:
+    """Tính một lô biểu thức trong tiến trình worker (bộ nhớ đệm phân tích của worker được dùng lại)."""
+    results: List[Response] = []
+    for expression, variables in requests:
+        try:
+            value = build_expression_tree(expression).compile().evaluate(variables, budget=DEFAULT_BUDGET)
+        except (ValueError, TypeError, ArithmeticError) as exc:
+            results.append({"error": f"{type(exc).__name__}: {exc}"})
+            continue
+        if isinstance(value, complex):
+            results.append({"error": "ValueError: Result is a complex number."})
+        elif not math.isfinite(value):
+            results.append({"error": "ValueError: Result is not a finite number."})
+        else:
+            results.append({"value": value})
+    return results
+
+
+def _parse_request(line: bytes) -> Tuple[Any, Optional[Request], Optional[str]]:
+    """Đọc một dòng yêu cầu; trả về (id, yêu cầu, thông báo lỗi)."""
+    try:
+        message = json.loads(line)
+    except ValueError as exc:
+        return None, None, f"ValueError: Invalid JSON: {exc}"
+    if not isinstance(message, dict) or not isinstance(message.get("expression"), str):
+        return None, None, "ValueError: Request must be an object with a string 'expression'."
+    variables = message.get("variables")
+    if variables is not None and not isinstance(variables, dict):
+        return message.get("id"), None, "ValueError: 'variables' must be an object."
+    if variables and not all(type(value) in (int, float) for value in variables.values()):
+        return message.get("id"), None, "ValueError: 'variables' values must be numbers."
+    return message.get("id"), (message["expression"], variables), None
+
+
+async def _read_line(reader: asyncio.StreamReader) -> Tuple[bytes, bool]:
+    """Đọc một dòng; trả về (dòng, dòng có vượt giới hạn của reader hay không).
+
+    Dòng quá dài bị bỏ qua tới hết ký tự xuống dòng để yêu cầu sau vẫn đọc đúng.
+    """
+    try:
+        return await reader.readuntil(b"\n"), False
+    except asyncio.IncompleteReadError as exc:
+        return exc.partial, False
+    except asyncio.LimitOverrunError as exc:
+        consumed = exc.consumed
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return b"", True
+        except asyncio.IncompleteReadError:
+            return b"", True
+        except asyncio.LimitOverrunError as exc:
+            consumed = exc.consumed
+
+
+class EvaluationServer:
+    """Máy chủ asyncio gom các yêu cầu đồng thời thành lô và đẩy phần tính toán sang pool.
+
+    - `workers`: số tiến trình worker (None = số CPU, 0 = một luồng trong tiến
+      trình hiện tại, tiện cho kiểm thử).
+    - `batch_size`/`batch_delay`: lô tối đa bao nhiêu yêu cầu và chờ thêm bao
+      lâu (giây) sau yêu cầu đầu tiên để gom lô.
+    - `max_in_flight`: số yêu cầu tối đa đang xử lý hoặc chờ gửi trả; khi đạt
+      ngưỡng, máy chủ ngừng đọc từ kết nối (backpressure qua TCP).
+    - `max_line`: độ dài tối đa (byte) của một dòng yêu cầu; dòng dài hơn nhận
+      về câu trả lời lỗi.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_delay: float = DEFAULT_BATCH_DELAY,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_line: int = DEFAULT_MAX_LINE,
+    ) -> None:
+        self.workers = workers
+        self.executor: Executor = self._new_executor()
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_line = max_line
+        self.requests = 0
+        self.batches = 0
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._queue: "asyncio.Queue[Tuple[Request, Any, asyncio.Future]]" = asyncio.Queue()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(
+        self,
+        host: Optional[str] = "127.0.0.1",
+        port: Optional[int] = 0,
+        path: Optional[str] = None,
+    ) -> asyncio.AbstractServer:
+        """Mở cổng TCP (hoặc Unix socket nếu có `path`) và chạy bộ gom lô."""
+        self._spawn(self._batcher())
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=path, limit=self.max_line)
+        return await asyncio.start_server(self.handle_connection, host=host, port=port, limit=self.max_line)
+
+    def close(self) -> None:
+        """Dừng các tác vụ nền và pool worker."""
+        for task in self._tasks:
+            task.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _new_executor(self) -> Executor:
+        """Pool worker mới theo `workers`."""
+        return ThreadPoolExecutor(1) if self.workers == 0 else ProcessPoolExecutor(self.workers)
+
+    def _replace_executor(self, broken: Executor) -> None:
+        """Thay pool đã hỏng (một worker chết) bằng pool mới, trừ khi lô khác đã thay rồi."""
+        if self.executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._new_executor()
+
+    def _spawn(self, coroutine: Any) -> None:
+        """Tạo tác vụ nền và giữ tham chiếu tới khi nó kết thúc."""
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Đọc yêu cầu theo dòng (cho phép gửi liên tục không chờ) và trả lời theo đúng thứ tự."""
+        loop = asyncio.get_running_loop()
+        pending: "asyncio.Queue[Optional[asyncio.Future]]" = asyncio.Queue()
+        sender = asyncio.ensure_future(self._send(pending, writer))
+        try:
+            while True:
+                line, overrun = await _read_line(reader)
+                if not line and not overrun:
+                    break
+                if not line.strip() and not overrun:
+                    continue
+                await self._slots.acquire()
+                future = loop.create_future()
+                if overrun:
+                    request_id, request, error = None, None, f"ValueError: Request line exceeds {self.max_line} bytes."
+                else:
+                    request_id, request, error = _parse_request(line)
+                if request is None:
+                    future.set_result({"id": request_id, "error": error})
+                else:
+                    self._queue.put_nowait((request, request_id, future))
+                await pending.put(future)
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            # Server shutting down. Not re-raised: start_server's done-callback
+            # would log every cancelled handler as an unhandled exception.
+            sender.cancel()
+            writer.close()
+            return
+        await pending.put(None)
+        await sender
+        writer.close()
+
+    async def _send(self, pending: "asyncio.Queue[Optional[asyncio.Future]]", writer: asyncio.StreamWriter) -> None:
+        """Ghi lần lượt các câu trả lời; chỗ trống in-flight chỉ được trả sau khi đã ghi."""
+        while True:
+            future = await pending.get()
+            if future is None:
+                return
+            response = await future
+            self._slots.release()
+            try:
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+            except ConnectionError:
+                continue  # client went away; keep releasing slots for the remaining futures
+
+    async def _batcher(self) -> None:
+        """Gom các yêu cầu tới gần nhau thành lô rồi gửi sang pool mà không chờ lô trước xong."""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            if queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            self._spawn(self._dispatch(batch))
+
+    async def _evaluate(self, requests: List[Request]) -> List[Response]:
+        """Chạy `evaluate_batch` trong pool; pool hỏng được thay mới và lô được thử lại một lần."""
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, evaluate_batch, requests)
+        except BrokenProcessPool:
+            # Later batches get a working pool; a batch that breaks it twice fails alone.
+            self._replace_executor(executor)
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, evaluate_batch, requests)
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            raise
+
+    async def _dispatch(self, batch: List[Tuple[Request, Any, asyncio.Future]]) -> None:
+        """Tính một lô trong pool và trả kết quả cho từng yêu cầu."""
+        self.batches += 1
+        self.requests += len(batch)
+        try:
+            results = await self._evaluate([request for request, _, _ in batch])
+        except Exception as exc:  # a crashed worker must not leave clients waiting forever
+            results = [{"error": f"{type(exc).__name__}: {exc}"}] * len(batch)
+        for (_, request_id, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result({"id": request_id, **result})
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Chạy máy chủ tới khi bị ngắt."""
+    server = EvaluationServer(
+        workers=args.workers,
+        batch_size=args.batch_size,
+        batch_delay=args.batch_delay,
+        max_in_flight=args.max_in_flight,
+        max_line=args.max_line,
+    )
+    listener = await server.start(host=args.host, port=args.port, path=args.unix)
+    addresses = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Listening on {addresses}", file=sys.stderr, flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Tham số dòng lệnh của máy chủ."""
+    parser = argparse.ArgumentParser(description="Serve expression evaluation over line-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (0 picks a free one).")
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket instead of TCP.")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count, 0: in-process thread).")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--batch-delay", type=float, default=DEFAULT_BATCH_DELAY, help="Seconds to wait to fill a batch.")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT)
+    parser.add_argument("--max-line", type=int, default=DEFAULT_MAX_LINE, help="Longest request line in bytes.")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1 or args.max_in_flight < 1 or args.max_line < 1:
+        parser.error("--batch-size, --max-in-flight and --max-line must be at least 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Điểm vào `python -m src.serve`."""
+    args = parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
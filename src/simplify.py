@@ -0,0 +1,128 @@
+"""Tối ưu cây biểu thức: gộp hằng số và áp dụng các đồng nhất thức an toàn."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .evaluator import _apply_operator
+from .expression_tree import ExpressionTree, Node, is_identifier
+
+
+@dataclass(frozen=True)
+class SimplifyResult:
+    """Cây sau khi rút gọn cùng số nút trước và sau."""
+
+    tree: ExpressionTree
+    nodes_before: int
+    nodes_after: int
+
+    @property
+    def removed(self) -> int:
+        """Số nút đã bị loại bỏ."""
+        return self.nodes_before - self.nodes_after
+
+
+def format_number(value: float) -> str:
+    """Biểu diễn số thực thành token toán hạng (số nguyên không kèm `.0`)."""
+    if value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return repr(value)
+
+
+def _constant(node: Node) -> Optional[float]:
+    """Trả về giá trị số nếu nút là lá hằng số, ngược lại trả về None."""
+    if node.is_leaf() and not is_identifier(node.value):
+        return float(node.value)
+    return None
+
+
+def _fold(op: str, left: float, right: float) -> Optional[float]:
+    """Tính trước phép toán hằng số; trả về None nếu lúc chạy phép toán sẽ ném lỗi."""
+    try:
+        value = _apply_operator(op, left, right)
+    except ArithmeticError:
+        return None
+    if not isinstance(value, float) or not math.isfinite(value):
+        return None  # complex powers, inf and nan keep their runtime behaviour
+    return value
+
+
+def _simplify_node(node: Node, left: Node, right: Node, left_raises: bool, right_raises: bool) -> Tuple[Node, bool]:
+    """Rút gọn một nút toán tử có hai con đã được rút gọn.
+
+    Trả về (nút mới, cờ "có thể ném lỗi lúc tính"). Một cây con chỉ được bỏ đi
+    khi nó không thể ném lỗi, nhờ vậy phép `:` có số chia có thể bằng 0 (và phép
+    `^` có thể tràn số) luôn được giữ lại.
+    """
+    op = node.value
+    left_value = _constant(left)
+    right_value = _constant(right)
+    if left_value is not None and right_value is not None:
+        folded = _fold(op, left_value, right_value)
+        if folded is not None:
+            return Node(format_number(folded)), False
+        # Folding raised or gave a complex or non-finite value: keep the node and let it fail at runtime.
+        return Node(op, left=left, right=right), True
+
+    if op == "+":
+        if right_value == 0:
+            return left, left_raises
+        if left_value == 0:
+            return right, right_raises
+    elif op == "-":
+        if right_value == 0:
+            return left, left_raises
+    elif op == "*":
+        if right_value == 1:
+            return left, left_raises
+        if left_value == 1:
+            return right, right_raises
+        # Assumes finite operands: 0 * inf and 0 * nan are not 0.
+        if (left_value == 0 and not right_raises) or (right_value == 0 and not left_raises):
+            return Node("0"), False
+    elif op == ":":
+        if right_value == 1:
+            return left, left_raises
+    elif op == "^":
+        if right_value == 1:
+            return left, left_raises
+        if right_value == 0 and not left_raises:
+            return Node("1"), False
+
+    raises = left_raises or right_raises
+    if op == ":":
+        raises = raises or not right_value  # divisor unknown (None) or zero
+    elif op == "^":
+        raises = raises or right_value is None or left_value is None
+    return Node(op, left=left, right=right), raises
+
+
+def simplify_tree(tree: ExpressionTree) -> SimplifyResult:
+    """Trả về cây mới đã gộp hằng số và bỏ các phần tử trung hòa; cây gốc không đổi."""
+    # Iterative post-order keyed by identity so shared (DAG) subtrees stay shared.
+    results: Dict[int, Tuple[Node, bool]] = {}
+    stack: List[Tuple[Node, bool]] = [(tree.root_view, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in results:
+            continue
+        if node.is_leaf():
+            results[id(node)] = (Node(node.value), False)
+            continue
+        if not expanded:
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+            continue
+        left, left_raises = results[id(node.left)]
+        right, right_raises = results[id(node.right)]
+        results[id(node)] = _simplify_node(node, left, right, left_raises, right_raises)
+
+    simplified = ExpressionTree(root=results[id(tree.root_view)][0], expression=tree.expression)
+    return SimplifyResult(
+        tree=simplified,
+        nodes_before=len(tree.postorder()),
+        nodes_after=len(simplified.postorder()),
+    )
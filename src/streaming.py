@@ -0,0 +1,243 @@
+"""Đường ống một lượt: đọc token theo khối, dựng cây infix hoặc tính prefix/postfix mà không giữ toàn bộ đầu vào."""
+
+from __future__ import annotations
+
+import mmap
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, TextIO, Union
+
+from .compiler import _BINARY, OPCODES
+from .evaluator import _coerce
+from .expression_tree import (
+    _INVALID_CHAR,
+    OPERATORS,
+    PRECEDENCE,
+    RIGHT_ASSOCIATIVE,
+    TOKEN_PATTERN,
+    Node,
+)
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Whitespace-separated prefix/postfix input: a string, an in-memory buffer or a file.
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+WordSource = Union[str, Buffer, IO[Any]]
+Word = Union[str, bytes]
+
+# Operator word (text or bytes) -> the same functions `run_program` dispatches to.
+_BINARY_BY_WORD: Dict[Word, Callable[[float, float], float]] = {
+    word: _BINARY[code] for symbol, code in OPCODES.items() for word in (symbol, symbol.encode())
+}
+
+
+def _scan(text: str, base: int) -> List[str]:
+    """Tách token trong `text`; `base` là vị trí của `text` trong toàn bộ đầu vào."""
+    invalid = _INVALID_CHAR.search(text)
+    if invalid:
+        raise ValueError(
+            f"Unsupported character '{invalid.group()}' at offset {base + invalid.start()}."
+        )
+    return TOKEN_PATTERN.findall(text)
+
+
+def iter_tokens(source: Union[str, TextIO], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Sinh token từ chuỗi hoặc file văn bản, đọc file theo từng khối `chunk_size` ký tự.
+
+    Mỗi khối được quét bằng cùng regex với `tokenize`. Toán hạng nằm vắt qua ranh
+    giới hai khối được giữ lại và nối với khối sau, nên bộ nhớ chỉ phụ thuộc vào
+    kích thước khối chứ không vào độ dài đầu vào.
+    """
+    if isinstance(source, str):
+        yield from _scan(source, 0)
+        return
+
+    carry = ""
+    offset = 0
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        text = carry + chunk
+        # Hold back a trailing word so that "12" + "34" is not split in two.
+        cut = len(text)
+        while cut and (text[cut - 1].isalnum() or text[cut - 1] == "_"):
+            cut -= 1
+        yield from _scan(text[:cut], offset)
+        carry = text[cut:]
+        offset += cut
+    if carry:
+        yield from _scan(carry, offset)
+
+
+def _reduce(operators: List[str], operands: List[Node]) -> None:
+    """Lấy toán tử trên đỉnh và hai toán hạng cuối để tạo một nút mới."""
+    op = operators.pop()
+    if len(operands) < 2:
+        raise ValueError("Invalid postfix expression.")
+    right = operands.pop()
+    left = operands.pop()
+    operands.append(Node(op, left=left, right=right))
+
+
+def build_tree_from_tokens(tokens: Iterable[str]) -> Node:
+    """Dựng cây trực tiếp từ token infix bằng shunting-yard, không tạo danh sách postfix.
+
+    Bộ nhớ phụ chỉ gồm hai ngăn xếp toán tử/toán hạng, tỉ lệ với độ sâu lồng nhau.
+    """
+    operators: List[str] = []
+    operands: List[Node] = []
+    for token in tokens:
+        if token == "(":
+            operators.append(token)
+        elif token == ")":
+            while operators and operators[-1] != "(":
+                _reduce(operators, operands)
+            if not operators:
+                raise ValueError("Mismatched parentheses in expression.")
+            operators.pop()  # Drop "("
+        elif token in OPERATORS:
+            token_precedence = PRECEDENCE[token]
+            while operators and operators[-1] != "(":
+                top_precedence = PRECEDENCE[operators[-1]]
+                if top_precedence > token_precedence or (
+                    top_precedence == token_precedence and token not in RIGHT_ASSOCIATIVE
+                ):
+                    _reduce(operators, operands)
+                else:
+                    break
+            operators.append(token)
+        else:
+            operands.append(Node(token))
+
+    while operators:
+        if operators[-1] == "(":
+            raise ValueError("Mismatched parentheses in expression.")
+        _reduce(operators, operands)
+    if len(operands) != 1:
+        raise ValueError("Postfix expression did not reduce to a single tree.")
+    return operands[0]
+
+
+def _slices(buffer: Union[str, Buffer], chunk_size: int) -> Iterator[Any]:
+    """Các khối liên tiếp của chuỗi hoặc bộ đệm (khối `bytearray`/`memoryview` được chép thành `bytes` để từ băm được)."""
+    for start in range(0, len(buffer), chunk_size):
+        chunk = buffer[start:start + chunk_size]
+        yield bytes(chunk) if isinstance(chunk, (bytearray, memoryview)) else chunk
+
+
+def iter_words(source: WordSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Word]:
+    """Sinh các từ phân tách bởi khoảng trắng theo thứ tự, từ chuỗi, bộ đệm (`bytes`, `mmap`) hoặc file.
+
+    Đầu vào được tách theo từng khối `chunk_size` và từ vắt qua ranh giới khối
+    được nối lại, nên không bao giờ có danh sách token đầy đủ.
+    """
+    if isinstance(source, (str, bytes, bytearray, memoryview, mmap.mmap)):
+        chunks: Iterator[Any] = _slices(source, chunk_size)
+    else:
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+
+    carry: Any = None
+    for chunk in chunks:
+        text = chunk if carry is None else carry + chunk
+        words = text.split()
+        carry = words.pop() if words and not text[-1:].isspace() else None
+        yield from words
+    if carry is not None:
+        yield carry
+
+
+def iter_words_reversed(buffer: Buffer, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Sinh các từ của bộ đệm từ cuối về đầu, mỗi lần chỉ sao chép một khối `chunk_size` byte."""
+    end = len(buffer)
+    carry = b""
+    while end > 0:
+        start = max(0, end - chunk_size)
+        block = bytes(buffer[start:end]) + carry
+        words = block.split()
+        first = 0
+        carry = b""
+        if start > 0 and words and not block[:1].isspace():
+            # The first word may continue in the previous block.
+            carry = words[0]
+            first = 1
+        for index in range(len(words) - 1, first - 1, -1):
+            yield words[index]
+        end = start
+
+
+def _number(word: Word) -> float:
+    """Giá trị số của một từ, báo lỗi giống `_coerce`."""
+    try:
+        value = float(word)
+    except ValueError:
+        value = float("nan")
+    if value - value:  # parse errors, and inf/nan written as names, go through `_coerce`
+        return _coerce(word.decode("utf-8", "replace") if isinstance(word, bytes) else word)
+    return value
+
+
+def evaluate_postfix_stream(source: WordSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> float:
+    """Tính biểu thức postfix từ chuỗi, bộ đệm hoặc file mà không tách toàn bộ đầu vào.
+
+    Cùng kết quả và lỗi với `evaluate_postfix_expression`; bộ nhớ chỉ tỉ lệ với
+    độ sâu ngăn xếp (cộng một khối đọc).
+    """
+    stack: List[float] = []
+    push = stack.append
+    pop = stack.pop
+    binary = _BINARY_BY_WORD
+    for word in iter_words(source, chunk_size):
+        function = binary.get(word)
+        if function is None:
+            push(_number(word))
+            continue
+        if len(stack) < 2:
+            raise ValueError("Invalid postfix expression.")
+        right = pop()
+        stack[-1] = function(stack[-1], right)
+    if len(stack) != 1:
+        raise ValueError("Postfix expression reduced to multiple values.")
+    return stack[0]
+
+
+def evaluate_prefix_stream(source: WordSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> float:
+    """Tính biểu thức prefix bằng cách quét ngược bộ đệm, không đảo ngược bản sao danh sách token.
+
+    File có `fileno()` được mmap; chuỗi và file không mmap được (ví dụ
+    `io.StringIO`) thì được đọc vào bộ nhớ trước. Cùng kết quả và lỗi với
+    `evaluate_prefix_expression`.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return _evaluate_reversed(iter_words_reversed(source, chunk_size))
+    if isinstance(source, str):
+        return _evaluate_reversed(iter_words_reversed(source.encode("utf-8"), chunk_size))
+    try:
+        fileno = source.fileno()
+    except (AttributeError, OSError):
+        data = source.read()
+        return evaluate_prefix_stream(data.encode("utf-8") if isinstance(data, str) else data, chunk_size)
+    try:
+        mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except ValueError:  # empty file
+        return _evaluate_reversed(iter(()))
+    with mapped:
+        return _evaluate_reversed(iter_words_reversed(mapped, chunk_size))
+
+
+def _evaluate_reversed(words: Iterator[bytes]) -> float:
+    """Vòng lặp của `evaluate_prefix` trên các từ đã được sinh theo thứ tự ngược."""
+    stack: List[float] = []
+    push = stack.append
+    pop = stack.pop
+    binary = _BINARY_BY_WORD
+    for word in words:
+        function = binary.get(word)
+        if function is None:
+            push(_number(word))
+            continue
+        if len(stack) < 2:
+            raise ValueError("Invalid prefix expression.")
+        left = pop()
+        stack[-1] = function(left, stack[-1])
+    if len(stack) != 1:
+        raise ValueError("Prefix expression reduced to multiple values.")
+    return stack[0]
@@ -0,0 +1,56 @@
+"""Kiểm thử API `evaluate_many` với các kiểu executor."""
+
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from src import EvaluationFailure, evaluate_many
+from src.budget import EvaluationBudget
+
+
+class EvaluateManyTests(unittest.TestCase):
+    """Kết quả giữ thứ tự đầu vào và lỗi được trả về theo từng phần tử."""
+
+    EXPRESSIONS = ["1 + 2", "2 ^ 10", "1 : 0", "(1 + 2", "x * 2", "3 * (4 - 1)"] * 7
+
+    def _check(self, results) -> None:
+        self.assertEqual(len(results), len(self.EXPRESSIONS))
+        for index in range(0, len(results), 6):
+            self.assertEqual(results[index], 3.0)
+            self.assertEqual(results[index + 1], 1024.0)
+            self.assertEqual(results[index + 5], 9.0)
+            failure = results[index + 2]
+            self.assertIsInstance(failure, EvaluationFailure)
+            self.assertEqual((failure.index, failure.expression, failure.error), (index + 2, "1 : 0", "ZeroDivisionError"))
+            self.assertEqual(str(results[index + 3]), "ValueError: Mismatched parentheses in expression.")
+            self.assertIsInstance(results[index + 4], EvaluationFailure)
+
+    def test_executors_agree(self) -> None:
+        """"serial", "thread" và "process" cho cùng kết quả với nhiều cỡ khối."""
+        self._check(evaluate_many(self.EXPRESSIONS))
+        for chunksize in (1, 5, 1000):
+            self._check(evaluate_many(self.EXPRESSIONS, executor="thread", chunksize=chunksize, workers=2))
+        self._check(evaluate_many(self.EXPRESSIONS, executor="process", chunksize=4, workers=2))
+        with ProcessPoolExecutor(1) as pool:
+            self._check(evaluate_many(self.EXPRESSIONS, executor=pool, chunksize=8))
+
+    def test_variables_and_budget(self) -> None:
+        """Biến dùng chung cho cả lô; vượt ngân sách là lỗi của riêng phần tử đó."""
+        results = evaluate_many(["x * 2", "9 ^ 9 ^ 9"], variables={"x": 4.0}, budget=EvaluationBudget(max_power_digits=50))
+        self.assertEqual(results[0], 8.0)
+        self.assertEqual(results[1].error, "BudgetExceededError")
+        with self.assertRaises(ValueError):
+            evaluate_many(["1"], executor="gpu")
+        self.assertEqual(evaluate_many([], executor="thread"), [])
+
+    def test_type_errors_are_per_item(self) -> None:
+        """Biến không phải số hoặc biểu thức không phải chuỗi chỉ làm hỏng phần tử đó."""
+        results = evaluate_many(["x + 1", "1+1"], variables={"x": "a"})
+        self.assertEqual((results[0].index, results[0].error), (0, "TypeError"))
+        self.assertEqual(results[1], 2.0)
+        results = evaluate_many(["2 * 3", None, 7], executor="thread", chunksize=1, workers=2)
+        self.assertEqual(results[0], 6.0)
+        self.assertEqual([results[1].error, results[2].error], ["TypeError", "TypeError"])
+
+
+if __name__ == "__main__":
+    unittest.main()
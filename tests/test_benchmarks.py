@@ -0,0 +1,39 @@
+"""Kiểm thử bộ sinh biểu thức và phép so sánh baseline của bộ benchmark."""
+
+import unittest
+
+from benchmarks.generator import generate_expression
+from benchmarks.suite import compare, run_suite, tree_depth
+from src.expression_tree import build_expression_tree
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    """Bộ sinh phải tất định theo seed và cho đúng hình dạng cây."""
+
+    def test_generator_is_seeded_and_shaped(self) -> None:
+        """Cùng seed cho cùng biểu thức; hình dạng quyết định độ sâu."""
+        self.assertEqual(generate_expression(50, seed=3), generate_expression(50, seed=3))
+        self.assertNotEqual(generate_expression(50, seed=3), generate_expression(50, seed=4))
+        for shape, depth in (("balanced", 7), ("left", 64), ("right", 64)):
+            tree = build_expression_tree(generate_expression(64, shape=shape, operators="+-*"), use_cache=False)
+            self.assertEqual(len(tree.postorder()), 127)
+            self.assertEqual(tree_depth(tree.root), depth)
+
+    def test_generated_expressions_evaluate(self) -> None:
+        """Biểu thức sinh ra với đủ toán tử không bao giờ ném lỗi khi tính."""
+        for seed in range(20):
+            tree = build_expression_tree(generate_expression(40, shape="random", seed=seed), use_cache=False)
+            tree.compile().evaluate()
+
+    def test_compare_flags_regressions(self) -> None:
+        """Giai đoạn chậm hơn ngưỡng được đánh dấu là hồi quy."""
+        report = run_suite(sizes=[5], shapes=["balanced"], repeat=1, stages=["tokenize", "postorder"], min_time=0.001)
+        self.assertEqual({row["stage"] for row in report["results"]}, {"tokenize", "postorder"})
+        baseline = {"results": [dict(row, seconds=row["seconds"] / 2) for row in report["results"]]}
+        rows = compare(report, baseline, threshold=0.5)
+        self.assertTrue(all(row["regression"] for row in rows))
+        self.assertFalse(any(row["regression"] for row in compare(report, report, threshold=0.1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Kiểm thử ngân sách tài nguyên khi tính biểu thức."""
+
+import unittest
+
+from src.budget import DEFAULT_BUDGET, BudgetExceededError, EvaluationBudget
+from src.evaluator import evaluate_postfix, evaluate_prefix
+from src.expression_tree import ExpressionTree
+
+
+class EvaluationBudgetTests(unittest.TestCase):
+    """Mỗi giới hạn ném `BudgetExceededError` ở cả ba đường tính."""
+
+    def _evaluate_all(self, expression: str, budget: EvaluationBudget) -> list:
+        """Tính bằng prefix, postfix và chương trình biên dịch với cùng ngân sách."""
+        tree = ExpressionTree.from_infix(expression)
+        return [
+            evaluate_prefix(tree.preorder(), budget),
+            evaluate_postfix(tree.postorder(), budget),
+            tree.compile().evaluate(budget=budget),
+        ]
+
+    def test_within_budget_matches_unbudgeted(self) -> None:
+        """Biểu thức hợp lệ cho cùng kết quả khi có hoặc không có ngân sách."""
+        strict = EvaluationBudget(max_nodes=50, max_depth=10, max_magnitude=1e6, max_power_digits=10, timeout=1.0)
+        for expression in ("(3^2 + 5) - 4 : 2", "2 ^ 3 ^ 2", "(1 + 2) * (3 + 4)"):
+            expected = ExpressionTree.from_infix(expression).compile().evaluate()
+            self.assertEqual(self._evaluate_all(expression, strict), [expected] * 3)
+
+    def test_power_rejected_before_computing(self) -> None:
+        """`9^9^9` bị từ chối nhờ ước lượng số chữ số thay vì tràn số."""
+        tree = ExpressionTree.from_infix("9^9^9")
+        for evaluate in (
+            lambda: evaluate_prefix(tree.preorder(), DEFAULT_BUDGET),
+            lambda: evaluate_postfix(tree.postorder(), DEFAULT_BUDGET),
+            lambda: tree.compile().evaluate(budget=DEFAULT_BUDGET),
+        ):
+            with self.assertRaises(BudgetExceededError) as context:
+                evaluate()
+            self.assertEqual(context.exception.limit, "power digits")
+
+    def test_limits(self) -> None:
+        """Số nút, độ sâu và độ lớn đều được kiểm tra."""
+        cases = [
+            ("1 + 2 + 3", EvaluationBudget(max_nodes=4), "node count"),
+            ("1 - 2 - 3 - 4", EvaluationBudget(max_depth=3), "depth"),
+            ("1000 * 1000", EvaluationBudget(max_magnitude=1e5), "magnitude"),
+        ]
+        for expression, budget, limit in cases:
+            tree = ExpressionTree.from_infix(expression)
+            for evaluate in (
+                lambda: evaluate_prefix(tree.preorder(), budget),
+                lambda: evaluate_postfix(tree.postorder(), budget),
+                lambda: tree.compile().evaluate(budget=budget),
+            ):
+                with self.subTest(expression=expression), self.assertRaises(BudgetExceededError) as context:
+                    evaluate()
+                self.assertEqual(context.exception.limit, limit)
+
+    def test_timeout(self) -> None:
+        """Hết thời gian trên biểu thức dài báo lỗi `seconds`."""
+        postfix = ["1"] + ["1", "+"] * 5000
+        with self.assertRaises(BudgetExceededError) as context:
+            evaluate_postfix(postfix, EvaluationBudget(timeout=0.0))
+        self.assertEqual(context.exception.limit, "seconds")
+
+    def test_default_budget_magnitude_unbounded(self) -> None:
+        """`DEFAULT_BUDGET` không giới hạn độ lớn: biểu thức ngắn không mũ chạy đường không kiểm tra, tràn số cho `inf`."""
+        self.assertIsNone(DEFAULT_BUDGET.max_magnitude)
+        self.assertTrue(DEFAULT_BUDGET.allows_unchecked(1000, has_power=False))
+        self.assertFalse(DEFAULT_BUDGET.allows_unchecked(1000, has_power=True))
+        self.assertEqual(self._evaluate_all("10 ^ 308 * 10", DEFAULT_BUDGET), [float("inf")] * 3)
+
+    def test_errors_are_value_errors(self) -> None:
+        """Lỗi ngân sách là `ValueError` nên CLI ghi thành bản ghi lỗi như dữ liệu sai."""
+        self.assertTrue(issubclass(BudgetExceededError, ValueError))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Kiểm thử bộ nhớ đệm LRU cho kết quả phân tích biểu thức."""
+
+import threading
+import unittest
+
+from src.cache import ParseCache, normalize_expression
+from src.expression_tree import (
+    PARSE_CACHE,
+    build_expression_tree,
+    configure_parse_cache,
+    parse_cache_stats,
+)
+
+
+class ParseCacheTests(unittest.TestCase):
+    """Bộ đệm phải trả về cây dùng chung, đếm đúng và loại bỏ theo LRU."""
+
+    def setUp(self) -> None:
+        PARSE_CACHE.clear()
+        self.addCleanup(configure_parse_cache, maxsize=PARSE_CACHE.stats().maxsize, enabled=True)
+        self.addCleanup(PARSE_CACHE.clear)
+
+    def test_normalize_expression(self) -> None:
+        """Khoảng trắng quanh ký hiệu bị bỏ, khoảng trắng giữa hai toán hạng được giữ."""
+        self.assertEqual(normalize_expression(" ( 1 +  2 ) * x "), "(1+2)*x")
+        self.assertEqual(normalize_expression("1   2"), "1 2")
+        self.assertNotEqual(normalize_expression("1 2"), normalize_expression("12"))
+
+    def test_hits_share_nodes(self) -> None:
+        """Cách viết khác khoảng trắng trúng đệm và dùng chung `Node`, chương trình."""
+        first = build_expression_tree("(1 + 2) * 3")
+        second = build_expression_tree("(1+2)*3")
+        self.assertTrue(first.is_shared and second.is_shared)
+        self.assertEqual(second.expression, "(1+2)*3")
+        self.assertIs(first.compile(), second.compile())
+        stats = parse_cache_stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 1, 1))
+        self.assertEqual(stats.hit_rate, 0.5)
+
+    def test_copy_is_private(self) -> None:
+        """`copy()` tạo các `Node` riêng nên sửa bản sao không ảnh hưởng cache."""
+        shared = build_expression_tree("1 + 2")
+        private = shared.copy()
+        self.assertFalse(private.is_shared)
+        private.root.left.value = "5"
+        self.assertEqual(build_expression_tree("1 + 2").preorder(), ["+", "1", "2"])
+
+    def test_root_view_does_not_copy(self) -> None:
+        """`root_view` đọc nút dùng chung mà không tách cây khỏi cache."""
+        first = build_expression_tree("1 + 2")
+        second = build_expression_tree("1+2")
+        self.assertIs(second.root_view, first.root_view)
+        self.assertTrue(second.is_shared)
+
+    def test_mutating_cached_tree_copies_nodes(self) -> None:
+        """Sửa nút qua `root` của cây lấy từ cache chỉ đổi cây đó; lần trúng đệm sau vẫn đúng."""
+        build_expression_tree("1 + 2").compile()
+        tree = build_expression_tree("1 + 2")
+        tree.root.left.value = "5"
+        self.assertFalse(tree.is_shared)
+        self.assertEqual(tree.compile().evaluate(), 7.0)
+        self.assertEqual(tree.to_callable()(), 7.0)
+        again = build_expression_tree("1+2")
+        self.assertTrue(again.is_shared)
+        self.assertEqual(again.preorder(), ["+", "1", "2"])
+        self.assertEqual(again.compile().evaluate(), 3.0)
+
+    def test_root_setter_drops_cached_program(self) -> None:
+        """Gán `root` mới cho cây lấy từ cache không trả về chương trình cũ của cache."""
+        tree = build_expression_tree("1 + 2")
+        self.assertEqual(tree.compile().evaluate(), 3.0)
+        tree.root = build_expression_tree("2 * 5", use_cache=False).root
+        self.assertFalse(tree.is_shared)
+        self.assertEqual(tree.compile().evaluate(), 10.0)
+        self.assertEqual(tree.to_callable()(), 10.0)
+        self.assertEqual(build_expression_tree("1 + 2").compile().evaluate(), 3.0)
+
+    def test_lru_eviction_and_opt_out(self) -> None:
+        """Mục ít dùng nhất bị loại; tắt đệm hoặc `use_cache=False` thì luôn phân tích lại."""
+        configure_parse_cache(maxsize=2)
+        build_expression_tree("1")
+        build_expression_tree("2")
+        build_expression_tree("1")
+        build_expression_tree("3")  # evicts "2"
+        stats = parse_cache_stats()
+        self.assertEqual((stats.evictions, stats.size), (1, 2))
+        self.assertFalse(build_expression_tree("1", use_cache=False).is_shared)
+        configure_parse_cache(enabled=False)
+        self.assertFalse(build_expression_tree("1").is_shared)
+        self.assertEqual(parse_cache_stats().hits, 1)
+
+    def test_thread_safety(self) -> None:
+        """Nhiều luồng dùng chung một bộ đệm vẫn giữ bộ đếm nhất quán."""
+        cache: ParseCache[str] = ParseCache(maxsize=8)
+        expressions = [f"{i} + {i}" for i in range(16)]
+
+        def worker() -> None:
+            for _ in range(50):
+                for expression in expressions:
+                    self.assertEqual(cache.get_or_create(expression, lambda e=expression: e.upper()), expression.upper())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        self.assertEqual(stats.hits + stats.misses, 4 * 50 * 16)
+        self.assertEqual(stats.size, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Kiểm thử dạng chuẩn cho toán tử giao hoán và việc gộp biểu thức trùng."""
+
+import math
+import re
+import unittest
+from unittest import mock
+
+from benchmarks.generator import generate_expression
+from src import EvaluationFailure, canonical, evaluate_many
+from src.canonical import canonical_form, deduplicate
+from src.expression_tree import ExpressionTree, build_expression_tree
+
+
+def _key(expression: str, exact: bool = True) -> str:
+    return build_expression_tree(expression).canonical_key(exact)
+
+
+def _with_variables(expression: str) -> str:
+    """Thay các số lẻ bằng biến `x`/`y`/`z` để cây có cả biến lẫn hằng số."""
+    return re.sub(r"\d+", lambda match: "xyz"[int(match.group()) % 3] if int(match.group()) % 2 else match.group(), expression)
+
+
+class CanonicalFormTests(unittest.TestCase):
+    """Công thức chỉ khác thứ tự toán hạng giao hoán có cùng khóa; công thức khác thì không."""
+
+    def test_commutative_operands_share_key(self) -> None:
+        """Đổi chỗ toán hạng của `+`/`*` ở mọi mức lồng nhau không đổi khóa."""
+        self.assertEqual(_key("(1 + 2) * 3"), _key("3 * (2 + 1)"))
+        self.assertEqual(_key("x * y + z ^ 2"), _key("z ^ 2 + y * x"))
+        self.assertEqual(_key("007 + x"), _key("x + 7"))
+        for left, right in (("1 - 2", "2 - 1"), ("1 : 2", "2 : 1"), ("2 ^ 3", "3 ^ 2"), ("x + 1", "x * 1")):
+            self.assertNotEqual(_key(left), _key(right))
+        self.assertNotEqual(_key("1 + 2"), _key("3"))
+
+    def test_exact_flattening(self) -> None:
+        """Chuỗi số nguyên nhỏ luôn được làm phẳng; chuỗi có biến chỉ khi `exact=False`."""
+        self.assertEqual(_key("(1 + 2) + 3"), _key("1 + (3 + 2)"))
+        self.assertEqual(_key("2 * (3 * 4)"), _key("(4 * 3) * 2"))
+        self.assertNotEqual(_key("(x + y) + z"), _key("x + (y + z)"))
+        self.assertEqual(_key("(x + y) + z", exact=False), _key("x + (z + y)", exact=False))
+        self.assertNotEqual(_key("(x + y) * z", exact=False), _key("x + y * z", exact=False))
+        # 2^53 + 1 + 1 is not exact in float64, so the chain stays binary.
+        big = str(2**53)
+        self.assertNotEqual(_key(f"({big} + 1) + 1"), _key(f"{big} + (1 + 1)"))
+
+    def test_canonical_tree_preserves_value(self) -> None:
+        """Cây dạng chuẩn cho cùng giá trị từng bit và biểu thức của nó phân tích lại ra cùng khóa."""
+        variables = {"x": 0.1, "y": 0.7, "z": 3.3}
+        for seed in range(20):
+            expression = _with_variables(generate_expression(24, shape="random", operators="+-*:", seed=seed))
+            tree = build_expression_tree(expression)
+            canonical = tree.canonicalize()
+            try:
+                expected = tree.compile().evaluate(variables)
+            except ZeroDivisionError:
+                with self.assertRaises(ZeroDivisionError):
+                    canonical.compile().evaluate(variables)
+            else:
+                self.assertEqual(canonical.compile().evaluate(variables), expected)
+            self.assertEqual(build_expression_tree(canonical.expression).canonical_key(), tree.canonical_key())
+            self.assertEqual(canonical.canonicalize().expression, canonical.expression)
+
+    def test_nodes_hash_and_compare_structurally(self) -> None:
+        """Nút dạng chuẩn dùng được làm khóa dict/set; nút bằng nhau khi cấu trúc bằng nhau."""
+        first = canonical_form(build_expression_tree("(a + b) * c"))
+        second = canonical_form(ExpressionTree.from_infix("c * (b + a)", compact=True))
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(len({first, second, canonical_form(build_expression_tree("a + b"))}), 2)
+        self.assertIn(canonical_form(build_expression_tree("b + a")), first.operands)
+
+    def test_deep_chain(self) -> None:
+        """Chuỗi 2·10^4 toán hạng được xử lý không đệ quy và làm phẳng một lần."""
+        expression = generate_expression(20_000, shape="left", operators="+", seed=3)
+        tree = ExpressionTree.from_infix(expression)
+        root = canonical_form(tree, exact=False)
+        self.assertEqual((root.value, len(root.operands)), ("+", 20_000))
+        shuffled = ExpressionTree.from_infix(" + ".join(reversed(re.findall(r"\d+", expression))))
+        self.assertEqual(shuffled.canonical_key(exact=False), tree.canonical_key(exact=False))
+        canonical = tree.canonicalize(exact=False)
+        self.assertTrue(math.isclose(canonical.compile().evaluate(), tree.compile().evaluate()))
+
+
+class DeduplicateTests(unittest.TestCase):
+    """Gộp biểu thức tương đương để chỉ tính mỗi nhóm một lần."""
+
+    EXPRESSIONS = ["(1 + 2) * 3", "3 * (2 + 1)", "1 : 0", "(1", "0 : 1", "x + 1", "1 + x", "2 ^ 3"]
+
+    def test_deduplicate(self) -> None:
+        """Mỗi nhóm tương đương giữ biểu thức xuất hiện đầu tiên làm đại diện."""
+        representatives, positions = deduplicate(self.EXPRESSIONS)
+        self.assertEqual(representatives, ["(1 + 2) * 3", "1 : 0", "(1", "0 : 1", "x + 1", "2 ^ 3"])
+        self.assertEqual(positions, [0, 0, 1, 2, 3, 4, 4, 5])
+        unique = evaluate_many(representatives, variables={"x": 0.5})
+        for expected, position in zip(evaluate_many(self.EXPRESSIONS, variables={"x": 0.5}), positions):
+            if isinstance(expected, EvaluationFailure):
+                self.assertEqual(str(unique[position]), str(expected))
+            else:
+                self.assertEqual(unique[position], expected)
+
+    def test_deduplicate_arithmetic_errors_are_per_item(self) -> None:
+        """Lỗi số học khi chuẩn hóa chỉ tách riêng biểu thức đó, không dừng cả lượt gộp."""
+        real_key = canonical.canonical_key
+
+        def failing_key(tree: ExpressionTree, exact: bool = True) -> str:
+            if tree.expression == "2 ^ 3":
+                raise OverflowError("Numerical result out of range")
+            return real_key(tree, exact)
+
+        with mock.patch.object(canonical, "canonical_key", failing_key):
+            representatives, positions = deduplicate(["2 ^ 3", "1 + 2", "2 ^ 3", "2 + 1"])
+        self.assertEqual(representatives, ["2 ^ 3", "1 + 2"])
+        self.assertEqual(positions, [0, 1, 0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Kiểm thử hàm Python sinh từ cây bằng `ExpressionTree.to_callable`."""
+
+import unittest
+
+from benchmarks.generator import generate_expression
+from src.evaluator import evaluate_postfix
+from src.expression_tree import ExpressionTree, build_expression_tree
+
+
+class CodegenTests(unittest.TestCase):
+    """Hàm sinh ra phải cho cùng kết quả và cùng lỗi với `evaluate_postfix`."""
+
+    def test_matches_postfix(self) -> None:
+        """Cây `Node`, cây mảng và cây rất sâu cho cùng giá trị."""
+        for seed in range(40):
+            expression = generate_expression(1 + seed * 3, shape="random", operators="+-*^", seed=seed)
+            expected = evaluate_postfix(ExpressionTree.from_infix(expression).postorder())
+            for compact in (False, True):
+                self.assertEqual(ExpressionTree.from_infix(expression, compact=compact).to_callable()(), expected)
+        deep = generate_expression(5000, shape="left", operators="+-", seed=1)
+        self.assertEqual(ExpressionTree.from_infix(deep).to_callable()(), evaluate_postfix(ExpressionTree.from_infix(deep).postorder()))
+
+    def test_variables_and_zero_divisor(self) -> None:
+        """Biến là tham số theo thứ tự `variables()`; phép `:` vẫn kiểm tra số chia bằng 0."""
+        tree = ExpressionTree.from_infix("(x * 2 + y) * (x - y) + (y : x) * 3")
+        function = tree.to_callable()
+        self.assertEqual(tree.variables(), ["x", "y"])
+        self.assertEqual(function(3.0, 1.5), tree.compile().evaluate({"x": 3.0, "y": 1.5}))
+        self.assertEqual(function(y=1.5, x=3.0), function(3.0, 1.5))
+        with self.assertRaisesRegex(ZeroDivisionError, "Division by zero encountered."):
+            function(0.0, 1.0)
+        with self.assertRaises(ZeroDivisionError):
+            ExpressionTree.from_infix("1 : (2 - 2)").to_callable()()
+
+    def test_negative_constants(self) -> None:
+        """Hằng số âm (sau `set_leaf` hoặc rút gọn) được đặt trong ngoặc trước phép `^`."""
+        tree = ExpressionTree.from_infix("3 ^ 2")
+        tree.set_leaf("L", -3.0)
+        self.assertEqual(tree.to_callable()(), evaluate_postfix(tree.postorder()))
+        self.assertEqual(tree.to_callable()(), 9.0)
+        simplified = ExpressionTree.from_infix("(1 - 2) ^ x").simplify().tree
+        postfix = ["2" if token == "x" else token for token in simplified.postorder()]
+        self.assertEqual(simplified.to_callable()(2.0), evaluate_postfix(postfix))
+        self.assertEqual(simplified.to_callable()(2.0), 1.0)
+
+    def test_awkward_names(self) -> None:
+        """Tên trùng từ khóa hoặc tên nội bộ vẫn dùng được qua tham số vị trí."""
+        tree = ExpressionTree.from_infix("if + _r0 * None - inf")
+        self.assertEqual(tree.to_callable()(1.0, 2.0, 3.0, 4.0), 3.0)
+
+    def test_cached_per_tree(self) -> None:
+        """Hàm được lưu theo cây và bỏ đi khi cây thay đổi."""
+        tree = ExpressionTree.from_infix("1 + 2 * 3")
+        function = tree.to_callable()
+        self.assertIs(tree.to_callable(), function)
+        tree.set_leaf("L", 4)
+        self.assertEqual(tree.to_callable()(), 10.0)
+        self.assertIsNot(tree.to_callable(), function)
+        self.assertIs(build_expression_tree("7 - 2").to_callable(), build_expression_tree("7 - 2").to_callable())
+
+
+if __name__ == "__main__":
+    unittest.main()
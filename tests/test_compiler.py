@@ -0,0 +1,64 @@
+"""Kiểm thử bộ biên dịch bytecode và trình thực thi chương trình."""
+
+import math
+import unittest
+
+from src.compiler import OP_CONST, Program, compile_postfix, max_stack_depth, run_program
+from src.evaluator import evaluate_postfix
+from src.expression_tree import build_expression_tree
+from tests.test_expression_tree import EXPRESSIONS
+
+
+class CompilerTests(unittest.TestCase):
+    """Chương trình biên dịch phải cho cùng kết quả với `evaluate_postfix`."""
+
+    def test_compiled_matches_postfix_evaluation(self) -> None:
+        """Kết quả chạy bytecode trùng với kết quả duyệt postfix."""
+        for expression, expected in EXPRESSIONS:
+            tree = build_expression_tree(expression)
+            program = tree.compile()
+            self.assertEqual(run_program(program), evaluate_postfix(tree.postorder()))
+            self.assertTrue(math.isclose(program.evaluate(), expected))
+
+    def test_program_layout(self) -> None:
+        """Hằng số được parse sẵn theo thứ tự xuất hiện và chương trình được lưu lại."""
+        tree = build_expression_tree("(3^2 + 5) - 4 : 2")
+        program = tree.compile()
+        self.assertIs(tree.compile(), program)
+        self.assertEqual(program.constants, (3.0, 2.0, 5.0, 4.0, 2.0))
+        self.assertEqual(sum(1 for op in program.code if op == OP_CONST), 5)
+        self.assertEqual(program.max_stack, 3)
+
+    def test_program_from_code(self) -> None:
+        """`Program.from_code` dựng lại chương trình từ opcode và giá trị lá, tính lại `max_stack`."""
+        for expression, _ in EXPRESSIONS:
+            program = build_expression_tree(expression).compile()
+            rebuilt = Program.from_code(program.code.tobytes(), program.constants)
+            self.assertEqual(rebuilt.max_stack, program.max_stack)
+            self.assertEqual(run_program(rebuilt), run_program(program))
+        self.assertEqual(max_stack_depth(b""), 0)
+
+    def test_zero_division(self) -> None:
+        """Chia cho 0 phải ném `ZeroDivisionError` giống evaluator gốc."""
+        program = build_expression_tree("(1 + 2 * 3) : (4 - 5 - 6 +7)").compile()
+        with self.assertRaisesRegex(ZeroDivisionError, "Division by zero encountered."):
+            run_program(program)
+
+    def test_invalid_postfix(self) -> None:
+        """Postfix thiếu toán hạng bị từ chối ngay khi biên dịch."""
+        with self.assertRaises(ValueError):
+            compile_postfix(["1", "+"])
+        with self.assertRaises(ValueError):
+            compile_postfix(["1", "2"])
+
+    def test_variables(self) -> None:
+        """Biến được thay giá trị lúc chạy; thiếu biến thì báo lỗi."""
+        program = build_expression_tree("price * qty - price").compile()
+        self.assertEqual(program.variables, ("price", "qty"))
+        self.assertEqual(program.evaluate({"price": 2.5, "qty": 4}), 7.5)
+        with self.assertRaisesRegex(ValueError, "qty"):
+            program.evaluate({"price": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
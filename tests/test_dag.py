@@ -0,0 +1,52 @@
+"""Kiểm thử biểu diễn DAG dựng bằng hash-consing."""
+
+import unittest
+
+from src.dag import build_dag_from_postfix, dag_stats, evaluate_dag
+from src.evaluator import evaluate_postfix
+from src.expression_tree import ExpressionTree
+from tests.test_expression_tree import EXPRESSIONS
+
+
+class DagTests(unittest.TestCase):
+    """DAG phải cho cùng kết quả duyệt/tính toán với cây nhưng ít nút hơn."""
+
+    def test_traversals_and_values_match_tree(self) -> None:
+        """Duyệt và tính trên DAG giống hệt trên cây thường."""
+        for expression, _ in EXPRESSIONS + [("(1 + 2) * (3 + 4) + (1 + 2) * (3 + 4)", 42)]:
+            tree = ExpressionTree.from_infix(expression)
+            dag = ExpressionTree.from_infix(expression, share_subtrees=True)
+            self.assertEqual(dag.preorder(), tree.preorder())
+            self.assertEqual(dag.postorder(), tree.postorder())
+            self.assertEqual(dag.inorder(), tree.inorder())
+            self.assertEqual(list(dag.iter_postorder()), tree.postorder())
+            self.assertEqual(evaluate_dag(dag.root), evaluate_postfix(tree.postorder()))
+
+    def test_node_reduction(self) -> None:
+        """Biểu thức con lặp lại chỉ được lưu một lần."""
+        dag = ExpressionTree.from_infix("(1 + 2) * (3 + 4) + (1 + 2) * (3 + 4)", share_subtrees=True)
+        self.assertIs(dag.root.left, dag.root.right)
+        stats = dag_stats(dag.root)
+        self.assertEqual(stats.tree_nodes, 15)
+        self.assertEqual(stats.unique_nodes, 8)
+        self.assertAlmostEqual(stats.reduction, 7 / 15)
+
+    def test_shared_table_and_variables(self) -> None:
+        """Bảng intern dùng chung giữa nhiều biểu thức; biến được thay khi tính."""
+        table = {}
+        first = build_dag_from_postfix(["x", "1", "+"], table)
+        second = build_dag_from_postfix(["x", "1", "+", "2", "*"], table)
+        self.assertIs(second.left, first)
+        self.assertEqual(evaluate_dag(second, {"x": 4}), 10)
+        with self.assertRaises(ValueError):
+            evaluate_dag(second)
+
+    def test_zero_division(self) -> None:
+        """Chia cho 0 vẫn ném `ZeroDivisionError`."""
+        dag = ExpressionTree.from_infix("(1 + 2 * 3) : (4 - 5 - 6 +7)", share_subtrees=True)
+        with self.assertRaises(ZeroDivisionError):
+            evaluate_dag(dag.root)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""Kiểm thử bộ nhớ đệm bền vững trên đĩa và các cờ `--cache-file`/`--cache-stats` của CLI."""
+
+import io
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from multiprocessing import Pool
+
+from src.disk_cache import DiskCache, cache_key, shared_cache
+from src.expression_tree import build_expression_tree
+from src.main import main
+
+
+def _fill(path: str, start: int) -> int:
+    """Ghi 50 biểu thức từ một tiến trình con, rồi đọc lại chúng."""
+    cache = DiskCache(path)
+    for number in range(start, start + 50):
+        expression = f"{number} * 2"
+        cache.put(expression, build_expression_tree(expression), number * 2.0)
+    found = sum(cache.get(f"{number} * 2") is not None for number in range(start, start + 50))
+    cache.close()
+    return found
+
+
+class DiskCacheTests(unittest.TestCase):
+    """Mục ghi ra phải đọc lại được qua lần chạy, giữa các tiến trình và bị loại khi vượt dung lượng."""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.db")
+
+    def test_round_trip_across_connections(self) -> None:
+        """Cây, chương trình và giá trị đọc lại được từ một kết nối mới; khoảng trắng không đổi khóa."""
+        with DiskCache(self.path) as cache:
+            self.assertIsNone(cache.get("(1 + 2) * x"))
+            cache.put("(1 + 2) * x", build_expression_tree("(1 + 2) * x"))
+            cache.put("1 : 0", build_expression_tree("1 : 0"), error="ZeroDivisionError: Division by zero encountered.")
+        with DiskCache(self.path) as cache:
+            entry = cache.get("(1+2)*x")
+            self.assertEqual(entry.tree.postorder(), ["1", "2", "+", "x", "*"])
+            self.assertEqual(entry.tree.compile().evaluate({"x": 4.0}), 12.0)
+            self.assertFalse(entry.evaluated)
+            self.assertTrue(cache.get("1:0").evaluated)
+            stats = cache.stats()
+            self.assertEqual((stats.hits, stats.misses, stats.entries), (2, 0, 2))
+        self.assertEqual(cache_key("1 +2"), cache_key(" 1+ 2 "))
+        self.assertNotEqual(cache_key("1 2"), cache_key("12"))
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Vượt `max_bytes` thì các mục dùng lâu nhất bị xóa trước."""
+        with DiskCache(self.path, max_bytes=2000) as cache:
+            for number in range(40):
+                cache.put(f"{number} + 1", build_expression_tree(f"{number} + 1"), number + 1.0)
+                if number >= 1:
+                    self.assertIsNotNone(cache.get("0 + 1"))  # kept fresh
+            cache.flush()
+            stats = cache.stats()
+            self.assertLessEqual(stats.size_bytes, 2000)
+            self.assertGreater(stats.evictions, 0)
+            self.assertEqual(cache.get("0 + 1").value, 1.0)
+            self.assertIsNone(cache.get("1 + 1"))
+
+    def test_concurrent_processes(self) -> None:
+        """Nhiều tiến trình ghi cùng file mà không lỗi khóa hay mất mục."""
+        with Pool(4) as pool:
+            self.assertEqual(pool.starmap(_fill, [(self.path, start) for start in range(0, 200, 50)]), [50] * 4)
+        with DiskCache(self.path) as cache:
+            self.assertEqual(cache.stats().entries, 200)
+
+    def test_pickles_to_shared_instance(self) -> None:
+        """Worker nhận lại đối tượng dùng chung của tiến trình, không mở kết nối mới mỗi lần."""
+        cache = shared_cache(self.path)
+        self.assertIs(pickle.loads(pickle.dumps(cache)), cache)
+        cache.close()
+
+    def test_schema_version_mismatch_resets_table(self) -> None:
+        """File của phiên bản lược đồ khác được tạo lại thay vì đọc sai."""
+        with sqlite3.connect(self.path) as db:
+            db.execute("CREATE TABLE entries (key TEXT)")
+            db.execute("PRAGMA user_version=99")
+        db.close()
+        with DiskCache(self.path) as cache:
+            cache.put("1 + 2", build_expression_tree("1 + 2"), 3.0)
+            self.assertEqual(cache.get("1 + 2").value, 3.0)
+
+
+class DiskCacheCliTests(unittest.TestCase):
+    """Lần chạy thứ hai đọc từ file cache và cho cùng kết quả."""
+
+    def test_cache_file_and_stats(self) -> None:
+        """Kết quả giống nhau khi chạy lạnh, chạy ấm và chạy nhiều tiến trình; số liệu in ra stderr."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "cli.db")
+        argv = ["--expr", "(1 + 2) * 3", "--expr", "4 : 0", "--format", "jsonl", "--cache-file", path, "--cache-stats"]
+        runs = []
+        for jobs in ("1", "1", "2"):
+            out, err = io.StringIO(), io.StringIO()
+            with redirect_stdout(out), redirect_stderr(err):
+                main(argv + ["--jobs", jobs])
+            runs.append((out.getvalue(), json.loads(err.getvalue())))
+        self.assertEqual(runs[0][0], runs[1][0])
+        self.assertEqual(runs[0][0], runs[2][0])
+        self.assertEqual((runs[0][1]["misses"], runs[0][1]["writes"]), (2, 2))
+        self.assertEqual((runs[1][1]["hits"], runs[1][1]["writes"]), (2, 0))
+        self.assertEqual(runs[2][1]["hits"], 2)
+        self.assertEqual(runs[2][1]["entries"], 2)
+
+    def test_text_output_same_with_cache(self) -> None:
+        """Chế độ văn bản in cùng kết quả và cùng thông báo lỗi dù có cache hay không."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        argv = ["--expr", "x + 1", "--expr", "4 : 0", "--expr", "2 ^ 0.5", "--no-tree"]
+        outputs = []
+        for extra in ([], ["--cache-file", os.path.join(directory.name, "text.db")]) * 2:
+            out = io.StringIO()
+            with redirect_stdout(out):
+                main(argv + extra)
+            outputs.append(out.getvalue())
+        self.assertIn("Token 'x' is not a valid number", outputs[0])
+        self.assertEqual(outputs, [outputs[0]] * 4)
+
+    def test_stats_requires_cache_file(self) -> None:
+        """`--cache-stats` không có `--cache-file` bị argparse từ chối."""
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(["--cache-stats"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,11 @@
 """Bộ kiểm thử đảm bảo cây biểu thức hoạt động như mô tả trong đề bài."""
 
+import io
 import math
 import unittest
 
 from src.evaluator import evaluate_postfix, evaluate_prefix
-from src.expression_tree import build_expression_tree
+from src.expression_tree import build_expression_tree, tokenize
 
 
 EXPRESSIONS = [
@@ -38,6 +39,46 @@ class ExpressionTreeTests(unittest.TestCase):
         with self.assertRaises(ZeroDivisionError):
             evaluate_postfix(tree.postorder())
 
+    def test_identifier_tokens(self) -> None:
+        """Tên biến được tách thành một token và thu thập theo thứ tự xuất hiện."""
+        self.assertEqual(tokenize("price*2 + x_1"), ["price", "*", "2", "+", "x_1"])
+        self.assertEqual(tokenize("2x"), ["2", "x"])
+        tree = build_expression_tree("(x + y) * x - 3")
+        self.assertEqual(tree.postorder(), ["x", "y", "+", "x", "*", "3", "-"])
+        self.assertEqual(tree.variables(), ["x", "y"])
+
+    def test_deep_tree_traversals(self) -> None:
+        """Chuỗi cộng lệch trái rất sâu không được gây `RecursionError`."""
+        terms = 5000
+        tree = build_expression_tree("+".join(["1"] * terms))
+        postfix = tree.postorder()
+        self.assertEqual(len(postfix), 2 * terms - 1)
+        self.assertEqual(tree.preorder()[:2], ["+", "+"])
+        self.assertEqual(list(tree.iter_postorder()), postfix)
+        self.assertEqual(list(tree.iter_inorder()), tree.inorder())
+        self.assertEqual(list(tree.iter_preorder()), tree.preorder())
+        self.assertEqual(evaluate_postfix(postfix), terms)
+        self.assertEqual(len(tree.render_ascii().splitlines()), 2 * terms - 1)
+
+    def test_streaming_ascii_limits(self) -> None:
+        """`iter_ascii` khớp `render_ascii` và cắt bớt theo số tầng hoặc số nút."""
+        tree = build_expression_tree("(1 + 2) * (3 - 4) + 5")
+        self.assertEqual("\n".join(tree.iter_ascii()), tree.render_ascii())
+        self.assertEqual(
+            build_expression_tree("(1 + 2) * 3").render_ascii(),
+            "└── *\n    ├── +\n    │   ├── 1\n    │   └── 2\n    └── 3",
+        )
+        self.assertEqual(
+            tree.render_ascii(max_depth=2).splitlines(),
+            ["└── +", "    ├── *", "    │   └── ...", "    └── 5"],
+        )
+        lines = list(tree.iter_ascii(max_nodes=3))
+        self.assertEqual(lines[-1], "... (truncated after 3 nodes)")
+        self.assertEqual(len(lines), 4)
+        buffer = io.StringIO()
+        self.assertEqual(tree.write_ascii(buffer, max_depth=1), 2)
+        self.assertEqual(buffer.getvalue(), "└── +\n    └── ...\n")
+
 
 if __name__ == "__main__":
     unittest.main()
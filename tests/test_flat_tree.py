@@ -0,0 +1,59 @@
+"""Kiểm thử lưu trữ cây dạng mảng song song."""
+
+import unittest
+
+from src.evaluator import evaluate_postfix, evaluate_prefix
+from src.expression_tree import ExpressionTree
+from src.flat_tree import FlatTree
+from tests.test_expression_tree import EXPRESSIONS
+
+
+class FlatTreeTests(unittest.TestCase):
+    """Cây dạng mảng phải cho kết quả giống hệt cây `Node`."""
+
+    def test_matches_node_tree(self) -> None:
+        """Mọi phép duyệt, ASCII và cả hai evaluator đều khớp với cây `Node`."""
+        for expression, expected in EXPRESSIONS + [("2^3^2 - price * (x : 4)", None)]:
+            nodes = ExpressionTree.from_infix(expression)
+            flat = ExpressionTree.from_infix(expression, compact=True)
+            self.assertIsNotNone(flat.flat)
+            self.assertEqual(flat.preorder(), nodes.preorder())
+            self.assertEqual(flat.inorder(), nodes.inorder())
+            self.assertEqual(flat.postorder(), nodes.postorder())
+            self.assertEqual(list(flat.iter_preorder()), nodes.preorder())
+            self.assertEqual(list(flat.iter_inorder()), nodes.inorder())
+            self.assertEqual(list(flat.iter_postorder()), nodes.postorder())
+            self.assertEqual(flat.render_ascii(), nodes.render_ascii())
+            if expected is not None:
+                self.assertEqual(evaluate_prefix(flat.preorder()), expected)
+                self.assertEqual(evaluate_postfix(flat.postorder()), expected)
+                self.assertEqual(flat.compile().evaluate(), expected)
+
+    def test_compile_with_variables(self) -> None:
+        """Biên dịch trực tiếp từ mảng giữ nguyên vị trí các biến."""
+        tree = ExpressionTree.from_infix("x * 2 + y : x", compact=True)
+        expected = ExpressionTree.from_infix("x * 2 + y : x").compile()
+        self.assertEqual(tree.compile().code, expected.code)
+        self.assertEqual(tree.compile().slots, expected.slots)
+        self.assertEqual(tree.compile().evaluate({"x": 2, "y": 6}), 7)
+
+    def test_root_access_converts_to_nodes(self) -> None:
+        """Truy cập `root` dựng lại `Node` và bỏ bản lưu dạng mảng."""
+        tree = ExpressionTree.from_infix("(1 + 2) * 3", compact=True)
+        root = tree.root
+        self.assertIsNone(tree.flat)
+        self.assertEqual(root.value, "*")
+        self.assertEqual(FlatTree.from_node(root).postorder(), tree.postorder())
+
+    def test_deep_tree_and_errors(self) -> None:
+        """Cây rất sâu không gây đệ quy; postfix sai báo `ValueError` như cũ."""
+        tree = ExpressionTree.from_infix("-".join(["1"] * 5000), compact=True)
+        self.assertEqual(len(tree.preorder()), 9999)
+        self.assertEqual(tree.compile().evaluate(), -4998)
+        self.assertEqual(len(tree.flat.tokens), 1)
+        with self.assertRaises(ValueError):
+            FlatTree.from_postfix(["1", "+"])
+
+
+if __name__ == "__main__":
+    unittest.main()
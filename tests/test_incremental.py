@@ -0,0 +1,58 @@
+"""Kiểm thử tính lại gia tăng bằng `ExpressionTree.set_leaf` và `value`."""
+
+import random
+import unittest
+
+from src.evaluator import evaluate_postfix
+from src.expression_tree import ExpressionTree, build_expression_tree
+
+
+class IncrementalEvaluationTests(unittest.TestCase):
+    """Sau mỗi lần đổi lá, `value()` phải khớp với tính lại toàn bộ."""
+
+    def test_paths_and_handles(self) -> None:
+        """Lá được chỉ định bằng đường đi "L"/"R" hoặc handle trả về."""
+        tree = ExpressionTree.from_infix("(1 + 2) * (3 - 4)")
+        self.assertEqual(tree.value(), -3.0)
+        handle = tree.set_leaf("LR", 5)
+        self.assertEqual(tree.value(), -6.0)
+        tree.set_leaf(handle, "7")
+        self.assertEqual(tree.value(), -8.0)
+        self.assertEqual(tree.postorder(), ["1", "7", "+", "3", "4", "-", "*"])
+        with self.assertRaises(ValueError):
+            tree.set_leaf("L", 1)  # "+" is not a leaf
+
+    def test_matches_full_evaluation(self) -> None:
+        """Nhiều lần cập nhật ngẫu nhiên cho cùng kết quả với `evaluate_postfix`."""
+        expression = " + ".join(f"({i} * {i + 1} - {i + 2})" for i in range(1, 60))
+        tree = ExpressionTree.from_infix(expression)
+        handles = tree.leaf_handles()
+        rng = random.Random(3)
+        for _ in range(100):
+            tree.set_leaf(rng.choice(handles), rng.randint(-50, 50))
+            self.assertEqual(tree.value(), evaluate_postfix(tree.postorder()))
+
+    def test_division_by_zero_recovers(self) -> None:
+        """Lỗi chia cho 0 được ném ra và lần cập nhật sau vẫn tính đúng."""
+        tree = ExpressionTree.from_infix("8 : 2 + 1")
+        tree.set_leaf("LR", 0)
+        with self.assertRaises(ZeroDivisionError):
+            tree.value()
+        tree.set_leaf("LR", 4)
+        self.assertEqual(tree.value(), 3.0)
+
+    def test_copy_on_write_for_cached_and_dag_trees(self) -> None:
+        """Cây dùng chung nút với cache hoặc DAG được sao chép trước khi sửa."""
+        cached = build_expression_tree("(1 + 2) * 3")
+        cached.set_leaf("R", 10)
+        self.assertFalse(cached.is_shared)
+        self.assertEqual(cached.value(), 30.0)
+        self.assertEqual(build_expression_tree("(1 + 2) * 3").postorder(), ["1", "2", "+", "3", "*"])
+
+        dag = ExpressionTree.from_infix("(1 + 2) * (1 + 2)", share_subtrees=True)
+        dag.set_leaf("LL", 5)
+        self.assertEqual(dag.value(), 21.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
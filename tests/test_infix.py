@@ -0,0 +1,85 @@
+"""Đối chiếu `evaluate_infix` với đường dựng cây rồi tính hậu tự."""
+
+import random
+import unittest
+
+from benchmarks.generator import generate_expression
+from src.evaluator import evaluate_infix, evaluate_postfix, evaluate_prefix
+from src.expression_tree import ExpressionTree
+
+
+def _through_tree(expression: str) -> object:
+    """Kết quả (hoặc lỗi) khi đi qua cây biểu thức."""
+    try:
+        return evaluate_postfix(ExpressionTree.from_infix(expression).postorder())
+    except (ValueError, ArithmeticError) as exc:
+        return type(exc), str(exc)
+
+
+def _direct(expression: str) -> object:
+    """Kết quả (hoặc lỗi) của `evaluate_infix`."""
+    try:
+        return evaluate_infix(expression)
+    except (ValueError, ArithmeticError) as exc:
+        return type(exc), str(exc)
+
+
+class EvaluateInfixTests(unittest.TestCase):
+    """Cùng giá trị, cùng loại lỗi và cùng thông báo lỗi với đường dựng cây."""
+
+    def test_matches_tree_pipeline(self) -> None:
+        """Biểu thức sinh ngẫu nhiên, có cả phép chia và lũy thừa."""
+        for seed in range(200):
+            expression = generate_expression(1 + seed % 30, shape="random", seed=seed)
+            self.assertEqual(_direct(expression), _through_tree(expression), expression)
+
+    def test_precedence_and_associativity(self) -> None:
+        """`^` kết hợp phải, các toán tử khác kết hợp trái."""
+        self.assertEqual(evaluate_infix("2 ^ 3 ^ 2"), 512.0)
+        self.assertEqual(evaluate_infix("8 - 3 - 2"), 3.0)
+        self.assertEqual(evaluate_infix("8 : 4 : 2"), 1.0)
+        self.assertEqual(evaluate_infix("1 + 2 * 3 ^ 2 : (4 - 1)"), 7.0)
+
+    def test_same_errors(self) -> None:
+        """Lỗi cú pháp được báo trước lỗi tính toán, như khi dựng cây trước."""
+        cases = [
+            "",
+            "1 +",
+            "(1 + 2",
+            "1 + 2)",
+            "1 : 0 + (2",
+            "1 : 0 + * 2",
+            "1 : 0 2",
+            "1 : (2 - 2) + 3 : 0",
+            "x + 1 : 0",
+            "1 $ 2",
+            "+ 1 2",
+            "1 2 +",
+            "()",
+        ]
+        rng = random.Random(7)
+        alphabet = ["1", "2", "0", "x", "+", "-", "*", ":", "^", "(", ")"]
+        cases.extend(" ".join(rng.choice(alphabet) for _ in range(rng.randint(1, 9))) for _ in range(500))
+        for expression in cases:
+            self.assertEqual(_direct(expression), _through_tree(expression), expression)
+
+    def test_float_names_are_variables(self) -> None:
+        """`inf`, `nan`, `infinity` là tên biến ở mọi evaluator, không phải hằng số."""
+        for name in ("inf", "nan", "Infinity"):
+            expression = f"{name} - {name}"
+            tree = ExpressionTree.from_infix(expression)
+            for evaluate, argument in (
+                (evaluate_infix, expression),
+                (evaluate_postfix, tree.postorder()),
+                (evaluate_prefix, tree.preorder()),
+            ):
+                with self.assertRaisesRegex(ValueError, f"Token '{name}' is not a valid number"):
+                    evaluate(argument)
+            with self.assertRaisesRegex(ValueError, f"Missing value for variable '{name}'"):
+                tree.compile().evaluate()
+            self.assertEqual(tree.compile().evaluate({name: 2.0}), 0.0)
+        self.assertEqual(evaluate_postfix(["1e999", "1", "+"]), float("inf"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Kiểm thử lớp đo thời gian theo giai đoạn và cờ `--profile` của CLI."""
+
+import io
+import json
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.evaluator import evaluate_postfix
+from src.expression_tree import PARSE_CACHE, ExpressionTree
+from src.instrumentation import (
+    PROFILER,
+    RESERVOIR_SIZE,
+    Profiler,
+    count_first_argument,
+    disable_profiling,
+    enable_profiling,
+    profiled_call,
+)
+from src.main import main
+
+
+class ProfilerTests(unittest.TestCase):
+    """Số liệu chỉ được ghi khi bật và được tổng hợp đúng."""
+
+    def setUp(self) -> None:
+        PROFILER.reset()
+        self.addCleanup(PROFILER.reset)
+        self.addCleanup(disable_profiling)
+
+    def test_disabled_records_nothing(self) -> None:
+        """Khi tắt, gọi các giai đoạn không để lại số liệu nào."""
+        ExpressionTree.from_infix("1 + 2").postorder()
+        self.assertEqual(PROFILER.snapshot(), {})
+
+    def test_stage_counts_and_listener(self) -> None:
+        """Mỗi giai đoạn có số lần gọi, số token và listener nhận từng sự kiện."""
+        events = []
+        PROFILER.add_listener(lambda stage, seconds, items: events.append((stage, items)))
+        self.addCleanup(PROFILER._listeners.clear)
+        enable_profiling()
+        tree = ExpressionTree.from_infix("(1 + 2) * 3")
+        evaluate_postfix(tree.postorder())  # hot path: only timed at call sites
+        profiled_call("evaluate_postfix", count_first_argument, evaluate_postfix, tree.postorder())
+        with self.assertRaises(ZeroDivisionError):
+            profiled_call("evaluate_postfix", count_first_argument, evaluate_postfix, ["1", "0", ":"])
+        summary = PROFILER.snapshot()
+        self.assertEqual(summary["tokenize"]["items"], 7)
+        self.assertEqual(summary["build_tree_from_postfix"]["items"], 5)
+        self.assertEqual(summary["evaluate_postfix"]["calls"], 2)
+        self.assertLessEqual(summary["evaluate_postfix"]["p50_seconds"], summary["evaluate_postfix"]["max_seconds"])
+        self.assertIn(("postorder", 5), events)
+
+    def test_export_merge(self) -> None:
+        """Trạng thái từ tiến trình khác được cộng dồn vào profiler chính."""
+        other = Profiler()
+        other.record("tokenize", 0.5, items=3)
+        PROFILER.record("tokenize", 0.25, items=1)
+        PROFILER.merge(other.export())
+        entry = PROFILER.snapshot()["tokenize"]
+        self.assertEqual((entry["calls"], entry["items"], entry["total_seconds"]), (2, 4, 0.75))
+        self.assertEqual(entry["max_seconds"], 0.5)
+
+    def test_merge_full_reservoirs(self) -> None:
+        """Gộp hai reservoir đầy giữ mẫu theo tỷ lệ số lần gọi của mỗi bên."""
+        first, second = Profiler(), Profiler()
+        for _ in range(10_000):
+            first.record("evaluate_postfix", 1.0)
+        for _ in range(30_000):
+            second.record("evaluate_postfix", 2.0)
+        first.merge(second.export())
+        samples = first.export()["evaluate_postfix"][4]
+        self.assertEqual(len(samples), RESERVOIR_SIZE)
+        self.assertAlmostEqual(samples.count(2.0) / len(samples), 0.75, delta=0.05)
+        self.assertEqual(first.snapshot()["evaluate_postfix"]["p50_seconds"], 2.0)
+
+    def test_many_small_merges(self) -> None:
+        """Gộp lần lượt nhiều trạng thái nhỏ (như mỗi khối của worker) vẫn giữ đúng tỷ lệ."""
+        merged = Profiler()
+        for _ in range(10_000):
+            merged.record("compile", 1.0)
+        for _ in range(100):
+            chunk = Profiler()
+            for _ in range(300):
+                chunk.record("compile", 2.0)
+            merged.merge(chunk.export())
+        samples = merged.export()["compile"][4]
+        self.assertEqual(len(samples), RESERVOIR_SIZE)
+        self.assertAlmostEqual(samples.count(2.0) / len(samples), 0.75, delta=0.05)
+
+    def test_cli_profile_to_stderr(self) -> None:
+        """`--profile` in JSON tổng hợp ra stderr và tắt đo khi kết thúc."""
+        PARSE_CACHE.clear()
+        stderr = io.StringIO()
+        with redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+            main(["--expr", "1 + 2", "--format", "jsonl", "--profile"])
+        summary = json.loads(stderr.getvalue())
+        self.assertEqual(summary["stages"]["tokenize"]["calls"], 1)
+        self.assertEqual(summary["stages"]["run_program"]["calls"], 1)
+        self.assertIn("parse_cache", summary)
+        self.assertFalse(PROFILER.enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Kiểm thử chế độ xử lý lô của CLI (`--input`, `--format jsonl`, `--jobs`)."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.main import build_record, iter_results, main, render_results
+
+
+def _run_cli(*argv: str) -> str:
+    """Chạy `main` với tham số cho trước và trả về nội dung in ra stdout."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        main(list(argv))
+    return buffer.getvalue()
+
+
+class BatchCliTests(unittest.TestCase):
+    """CLI phải giữ thứ tự đầu vào và ghi lỗi thành bản ghi riêng."""
+
+    def setUp(self) -> None:
+        handle = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8")
+        with handle:
+            handle.write("1 + 2\n\n3 : 0\n(1\n" + "\n".join(f"{i} * 2" for i in range(50)) + "\n")
+        self.path = handle.name
+        self.addCleanup(os.unlink, self.path)
+
+    def test_build_record_fields(self) -> None:
+        """Chỉ các trường được chọn xuất hiện trong bản ghi."""
+        record = build_record("(1 + 2) * 3", ("postfix", "value"))
+        self.assertEqual(record, {"expression": "(1 + 2) * 3", "postfix": "1 2 + 3 *", "value": 9.0})
+
+    def test_jsonl_with_error_records(self) -> None:
+        """Dòng lỗi sinh bản ghi `error`, các dòng khác vẫn được xử lý."""
+        records = [json.loads(line) for line in _run_cli("--input", self.path, "--format", "jsonl").splitlines()]
+        self.assertEqual(len(records), 53)
+        self.assertEqual(records[0]["value"], 3.0)
+        self.assertIsNone(records[1]["value"])
+        self.assertIn("ZeroDivisionError", records[1]["error"])
+        self.assertEqual(records[2]["line"], 4)
+        self.assertIn("Mismatched parentheses", records[2]["error"])
+        self.assertNotIn("tree", records[0])
+
+    def test_unrepresentable_values(self) -> None:
+        """Số phức và vô cực thành bản ghi lỗi hợp lệ JSON, không dừng cả lượt chạy."""
+        argv = ["--expr", "(0-8)^(1:2)", "--expr", "10^308 * 10", "--expr", "1 + 1", "--format", "jsonl"]
+        for jobs in ("1", "2"):
+            lines = _run_cli(*argv, "--jobs", jobs).splitlines()
+            records = [json.loads(line, parse_constant=self.fail) for line in lines]
+            self.assertEqual(len(records), 3)
+            self.assertIsNone(records[0]["value"])
+            self.assertEqual(records[0]["error"], "ValueError: Result is a complex number.")
+            self.assertEqual(records[0]["postfix"], "0 8 - 1 2 : ^")
+            self.assertIsNone(records[1]["value"])
+            self.assertEqual(records[1]["error"], "ValueError: Result is not a finite number.")
+            self.assertEqual(records[2]["value"], 2.0)
+
+    def test_parallel_jobs_preserve_order(self) -> None:
+        """Chạy nhiều tiến trình cho cùng kết quả và thứ tự như chạy tuần tự."""
+        serial = _run_cli("--input", self.path, "--format", "jsonl", "--fields", "value,tree")
+        parallel = _run_cli("--input", self.path, "--format", "jsonl", "--fields", "value,tree", "--jobs", "2")
+        self.assertEqual(parallel, serial)
+
+    def test_tree_rendering_optional(self) -> None:
+        """`--no-tree` bỏ phần vẽ cây, `--tree-max-depth` cắt bớt bản vẽ."""
+        plain = _run_cli("--expr", "(1 + 2) * 3", "--no-tree")
+        self.assertNotIn("Tree:", plain)
+        self.assertIn("Postfix eval: 9", plain)
+        record = json.loads(_run_cli("--expr", "(1 + 2) * 3", "--format", "jsonl", "--fields", "tree", "--no-tree"))
+        self.assertNotIn("tree", record)
+        limited = _run_cli("--expr", "(1 + 2) * 3", "--tree-max-depth", "1")
+        self.assertTrue(limited.endswith("└── *\n    └── ...\n"))
+
+    def test_text_lines_stream(self) -> None:
+        """Chế độ văn bản ghi từng dòng ra stdout, giống hệt khi chạy nhiều tiến trình."""
+        lines = iter_results("(1 + 2) * 3", max_nodes=2)
+        self.assertEqual(next(lines), "Expression : (1 + 2) * 3")
+        self.assertEqual(list(lines)[-3:], ["└── *", "    ├── +", "... (truncated after 2 nodes)"])
+        self.assertEqual(render_results("1 + 2"), "\n".join(iter_results("1 + 2")))
+        serial = _run_cli("--input", self.path, "--tree-max-nodes", "5")
+        self.assertEqual(_run_cli("--input", self.path, "--tree-max-nodes", "5", "--jobs", "2"), serial)
+        self.assertIn("Expression : (1\nError (line 4): ", serial)
+
+    def test_unknown_field_rejected(self) -> None:
+        """Trường không hỗ trợ bị argparse từ chối."""
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(["--format", "jsonl", "--fields", "value,colour"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Kiểm thử tính song song một cây lớn trên nhiều tiến trình."""
+
+import unittest
+from multiprocessing import Pool
+
+from benchmarks.generator import generate_expression
+from src.expression_tree import ExpressionTree
+from src.parallel import evaluate_parallel, split_tree
+
+
+class ParallelEvaluationTests(unittest.TestCase):
+    """Kết quả và lỗi phải giống hệt khi tính tuần tự."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.pool = Pool(2)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.pool.close()
+        cls.pool.join()
+
+    def test_split_covers_tree(self) -> None:
+        """Các đoạn rời nhau và cùng các nút phía trên phủ đúng mọi nút."""
+        tree = ExpressionTree.from_infix(generate_expression(500, shape="random", seed=4), compact=True)
+        ranges, top = split_tree(tree.flat, 8)
+        covered = sorted(index for start, end in ranges for index in range(start, end + 1))
+        self.assertEqual(sorted(covered + top), list(range(len(tree.flat))))
+        self.assertEqual(len(ranges), 8)
+
+    def test_matches_serial(self) -> None:
+        """Cây `Node` và cây mảng, có biến hay không, cho cùng giá trị."""
+        expression = generate_expression(3000, shape="random", operators="+-*:", seed=5)
+        for compact in (False, True):
+            tree = ExpressionTree.from_infix(expression, compact=compact)
+            expected = tree.compile().evaluate()
+            self.assertEqual(evaluate_parallel(tree, workers=2, min_nodes=0, pool=self.pool), expected)
+        tree = ExpressionTree.from_infix("(x * 2 + y) * (x - y) + (y : x) * 3", compact=True)
+        variables = {"x": 3.0, "y": 1.5}
+        self.assertEqual(
+            evaluate_parallel(tree, variables, workers=2, min_nodes=0, pool=self.pool),
+            tree.compile().evaluate(variables),
+        )
+
+    def test_first_error_in_postfix_order(self) -> None:
+        """Lỗi được ném là lỗi xuất hiện đầu tiên theo thứ tự hậu tự, như khi tính tuần tự."""
+        cases = [
+            ("((1 + 2) * (3 : 0)) + ((4 + 5) * (10 ^ 400))", ZeroDivisionError),
+            ("((1 + 2) * (10 ^ 400)) + ((4 + 5) * (3 : 0))", OverflowError),
+        ]
+        for expression, error in cases:
+            tree = ExpressionTree.from_infix(expression, compact=True)
+            with self.subTest(expression=expression), self.assertRaises(error):
+                evaluate_parallel(tree, workers=2, min_nodes=0, pool=self.pool)
+
+    def test_small_or_degenerate_trees_run_serially(self) -> None:
+        """Cây nhỏ hoặc lệch hẳn một phía không cần đến pool."""
+        chain = ExpressionTree.from_infix("+".join(["1"] * 200), compact=True)
+        self.assertEqual(evaluate_parallel(chain, workers=4, min_nodes=0), 200.0)
+        self.assertEqual(evaluate_parallel(ExpressionTree.from_infix("1 + 2"), workers=4), 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Kiểm thử bước cân bằng lại chuỗi toán tử kết hợp."""
+
+import math
+import random
+import unittest
+
+from benchmarks.generator import generate_expression
+from src.expression_tree import ExpressionTree
+from src.rebalance import tree_depth
+
+
+class RebalanceTests(unittest.TestCase):
+    """Cây cân bằng phải nông hơn, giữ giá trị và giữ nguyên các lỗi khi tính."""
+
+    def test_long_chain_becomes_logarithmic(self) -> None:
+        """Chuỗi 10^4 số hạng `+`/`-`/`*` có độ sâu O(log n)."""
+        for operators in ("+", "+-", "*"):
+            expression = generate_expression(10_000, shape="left", operators=operators, seed=2)
+            tree = ExpressionTree.from_infix(expression)
+            result = tree.rebalance(exact=False)
+            self.assertEqual(result.depth_before, 10_000)
+            self.assertLessEqual(result.depth_after, 2 * math.ceil(math.log2(10_000)) + 2)
+            self.assertEqual(tree_depth(tree.root), 10_000)  # original left untouched
+            expected = tree.compile().evaluate()
+            self.assertTrue(math.isclose(result.tree.compile().evaluate(), expected, rel_tol=1e-9), operators)
+
+    def test_exact_mode(self) -> None:
+        """`exact=True` chỉ nhóm lại chuỗi số nguyên đủ nhỏ, kết quả giống hệt từng bit."""
+        integers = " + ".join(str(value) for value in range(1, 500)) + " - 7 - 8"
+        result = ExpressionTree.from_infix(integers).rebalance()
+        self.assertEqual(result.chains, 1)
+        self.assertLess(result.depth_after, result.depth_before)
+        self.assertEqual(result.tree.compile().evaluate(), ExpressionTree.from_infix(integers).compile().evaluate())
+        for expression in ("a + b + c + d", "1 : 3 : 7 : 9", f"{2 ** 52} + {2 ** 52} + 1 + 1"):
+            result = ExpressionTree.from_infix(expression).rebalance()
+            self.assertEqual(result.chains, 0, expression)
+            self.assertEqual(result.tree.postorder(), ExpressionTree.from_infix(expression).postorder())
+
+    def test_values_with_variables(self) -> None:
+        """Dấu của `-` và `:` được giữ đúng khi chuỗi bị chia đôi."""
+        rng = random.Random(5)
+        for expression in ("a - b + c - (d + e) - f", "a * b : 2 * c : 3 * d", "a - (b - (c - d)) + e", "(a + b) * (c - d - e - f)"):
+            tree = ExpressionTree.from_infix(expression)
+            balanced = tree.rebalance(exact=False).tree
+            for _ in range(20):
+                variables = {name: rng.uniform(-10, 10) for name in "abcdef"}
+                self.assertTrue(
+                    math.isclose(balanced.compile().evaluate(variables), tree.compile().evaluate(variables), rel_tol=1e-12),
+                    expression,
+                )
+
+    def test_errors_unchanged(self) -> None:
+        """Phép `:` có số chia không phải hằng không bị nhóm lại; lỗi chia cho 0 vẫn xảy ra đúng chỗ."""
+        raising = ExpressionTree.from_infix("a : b : c + 1 + 2").rebalance(exact=False).tree
+        with self.assertRaises(ZeroDivisionError):
+            raising.compile().evaluate({"a": 1.0, "b": 0.0, "c": 2.0})
+        safe = ExpressionTree.from_infix("a * b : 2 * c : 3").rebalance(exact=False).tree
+        self.assertEqual(safe.compile().evaluate({"a": 1.0, "b": 0.0, "c": 0.0}), 0.0)
+        for expression in ("(100 + 7) : (3 : 0)", "5 : (2 : 0)"):
+            nested = ExpressionTree.from_infix(expression).rebalance(exact=False).tree
+            with self.assertRaises(ZeroDivisionError, msg=expression):
+                nested.compile().evaluate()
+
+    def test_shared_subtrees(self) -> None:
+        """Cây DAG được cân bằng mà không lỗi và giữ giá trị."""
+        expression = " + ".join(["(x * 2 + 1)"] * 64)
+        tree = ExpressionTree.from_infix(expression, share_subtrees=True)
+        result = tree.rebalance(exact=False)
+        self.assertEqual(result.tree.compile().evaluate({"x": 3.0}), 64 * 7.0)
+        self.assertLessEqual(result.depth_after, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
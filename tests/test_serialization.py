@@ -0,0 +1,91 @@
+"""Kiểm thử định dạng nhị phân của cây biểu thức và file catalog."""
+
+import gc
+import io
+import math
+import os
+import struct
+import tempfile
+import unittest
+import warnings
+
+from benchmarks.generator import generate_expression
+from src.expression_tree import ExpressionTree
+from src.serialization import Catalog, dump, dumps, load, loads, write_catalog
+
+
+class SerializationTests(unittest.TestCase):
+    """Cây đọc lại phải cho cùng phép duyệt, cùng giá trị và cùng lỗi."""
+
+    def test_round_trip(self) -> None:
+        """Cây `Node` và cây mảng, có biến hay không, giữ nguyên sau khi ghi/đọc."""
+        for expression in ("(x * 2 + y) * (x - y) + (y : x) * 3", "2 ^ 3 ^ 2 - 10 : 4", "42"):
+            for compact in (False, True):
+                tree = ExpressionTree.from_infix(expression, compact=compact)
+                restored = loads(dumps(tree))
+                self.assertEqual(restored.expression, expression)
+                self.assertEqual(restored.postorder(), tree.postorder())
+                self.assertEqual(restored.variables(), tree.variables())
+                variables = {"x": 3.0, "y": 1.5}
+                self.assertEqual(restored.compile().evaluate(variables), tree.compile().evaluate(variables))
+
+        buffer = io.BytesIO()
+        tree = ExpressionTree.from_infix("1 : (2 - 2)")
+        self.assertEqual(dump(tree, buffer), len(buffer.getvalue()))
+        buffer.seek(0)
+        with self.assertRaises(ZeroDivisionError):
+            load(buffer).compile().evaluate()
+
+    def test_rejects_other_data(self) -> None:
+        """Dữ liệu sai magic, sai phiên bản hoặc bị cắt cụt báo `ValueError`."""
+        data = dumps(ExpressionTree.from_infix("1 + 2 * 3"))
+        with self.assertRaises(ValueError):
+            loads(b"XXXX" + data[4:])
+        with self.assertRaises(ValueError):
+            loads(data[:4] + struct.pack("<H", 99) + data[6:])
+        with self.assertRaises(ValueError):
+            loads(data[: len(data) // 2])
+
+    def test_catalog_random_access(self) -> None:
+        """Đọc cây thứ N từ catalog mmap khớp với phân tích lại biểu thức."""
+        expressions = [generate_expression(5 + seed % 40, shape="random", seed=seed) for seed in range(50)]
+        expressions.append("a * (b + 1)")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.mad")
+            self.assertEqual(write_catalog(path, expressions), len(expressions))
+            with Catalog(path) as catalog:
+                self.assertEqual(len(catalog), len(expressions))
+                for number in (0, 17, 49):
+                    expected = ExpressionTree.from_infix(expressions[number])
+                    self.assertEqual(catalog.expression(number), expressions[number])
+                    self.assertEqual(catalog[number].postorder(), expected.postorder())
+                    value = catalog.evaluate(number)
+                    self.assertTrue(value == expected.compile().evaluate() or math.isnan(value))
+                self.assertEqual(catalog.evaluate(-1, {"a": 2.0, "b": 3.0}), 8.0)
+                with self.assertRaises(IndexError):
+                    catalog.program(len(expressions))
+            with open(path, "wb"):
+                pass
+            with self.assertRaises(ValueError):
+                Catalog(path)
+
+    def test_truncated_catalog(self) -> None:
+        """File bị cắt ở phần đầu hoặc bảng chỉ mục báo `ValueError` và không để lại file đang mở."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.mad")
+            write_catalog(path, ["1 + 2", "x * 3"])
+            with open(path, "rb") as handle:
+                data = handle.read()
+            for size in (0, 5, len(data) - 1):
+                with open(path, "wb") as handle:
+                    handle.write(data[:size])
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter("always")
+                    with self.assertRaisesRegex(ValueError, "Truncated expression catalog"):
+                        Catalog(path)
+                    gc.collect()
+                self.assertEqual([w for w in caught if issubclass(w.category, ResourceWarning)], [], size)
+
+
+if __name__ == "__main__":
+    unittest.main()
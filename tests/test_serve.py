@@ -0,0 +1,98 @@
+"""Kiểm thử máy chủ JSON theo dòng `src.serve`."""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+
+from src.serve import EvaluationServer, evaluate_batch
+
+
+async def _exchange(server: EvaluationServer, lines, path=None):
+    """Mở máy chủ, gửi liên tục các dòng qua một kết nối và đọc đủ số câu trả lời."""
+    listener = await server.start(port=0, path=path)
+    try:
+        if path is None:
+            reader, writer = await asyncio.open_connection("127.0.0.1", listener.sockets[0].getsockname()[1])
+        else:
+            reader, writer = await asyncio.open_unix_connection(path)
+        writer.write("".join(line + "\n" for line in lines).encode())
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in lines]
+        writer.close()
+        await writer.wait_closed()
+        return responses
+    finally:
+        listener.close()
+        server.close()
+
+
+class ServeTests(unittest.TestCase):
+    """Câu trả lời giữ thứ tự yêu cầu, lỗi được trả về theo từng dòng."""
+
+    def test_evaluate_batch(self) -> None:
+        """Một lô trả về giá trị hoặc lỗi cho từng biểu thức."""
+        results = evaluate_batch([("(1 + 2) * 3", None), ("1 : 0", None), ("x * 2", {"x": 4}), ("10^308 * 10", None)])
+        self.assertEqual(results[0], {"value": 9.0})
+        self.assertIn("ZeroDivisionError", results[1]["error"])
+        self.assertEqual(results[2], {"value": 8.0})
+        self.assertEqual(results[3], {"error": "ValueError: Result is not a finite number."})
+
+    def test_bad_variables_fail_only_their_request(self) -> None:
+        """Biến không phải số chỉ làm hỏng yêu cầu chứa nó, không hỏng cả lô."""
+        results = evaluate_batch([("x * 2", {"x": "a"}), ("1 + 1", None)])
+        self.assertIn("TypeError", results[0]["error"])
+        self.assertEqual(results[1], {"value": 2.0})
+        lines = [json.dumps({"id": 1, "expression": "x", "variables": {"x": value}}) for value in ("a", True, None)]
+        lines.append(json.dumps({"id": 2, "expression": "x + 1", "variables": {"x": 1}}))
+        responses = asyncio.run(_exchange(EvaluationServer(workers=0), lines))
+        for response in responses[:3]:
+            self.assertEqual(response, {"id": 1, "error": "ValueError: 'variables' values must be numbers."})
+        self.assertEqual(responses[3], {"id": 2, "value": 2.0})
+
+    def test_line_too_long(self) -> None:
+        """Dòng vượt `max_line` nhận câu trả lời lỗi; kết nối vẫn phục vụ các dòng sau."""
+        long_line = json.dumps({"id": 1, "expression": " + ".join(["1"] * 3000)})
+        lines = [long_line, json.dumps({"id": 2, "expression": "1 + 2"}), long_line[:2000], long_line]
+        responses = asyncio.run(_exchange(EvaluationServer(workers=0, max_line=1024), lines))
+        self.assertEqual(responses[0], {"id": None, "error": "ValueError: Request line exceeds 1024 bytes."})
+        self.assertEqual(responses[1], {"id": 2, "value": 3.0})
+        self.assertEqual(responses[2], responses[0])
+        self.assertEqual(responses[3], responses[0])
+
+    def test_pipelined_requests_over_tcp(self) -> None:
+        """Nhiều yêu cầu gửi liền nhau được gom lô và trả lời đúng thứ tự."""
+        lines = [json.dumps({"id": index, "expression": f"{index} * 2 + 1"}) for index in range(50)]
+        lines += ["not json", json.dumps({"id": "z", "expression": "9^9^9"})]
+        server = EvaluationServer(workers=0, batch_size=8, max_in_flight=16)
+        responses = asyncio.run(_exchange(server, lines))
+        self.assertEqual([response["value"] for response in responses[:50]], [i * 2 + 1.0 for i in range(50)])
+        self.assertEqual([response["id"] for response in responses[:50]], list(range(50)))
+        self.assertIn("Invalid JSON", responses[50]["error"])
+        self.assertEqual(responses[51]["id"], "z")
+        self.assertIn("BudgetExceededError", responses[51]["error"])
+        self.assertGreater(server.requests / server.batches, 1)
+
+    def test_broken_pool_is_replaced(self) -> None:
+        """Worker chết làm hỏng pool; lô kế tiếp chạy trên pool mới thay vì báo lỗi mãi."""
+        server = EvaluationServer(workers=1)
+        broken = server.executor
+        with self.assertRaises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result()
+        responses = asyncio.run(_exchange(server, ['{"id": 1, "expression": "1 + 2"}']))
+        self.assertEqual(responses, [{"id": 1, "value": 3.0}])
+        self.assertIsNot(server.executor, broken)
+
+    @unittest.skipUnless(hasattr(asyncio, "open_unix_connection"), "Unix sockets not available")
+    def test_unix_socket(self) -> None:
+        """Máy chủ cũng lắng nghe được trên Unix socket."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "serve.sock")
+            responses = asyncio.run(_exchange(EvaluationServer(workers=0), ['{"expression": "2 ^ 10"}'], path))
+        self.assertEqual(responses, [{"id": None, "value": 1024.0}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Kiểm thử bước gộp hằng số và rút gọn đại số."""
+
+import unittest
+
+from src.evaluator import evaluate_postfix
+from src.expression_tree import build_expression_tree
+from tests.test_expression_tree import EXPRESSIONS
+
+
+class SimplifyTests(unittest.TestCase):
+    """Cây rút gọn phải nhỏ hơn và giữ nguyên giá trị lẫn lỗi chia cho 0."""
+
+    def test_constant_expressions_fold_to_one_leaf(self) -> None:
+        """Biểu thức chỉ có hằng số được gộp thành một lá cùng giá trị."""
+        for expression, expected in EXPRESSIONS:
+            result = build_expression_tree(expression).simplify()
+            self.assertEqual(result.tree.postorder(), [str(expected)])
+            self.assertEqual(result.nodes_after, 1)
+            self.assertEqual(result.removed, result.nodes_before - 1)
+
+    def test_identities(self) -> None:
+        """Các phần tử trung hòa và phần tử hấp thụ được bỏ đi."""
+        cases = {
+            "x * 1 + 0": ["x"],
+            "(y ^ 1) - 0 + 0 * (x + 2)": ["y"],
+            "x ^ (3 - 3)": ["1"],
+            "1 * (a : 1) * (2 + 3)": ["a", "5", "*"],
+            "x : 4": ["x", "4", ":"],
+        }
+        for expression, postfix in cases.items():
+            self.assertEqual(build_expression_tree(expression).simplify().tree.postorder(), postfix, expression)
+
+    def test_keeps_division_that_may_fail(self) -> None:
+        """Không bao giờ gộp mất phép `:` có số chia có thể bằng 0."""
+        for expression in ("0 * (1 : x)", "(x : (y - y)) ^ 0", "(1 + 2 * 3) : (4 - 5 - 6 +7)"):
+            simplified = build_expression_tree(expression).simplify().tree
+            self.assertIn(":", simplified.postorder(), expression)
+        tree = build_expression_tree("(1 + 2 * 3) : (4 - 5 - 6 +7)").simplify().tree
+        with self.assertRaises(ZeroDivisionError):
+            evaluate_postfix(tree.postorder())
+
+    def test_keeps_constant_subtrees_that_fail(self) -> None:
+        """Hằng số không gộp được vì phép tính ném lỗi không bị phần tử hấp thụ nuốt mất."""
+        cases = {
+            "0 * (0 ^ (0 - 1))": ZeroDivisionError,
+            "0 * (10 ^ 400)": OverflowError,
+            "(10 ^ 400) ^ 0": OverflowError,
+        }
+        for expression, error in cases.items():
+            tree = build_expression_tree(expression)
+            with self.assertRaises(error, msg=expression):
+                evaluate_postfix(tree.postorder())
+            with self.assertRaises(error, msg=expression):
+                evaluate_postfix(tree.simplify().tree.postorder())
+
+    def test_original_tree_unchanged(self) -> None:
+        """Rút gọn trả về cây mới, không sửa cây gốc."""
+        tree = build_expression_tree("x * 1")
+        tree.simplify()
+        self.assertEqual(tree.postorder(), ["x", "1", "*"])
+        program = build_expression_tree("(p * 1 + 0) * (2 + 3)").simplify().tree.compile()
+        self.assertEqual(program.evaluate({"p": 3}), 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
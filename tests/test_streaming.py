@@ -0,0 +1,94 @@
+"""Kiểm thử đường ống infix một lượt (tokenizer theo khối + shunting-yard dựng cây)."""
+
+import io
+import os
+import tempfile
+import unittest
+
+from benchmarks.generator import generate_expression
+from src.evaluator import evaluate_postfix_expression, evaluate_prefix_expression
+from src.expression_tree import ExpressionTree, build_expression_tree, tokenize
+from src.streaming import evaluate_postfix_stream, evaluate_prefix_stream, iter_tokens
+from tests.test_expression_tree import EXPRESSIONS
+
+
+class StreamingTests(unittest.TestCase):
+    """Cây dựng theo luồng phải trùng với cây dựng qua danh sách postfix."""
+
+    def test_same_tree_as_from_infix(self) -> None:
+        """Thứ tự tiền tự/hậu tự giống hệt đường ống cũ."""
+        for expression in [e for e, _ in EXPRESSIONS] + ["2^3^2 - x1 * (y : 4)", "7"]:
+            expected = build_expression_tree(expression)
+            streamed = ExpressionTree.from_stream(expression)
+            self.assertEqual(streamed.preorder(), expected.preorder())
+            self.assertEqual(streamed.postorder(), expected.postorder())
+
+    def test_chunk_boundaries(self) -> None:
+        """Toán hạng bị cắt giữa hai khối vẫn được ghép lại đúng."""
+        expression = "123 + price_tag*45678 - (9:long_name)^2"
+        for chunk_size in (1, 2, 3, 7, 64):
+            tokens = list(iter_tokens(io.StringIO(expression), chunk_size=chunk_size))
+            self.assertEqual(tokens, tokenize(expression))
+        tree = ExpressionTree.from_stream(io.StringIO(expression), chunk_size=4)
+        self.assertEqual(tree.postorder(), build_expression_tree(expression).postorder())
+
+    def test_errors(self) -> None:
+        """Ký tự lạ, ngoặc lệch và thiếu toán hạng đều báo `ValueError`."""
+        with self.assertRaisesRegex(ValueError, "offset 4"):
+            list(iter_tokens(io.StringIO("1 + $"), chunk_size=2))
+        for expression in ("(1 + 2", "1 + 2)", "1 +", "1 2"):
+            with self.assertRaises(ValueError):
+                ExpressionTree.from_stream(expression)
+
+    def test_deep_input(self) -> None:
+        """Chuỗi rất dài được dựng mà không cần danh sách token trung gian."""
+        source = io.StringIO("+".join(["1"] * 20000))
+        tree = ExpressionTree.from_stream(source, chunk_size=1000)
+        self.assertEqual(tree.compile().evaluate(), 20000)
+
+
+def _outcome(function, source, *args):
+    """Kết quả hoặc (loại lỗi, thông báo) của một lần tính."""
+    try:
+        return function(source, *args)
+    except (ValueError, ArithmeticError) as exc:
+        return type(exc), str(exc)
+
+
+class StreamingEvaluationTests(unittest.TestCase):
+    """Tính prefix/postfix theo luồng phải giống hệt `evaluate_*_expression`."""
+
+    def test_sources_and_chunks(self) -> None:
+        """Chuỗi, bytes, bytearray, file văn bản/nhị phân và file mmap, với khối rất nhỏ."""
+        sources = ["", "7", "1 2", "+ 1", "1 +", "x 1 +", "+ 1 x", "1 0 :", ": 1 0"]
+        for seed in range(20):
+            tree = ExpressionTree.from_infix(generate_expression(1 + seed * 5, shape="random", seed=seed))
+            sources.append("  ".join(tree.postorder()) + "\n")
+            sources.append("\t".join(tree.preorder()))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tokens.txt")
+            for text in sources:
+                with open(path, "w", encoding="utf-8") as handle:
+                    handle.write(text)
+                for prefix, streamed, reference in (
+                    (False, evaluate_postfix_stream, evaluate_postfix_expression),
+                    (True, evaluate_prefix_stream, evaluate_prefix_expression),
+                ):
+                    expected = _outcome(reference, text)
+                    for chunk_size in (1, 3, 64):
+                        self.assertEqual(_outcome(streamed, text, chunk_size), expected, (prefix, text))
+                        self.assertEqual(_outcome(streamed, text.encode(), chunk_size), expected, (prefix, text))
+                        self.assertEqual(_outcome(streamed, bytearray(text.encode()), chunk_size), expected, (prefix, text))
+                        self.assertEqual(_outcome(streamed, io.StringIO(text), chunk_size), expected, (prefix, text))
+                        with open(path, "rb") as handle:
+                            self.assertEqual(_outcome(streamed, handle, chunk_size), expected, (prefix, text))
+
+    def test_long_chain(self) -> None:
+        """Chuỗi dài một phía chỉ cần ngăn xếp nông."""
+        count = 50000
+        self.assertEqual(evaluate_postfix_stream(io.BytesIO(b"1" + b" 1 +" * count), chunk_size=97), count + 1)
+        self.assertEqual(evaluate_prefix_stream(b"+ 1 " * count + b"1", chunk_size=97), count + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Kiểm thử chế độ tính theo cột NumPy."""
+
+import unittest
+
+from src.evaluator import evaluate_postfix
+from src.expression_tree import build_expression_tree
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+@unittest.skipUnless(np is not None, "NumPy is not installed")
+class VectorizedTests(unittest.TestCase):
+    """Tính theo cột phải khớp với tính từng dòng bằng evaluator vô hướng."""
+
+    def test_matches_row_by_row(self) -> None:
+        """Mỗi dòng của kết quả cột bằng kết quả tính riêng dòng đó."""
+        tree = build_expression_tree("(price - cost) * qty + 2^x")
+        columns = {
+            "price": [10, 12.5, 3],
+            "cost": [4, 2, 3],
+            "qty": [1, 2, 3],
+            "x": [0, 1, 2],
+        }
+        result = tree.evaluate_columns(columns)
+        program = tree.compile()
+        for row in range(3):
+            expected = program.evaluate({name: values[row] for name, values in columns.items()})
+            self.assertEqual(result.values[row], expected)
+        self.assertFalse(result.zero_division.any())
+
+    def test_zero_division_mask(self) -> None:
+        """Dòng có số chia bằng 0 (kể cả ở biểu thức con) được đánh dấu, không ném lỗi."""
+        tree = build_expression_tree("1 + a : (b - 1) * 2")
+        result = tree.evaluate_columns({"a": [4, 4, 6], "b": [3, 1, 4]})
+        self.assertEqual(result.zero_division.tolist(), [False, True, False])
+        self.assertEqual(result.values[0], 5.0)
+        self.assertTrue(np.isnan(result.values[1]))
+        self.assertEqual(result.values[2], 5.0)
+
+    def test_zero_to_negative_power(self) -> None:
+        """`0 ^ số âm` được đánh dấu như chia cho 0, giống `evaluate_postfix` ném `ZeroDivisionError`."""
+        tree = build_expression_tree("a ^ b + 1")
+        columns = {"a": [0, 0, 0, 2, 0], "b": [-1, 0, 2, -1, -0.5]}
+        result = tree.evaluate_columns(columns)
+        for row in range(5):
+            postfix = [str(columns[token][row]) if token in columns else token for token in tree.postorder()]
+            try:
+                expected = evaluate_postfix(postfix)
+            except ZeroDivisionError:
+                self.assertTrue(result.zero_division[row])
+                self.assertTrue(np.isnan(result.values[row]))
+            else:
+                self.assertFalse(result.zero_division[row])
+                self.assertEqual(result.values[row], expected)
+        self.assertEqual(result.zero_division.tolist(), [True, False, False, False, True])
+        self.assertTrue(build_expression_tree("0 ^ (0 - 1)").evaluate_columns({}).zero_division.all())
+
+    def test_constant_expression_broadcasts(self) -> None:
+        """Biểu thức không có biến vẫn trả về một giá trị cho mỗi dòng."""
+        tree = build_expression_tree("1 : 0 + y")
+        result = tree.evaluate_columns({"y": [1, 2]})
+        self.assertEqual(result.zero_division.tolist(), [True, True])
+
+    def test_length_mismatch(self) -> None:
+        """Các cột có độ dài khác nhau bị từ chối."""
+        tree = build_expression_tree("a + b")
+        with self.assertRaises(ValueError):
+            tree.evaluate_columns({"a": [1, 2], "b": [1]})
+
+
+if __name__ == "__main__":
+    unittest.main()